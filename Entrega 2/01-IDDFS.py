@@ -39,3 +39,22 @@ def iddfs(grafo, inicio, destino):
 caminho, profundidade = iddfs(grafo_ruinas, "Entrada", "Sala Final")
 print("Caminho encontrado:", caminho)
 print("Profundidade necessária:", profundidade)
+
+# Executando o motor reutilizável (tabela de transposição e modo bidirecional)
+from busca import busca_iddfs
+
+for bidirecional in (False, True):
+    caminho, profundidade, expansoes = busca_iddfs(grafo_ruinas, "Entrada", "Sala Final", bidirecional=bidirecional)
+    print(f"\nBusca {'bidirecional' if bidirecional else 'com transposição'}:")
+    print("Caminho encontrado:", caminho)
+    print("Profundidade necessária:", profundidade)
+    print("Nós expandidos por iteração:", expansoes)
+
+# Executando as mesmas buscas sobre a representação compacta (CSR) do grafo
+from grafo_csr import GrafoCSR
+
+grafo_compacto = GrafoCSR.de_dicionario(grafo_ruinas)
+caminho, profundidade = iddfs(grafo_compacto, grafo_compacto.id("Entrada"), grafo_compacto.id("Sala Final"))
+print("\nBusca sobre o grafo CSR:")
+print("Caminho encontrado:", grafo_compacto.nomes_de(caminho))
+print("Profundidade necessária:", profundidade)
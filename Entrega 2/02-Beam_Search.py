@@ -1,4 +1,4 @@
-import heapq
+from beam_search import ValidWordScorer, beam_search_translation
 
 # Heurística simples baseada em uma lista de palavras "corretas"
 valid_words = {"enter", "the", "path", "of", "knowledge", "now"}
@@ -15,31 +15,23 @@ candidates = [
 
 beam_width = 3
 
-def heuristic_score(sentence):
-    return sum(1 for word in sentence if word in valid_words)
-
-def beam_search_translation(candidates, beam_width):
-    beam = [([], 0)]  # (sentença até agora, score acumulado)
-    
-    for position in candidates:
-        new_beam = []
-        for prefix, _ in beam:
-            for word in position:
-                new_sentence = prefix + [word]
-                score = heuristic_score(new_sentence)
-                heapq.heappush(new_beam, (-score, new_sentence))
-        
-        # Seleciona os beam_width melhores
-        beam = [heapq.heappop(new_beam)[::-1] for _ in range(min(beam_width, len(new_beam)))]
-    
-    # Retorna a melhor sentença
-    best_sentence, best_score = max(beam, key=lambda x: x[1])
-    return best_sentence, best_score
+# A heurística pontua cada palavra candidata separadamente (em lote);
+# o score de uma frase é o número de palavras válidas que ela contém
+word_scorer = ValidWordScorer(valid_words)
 
 # Executa a busca
-result_sentence, score = beam_search_translation(candidates, beam_width)
+result_sentence, score = beam_search_translation(candidates, beam_width, word_scorer)
 
 # Imprime o resultado
 print("Resultado da tradução:")
 print("Frase:", " ".join(result_sentence))
 print("Pontuação heurística:", score)
+
+# Tradução em lote: várias redes de candidatos independentes distribuídas entre processos
+if __name__ == "__main__":
+    from beam_search import beam_search_batch
+
+    lattices = [candidates, candidates[::-1], [position[::-1] for position in candidates]]
+    print("\nTradução em lote:")
+    for sentence, batch_score in beam_search_batch(lattices, beam_width, word_scorer, max_workers=2):
+        print(f"Frase: {' '.join(sentence)} (pontuação: {batch_score})")
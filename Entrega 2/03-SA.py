@@ -1,11 +1,20 @@
 import random
 import math
+import copy
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 
 # Esta função simula o "nível de atividade" ou "ameaça" do guardião
 # com base em 5 parâmetros de controle. O objetivo é minimizar essa atividade.
 # Parâmetros: [frequência1, amplitude1, pulso1, frequência2, amplitude2]
 # Definimos um conjunto de "parâmetros ideais" que resultariam na atividade mínima (0).
 IDEAL_PARAMS = [75.0, 0.7, 248.0, 1.0, 0.5] # Exemplo de parâmetros ideais para desativação
+IDEAL_PARAMS_ARRAY = np.array(IDEAL_PARAMS)
 
 def dinosaur_activity(params):
     """
@@ -28,14 +37,364 @@ def dinosaur_activity(params):
 
     return activity
 
-# --- 2. Implementação do Algoritmo Simulated Annealing ---
+
+def dinosaur_activity_batch(params, rng=None):
+    """
+    Versão vetorizada de dinosaur_activity: recebe um array (K, D) com K conjuntos de
+    parâmetros (ou um único vetor (D,)) e retorna as K atividades de uma vez.
+    O ruído vem de 'rng' (np.random.Generator); se None, do gerador global do NumPy.
+    """
+    params = np.atleast_2d(params)
+    if params.shape[1] != len(IDEAL_PARAMS):
+        return np.full(params.shape[0], np.inf)
+
+    activity = np.sum((params - IDEAL_PARAMS_ARRAY) ** 2, axis=1)
+    activity += (rng if rng is not None else np.random).uniform(0, 0.5, size=params.shape[0])
+    return activity
+
+
+class CachedCost:
+    """
+    Cache de avaliações para funções de custo caras e ruidosas.
+
+    Os parâmetros são quantizados em uma grade (células de tamanho 'resolution') e cada
+    célula guarda o número de amostras, a média e a variância do custo (algoritmo de
+    Welford). O cache é limitado a 'max_entries' células, descartando a menos usada (LRU).
+
+    Chamado diretamente, retorna a média da célula (avaliando só se a célula for nova).
+    Dentro do Simulated Annealing é usado evaluate_against(params, threshold): a célula
+    é reamostrada enquanto o intervalo de confiança da média contiver o limiar de
+    aceitação, ou seja, enquanto o ruído ainda puder mudar a decisão.
+    """
+
+    def __init__(self, cost_function, resolution, max_entries=100000, max_samples=8, z=1.96):
+        """
+        Args:
+            cost_function (callable): Função de custo original.
+            resolution (float or list): Tamanho da célula da grade (um valor ou um por parâmetro).
+            max_entries (int): Número máximo de células guardadas.
+            max_samples (int): Número máximo de amostras por célula.
+            z (float): Multiplicador do desvio padrão da média no intervalo de confiança.
+        """
+        self.cost_function = cost_function
+        self.resolution = resolution
+        self.max_entries = max_entries
+        self.max_samples = max_samples
+        self.z = z
+        self.cells = OrderedDict()  # chave -> [n, média, M2]
+        self.hits = 0
+        self.misses = 0
+        self.resamples = 0
+        self.evaluations = 0  # Chamadas reais de cost_function
+        # Variância média dentro das células, usada quando a célula tem só uma amostra
+        self._pooled_variance_sum = 0.0
+        self._pooled_variance_count = 0
+
+    def _key(self, params):
+        if isinstance(self.resolution, (int, float)):
+            return tuple(round(p / self.resolution) for p in params)
+        return tuple(round(p / r) for p, r in zip(params, self.resolution))
+
+    def _cell(self, params):
+        key = self._key(params)
+        cell = self.cells.get(key)
+        if cell is not None:
+            self.hits += 1
+            self.cells.move_to_end(key)
+            return cell
+
+        self.misses += 1
+        cell = [0, 0.0, 0.0]
+        self._sample(cell, params)
+        self.cells[key] = cell
+        if len(self.cells) > self.max_entries:
+            _, evicted = self.cells.popitem(last=False)
+            self._remove_pooled(evicted)
+        return cell
+
+    def _sample(self, cell, params):
+        value = self.cost_function(params)
+        self.evaluations += 1
+        old_variance = cell[2] / (cell[0] - 1) if cell[0] > 1 else None
+
+        cell[0] += 1
+        delta = value - cell[1]
+        cell[1] += delta / cell[0]
+        cell[2] += delta * (value - cell[1])
+
+        if cell[0] > 1:
+            if old_variance is not None:
+                self._pooled_variance_sum -= old_variance
+                self._pooled_variance_count -= 1
+            self._pooled_variance_sum += cell[2] / (cell[0] - 1)
+            self._pooled_variance_count += 1
+
+    def _remove_pooled(self, cell):
+        # A variância combinada só considera células que ainda estão no cache
+        if cell[0] > 1:
+            self._pooled_variance_sum -= cell[2] / (cell[0] - 1)
+            self._pooled_variance_count -= 1
+
+    def _half_width(self, cell):
+        n = cell[0]
+        if n > 1:
+            variance = cell[2] / (n - 1)
+        elif self._pooled_variance_count:
+            variance = self._pooled_variance_sum / self._pooled_variance_count
+        else:
+            return math.inf  # Ainda não há estimativa do ruído: a primeira decisão reamostra
+        return self.z * math.sqrt(variance / n)
+
+    def __call__(self, params):
+        return self._cell(params)[1]
+
+    def evaluate_against(self, params, threshold):
+        """Retorna a média da célula, reamostrando enquanto o IC contiver 'threshold'."""
+        cell = self._cell(params)
+        while cell[0] < self.max_samples and abs(cell[1] - threshold) <= self._half_width(cell):
+            self.resamples += 1
+            self._sample(cell, params)
+        return cell[1]
+
+    def stats(self):
+        """Contadores do cache: acertos, faltas, reamostragens, avaliações reais e células guardadas."""
+        return {"hits": self.hits, "misses": self.misses, "resamples": self.resamples,
+                "evaluations": self.evaluations, "size": len(self.cells)}
+
+
+# --- 2. Esquemas de resfriamento e critérios de parada ---
+# Um esquema recebe a cadeia depois de cada iteração (com 'accepted' e 'improved' indicando
+# se o vizinho foi aceito e se melhorou o melhor custo) e retorna a nova temperatura.
+# Esquemas com estado interno o zeram em reset(); cada AnnealingChain usa a sua própria
+# cópia do esquema, então a mesma instância pode ser reaproveitada entre execuções.
+
+class GeometricSchedule:
+    """T <- T * rate (o resfriamento exponencial original)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+
+    def reset(self):
+        pass
+
+    def __call__(self, chain, accepted, improved):
+        return chain.temperature * self.rate
+
+
+class LogarithmicSchedule:
+    """
+    T_k = T0 * ln(2) / ln(k + 2): resfriamento lento, com garantia teórica de convergência.
+    Normalizado para que a iteração 0 use exatamente a temperatura inicial T0.
+    """
+
+    def reset(self):
+        pass
+
+    def __call__(self, chain, accepted, improved):
+        # Chamado ao fim da iteração k - 1 (chain.iterations == k): temperatura da iteração k
+        return chain.initial_temperature * math.log(2) / math.log(chain.iterations + 2)
+
+
+class LamSchedule:
+    """
+    Esquema adaptativo de Lam e Delosme: ajusta a temperatura para que a taxa de aceitação
+    (média móvel exponencial) siga a curva alvo: ~100% -> 44% nos primeiros 15% das
+    iterações, 44% até 65%, e decaindo para ~0% no final.
+    """
+
+    def __init__(self, total_iterations, step=0.999, smoothing=0.002):
+        self.total_iterations = total_iterations
+        self.step = step
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.acceptance_rate = 0.5
+
+    def target_rate(self, iteration):
+        fraction = iteration / self.total_iterations
+        if fraction < 0.15:
+            return 0.44 + 0.56 * 560 ** (-fraction / 0.15)
+        if fraction < 0.65:
+            return 0.44
+        return 0.44 * 440 ** (-(fraction - 0.65) / 0.35)
+
+    def __call__(self, chain, accepted, improved):
+        self.acceptance_rate += self.smoothing * (accepted - self.acceptance_rate)
+        if self.acceptance_rate > self.target_rate(chain.iterations):
+            return chain.temperature * self.step
+        return chain.temperature / self.step
+
+
+class ReheatingSchedule:
+    """
+    Resfriamento geométrico com reaquecimento: se o melhor custo não melhora por 'patience'
+    iterações, a temperatura volta para 'factor' vezes a temperatura inicial.
+    """
+
+    def __init__(self, rate, patience=2000, factor=0.5):
+        self.rate = rate
+        self.patience = patience
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        self.since_improvement = 0
+
+    def __call__(self, chain, accepted, improved):
+        self.since_improvement = 0 if improved else self.since_improvement + 1
+        if self.since_improvement >= self.patience:
+            self.since_improvement = 0
+            return chain.initial_temperature * self.factor
+        return chain.temperature * self.rate
+
+
+class StoppingCriteria:
+    """
+    Critérios de parada antecipada, verificados antes de cada iteração.
+
+    Args:
+        stagnation_window (int): Para se o melhor custo não melhorar por esse número de iterações.
+        target_cost (float): Para quando o melhor custo for menor ou igual a esse valor.
+        time_budget (float): Para depois desse número de segundos (tempo de relógio).
+    """
+
+    def __init__(self, stagnation_window=None, target_cost=None, time_budget=None):
+        self.stagnation_window = stagnation_window
+        self.target_cost = target_cost
+        self.time_budget = time_budget
+        self.deadline = None
+
+    def start(self):
+        if self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+
+    def __call__(self, chain):
+        """Retorna o motivo da parada, ou None para continuar."""
+        if self.target_cost is not None and chain.best_cost <= self.target_cost:
+            return "target_cost"
+        if self.stagnation_window is not None and chain.iterations - chain.last_improvement >= self.stagnation_window:
+            return "stagnation"
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return "time_budget"
+        return None
+
+
+# --- 3. Implementação do Algoritmo Simulated Annealing ---
+
+class AnnealingChain:
+    """
+    Estado de uma cadeia de Simulated Annealing que pode ser executada em trechos.
+    Com 'seed', a cadeia tem o seu próprio gerador de números aleatórios, então várias
+    cadeias podem rodar em processos diferentes de forma reprodutível (o objeto inteiro é
+    serializável com pickle). Sem 'seed', usa o módulo random global, de modo que
+    random.seed(...) continua controlando a execução, como no algoritmo original.
+    """
+
+    def __init__(self, param_ranges, initial_temperature, cooling_rate, seed=None, schedule=None):
+        self.param_ranges = param_ranges
+        self.initial_temperature = initial_temperature
+        self.temperature = initial_temperature
+        # Cópia própria do esquema, zerada: o estado de execuções anteriores não é herdado
+        self.schedule = copy.copy(schedule) if schedule is not None else GeometricSchedule(cooling_rate)
+        if hasattr(self.schedule, "reset"):
+            self.schedule.reset()
+        self.rng = random.Random(seed) if seed is not None else None  # None: módulo random global
+
+        # Gera uma solução inicial aleatória dentro dos limites dos parâmetros.
+        rng = self.rng or random
+        self.current_solution = [rng.uniform(r[0], r[1]) for r in param_ranges]
+        self.current_cost = None  # Avaliado na primeira chamada de run()
+        self.best_solution = list(self.current_solution)
+        self.best_cost = float('inf')
+        self.iterations = 0
+        self.evaluations = 0  # Chamadas de cost_function feitas pela cadeia (com cache, inclui acertos)
+        self.last_improvement = 0  # Iteração da última melhora do melhor custo
+        self.stop_reason = None
+        self.trace = []  # (iteração, custo atual, melhor custo) ao fim de cada trecho
+
+    def run(self, cost_function, num_iterations, stopping=None):
+        """
+        Executa até 'num_iterations' iterações a partir do estado atual da cadeia.
+        Se 'stopping' (StoppingCriteria) indicar parada, interrompe e guarda o motivo em stop_reason.
+        """
+        rng = self.rng or random
+        param_ranges = self.param_ranges
+        num_params = len(param_ranges)
+        evaluate_against = getattr(cost_function, "evaluate_against", None)
+
+        if self.current_cost is None:
+            self.current_cost = cost_function(self.current_solution)
+            self.best_cost = self.current_cost
+            self.evaluations += 1
+
+        schedule = self.schedule
+        for _ in range(num_iterations):
+            if stopping is not None:
+                self.stop_reason = stopping(self)
+                if self.stop_reason is not None:
+                    break
+
+            # Geração de Vizinho (S novo): perturba aleatoriamente um dos parâmetros.
+            # A magnitude da perturbação diminui com a temperatura.
+            new_solution = list(self.current_solution)
+            param_to_perturb = rng.randint(0, num_params - 1)
+            low, high = param_ranges[param_to_perturb]
+
+            max_deviation = (high - low) * (self.temperature / self.initial_temperature) * 0.1 # 10% do range, ajustado pela temperatura
+            new_solution[param_to_perturb] += rng.uniform(-max_deviation, max_deviation)
+
+            # Garante que o novo parâmetro permaneça dentro de seus limites definidos.
+            new_solution[param_to_perturb] = min(high, max(low, new_solution[param_to_perturb]))
+
+            if evaluate_against is None:
+                new_cost = cost_function(new_solution)
+
+                # Decisão de Aceitação (Delta E)
+                delta_e = new_cost - self.current_cost
+                accepted = delta_e < 0 or rng.random() < math.exp(-delta_e / self.temperature)
+            else:
+                # Mesma decisão escrita como limiar: aceita se new_cost < current_cost - T*ln(u).
+                # A função com cache usa o limiar para decidir se precisa reamostrar o custo.
+                threshold = self.current_cost - self.temperature * math.log(1.0 - rng.random())
+                new_cost = evaluate_against(new_solution, threshold)
+                accepted = new_cost < threshold
+            self.evaluations += 1
+
+            improved = False
+            if accepted:
+                self.current_solution = new_solution
+                self.current_cost = new_cost
+
+                # Atualiza a melhor solução global encontrada até agora
+                if new_cost < self.best_cost:
+                    self.best_solution = list(new_solution)
+                    self.best_cost = new_cost
+                    self.last_improvement = self.iterations
+                    improved = True
+
+            self.iterations += 1
+
+            # Resfriamento (Cooling Schedule)
+            self.temperature = schedule(self, accepted, improved)
+
+        self.trace.append((self.iterations, self.current_cost, self.best_cost))
+        return self
+
 
 def simulated_annealing(
     cost_function,
     param_ranges,
     initial_temperature,
     cooling_rate,
-    num_iterations
+    num_iterations,
+    verbose=True,
+    schedule=None,
+    stagnation_window=None,
+    target_cost=None,
+    time_budget=None,
+    seed=None,
+    return_report=False
 ):
     """
     Executa o algoritmo de Simulated Annealing para encontrar uma solução quase ótima.
@@ -46,74 +405,224 @@ def simulated_annealing(
         initial_temperature (float): A temperatura inicial para o recozimento.
         cooling_rate (float): A taxa de resfriamento (ex: 0.99 para resfriamento exponencial).
         num_iterations (int): O número máximo de iterações.
+        verbose (bool): Imprime o progresso a cada 10% das iterações.
+        schedule (callable): Esquema de resfriamento (GeometricSchedule, LogarithmicSchedule,
+                             LamSchedule, ReheatingSchedule). Padrão: GeometricSchedule(cooling_rate).
+        stagnation_window (int): Para se o melhor custo ficar parado por esse número de iterações.
+        target_cost (float): Para ao atingir esse custo.
+        time_budget (float): Tempo máximo de execução, em segundos.
+        seed (int): Semente de um gerador próprio da execução. Se None, usa o módulo random
+                    global (reprodutível com random.seed).
+        return_report (bool): Retorna também o relatório da execução.
 
     Returns:
-        tuple: A melhor solução (parâmetros) encontrada e o custo correspondente.
+        tuple: A melhor solução (parâmetros) encontrada e o custo correspondente. Com
+               return_report=True, também um relatório (dict) com o motivo da parada
+               ('max_iterations', 'stagnation', 'target_cost' ou 'time_budget'), o número de
+               iterações e o de avaliações reais da função de custo (com CachedCost, só as
+               chamadas da função original, sem os acertos do cache).
     """
-    num_params = len(param_ranges)
+    chain = AnnealingChain(param_ranges, initial_temperature, cooling_rate, seed=seed, schedule=schedule)
+    evaluations_before = getattr(cost_function, "evaluations", None)
+    stopping = StoppingCriteria(stagnation_window, target_cost, time_budget)
+    stopping.start()
+    chain.run(cost_function, 0)  # Avalia a solução inicial
 
-    # 2.1. Inicialização
-    # Gera uma solução inicial aleatória dentro dos limites dos parâmetros.
-    current_solution = [random.uniform(r[0], r[1]) for r in param_ranges]
-    current_cost = cost_function(current_solution)
+    if verbose:
+        print(f"Início da Simulação:")
+        print(f"  Solução inicial: {chain.current_solution}")
+        print(f"  Custo inicial (atividade): {chain.current_cost:.4f}")
+        print("-" * 40)
 
-    best_solution = list(current_solution) # Copia a lista
-    best_cost = current_cost
+    # Executa em 10 trechos para poder imprimir o progresso entre eles
+    step = max(1, num_iterations // 10)
+    while chain.iterations < num_iterations and chain.stop_reason is None:
+        chain.run(cost_function, min(step, num_iterations - chain.iterations), stopping)
+        if verbose:
+            print(f"Iteração {chain.iterations}/{num_iterations}: Temp={chain.temperature:.2f}, Custo Atual={chain.current_cost:.4f}, Melhor Custo={chain.best_cost:.4f}")
+
+    if evaluations_before is None:
+        evaluations = chain.evaluations
+    else:
+        evaluations = cost_function.evaluations - evaluations_before  # Ex: CachedCost conta as chamadas reais
+    report = {
+        "stop_reason": chain.stop_reason or "max_iterations",
+        "iterations": chain.iterations,
+        "evaluations": evaluations,
+    }
+    if verbose:
+        print(f"Parada: {report['stop_reason']} após {report['iterations']} iterações ({report['evaluations']} avaliações)")
+        print("-" * 40)
+    if return_report:
+        return chain.best_solution, chain.best_cost, report
+    return chain.best_solution, chain.best_cost
+
+
+def vectorized_simulated_annealing(
+    batch_cost_function,
+    param_ranges,
+    initial_temperature,
+    cooling_rate,
+    num_iterations,
+    num_neighbours=16,
+    seed=None
+):
+    """
+    Simulated Annealing vetorizado: a cada iteração propõe K vizinhos de uma vez, como um
+    array (K, D), e avalia todos com uma única chamada da função de custo vetorizada.
+
+    Cada vizinho perturba um parâmetro, como em simulated_annealing. O critério de
+    Metropolis é aplicado aos K vizinhos com operações de array, e entre os aceitos o de
+    menor custo passa a ser a solução atual. As soluções ficam em buffers NumPy
+    pré-alocados, sem cópias de listas por iteração.
+
+    Args:
+        batch_cost_function (callable): Chamada como batch_cost_function(array (K, D), rng=gerador)
+                                        e retorna um array (K,) de custos (ex: dinosaur_activity_batch).
+                                        Custos ruidosos devem sortear o ruído de 'rng', para que
+                                        'seed' torne a execução reprodutível.
+        param_ranges, initial_temperature, cooling_rate, num_iterations: Como em simulated_annealing.
+        num_neighbours (int): Número K de vizinhos avaliados por iteração.
+        seed (int): Semente do gerador de números aleatórios (vizinhos, aceitação e ruído do custo).
+
+    Returns:
+        tuple: A melhor solução (array NumPy) e o custo correspondente.
+    """
+    rng = np.random.default_rng(seed)
+    ranges = np.asarray(param_ranges, dtype=float)
+    low, high = ranges[:, 0], ranges[:, 1]
+    span = high - low
+    num_params = len(ranges)
+    rows = np.arange(num_neighbours)
+
+    # Buffers pré-alocados
+    current_solution = rng.uniform(low, high)
+    best_solution = current_solution.copy()
+    candidates = np.empty((num_neighbours, num_params))
 
+    current_cost = float(batch_cost_function(current_solution[None, :], rng=rng)[0])
+    best_cost = current_cost
     temperature = initial_temperature
 
-    print(f"Início da Simulação:")
-    print(f"  Solução inicial: {current_solution}")
-    print(f"  Custo inicial (atividade): {current_cost:.4f}")
-    print("-" * 40)
-
-    # 2.2. Iteração (Loop Principal)
-    for i in range(num_iterations):
-        # 2.2.a. Geração de Vizinho (S novo)
-        # Cria uma nova solução perturbando aleatoriamente um dos parâmetros.
-        # A magnitude da perturbação diminui com a temperatura.
-        new_solution = list(current_solution)
-        param_to_perturb = random.randint(0, num_params - 1)
-        
-        # Calcula o desvio máximo permitido para a perturbação,
-        # que diminui com a temperatura para refinar a busca.
-        max_deviation = (param_ranges[param_to_perturb][1] - param_ranges[param_to_perturb][0]) * (temperature / initial_temperature) * 0.1 # 10% do range, ajustado pela temperatura
-        
-        # Adiciona um valor aleatório dentro do desvio máximo
-        new_solution[param_to_perturb] += random.uniform(-max_deviation, max_deviation)
-
-        # Garante que o novo parâmetro permaneça dentro de seus limites definidos.
-        new_solution[param_to_perturb] = max(param_ranges[param_to_perturb][0], new_solution[param_to_perturb])
-        new_solution[param_to_perturb] = min(param_ranges[param_to_perturb][1], new_solution[param_to_perturb])
-
-        new_cost = cost_function(new_solution)
-
-        # 2.2.b. Cálculo da Variação de Energia (Delta E)
-        delta_e = new_cost - current_cost
-
-        # 2.2.c. Decisão de Aceitação
-        # Se a nova solução é melhor OU (se for pior, mas aceita probabilisticamente)
-        if delta_e < 0 or random.random() < math.exp(-delta_e / temperature):
-            current_solution = list(new_solution)
-            current_cost = new_cost
-
-            # Atualiza a melhor solução global encontrada até agora
+    for _ in range(num_iterations):
+        # K vizinhos, cada um com um parâmetro perturbado (desvio máximo de 10% do range, ajustado pela temperatura)
+        candidates[:] = current_solution
+        params_to_perturb = rng.integers(0, num_params, size=num_neighbours)
+        max_deviation = span[params_to_perturb] * (temperature / initial_temperature) * 0.1
+        perturbed = candidates[rows, params_to_perturb] + rng.uniform(-1.0, 1.0, size=num_neighbours) * max_deviation
+        candidates[rows, params_to_perturb] = np.clip(perturbed, low[params_to_perturb], high[params_to_perturb])
+
+        costs = batch_cost_function(candidates, rng=rng)
+
+        # Critério de Metropolis para todos os vizinhos de uma vez
+        delta_e = costs - current_cost
+        with np.errstate(over='ignore'):
+            accepted = (delta_e < 0) | (rng.random(num_neighbours) < np.exp(-np.maximum(delta_e, 0.0) / temperature))
+
+        if accepted.any():
+            chosen = np.argmin(np.where(accepted, costs, np.inf))
+            current_solution[:] = candidates[chosen]
+            current_cost = float(costs[chosen])
+
             if current_cost < best_cost:
-                best_solution = list(current_solution)
+                best_solution[:] = current_solution
                 best_cost = current_cost
 
-        # 2.2.d. Resfriamento (Cooling Schedule)
-        # Reduz a temperatura gradualmente.
         temperature *= cooling_rate
 
-        # Imprime o progresso a cada X iterações
-        if i % (num_iterations // 10) == 0:
-            print(f"Iteração {i}/{num_iterations}: Temp={temperature:.2f}, Custo Atual={current_cost:.4f}, Melhor Custo={best_cost:.4f}")
-
-    print("-" * 40)
     return best_solution, best_cost
 
 
+# --- 4. Múltiplas cadeias em paralelo ---
+
+def _run_chain_segment(chain, cost_function, num_iterations):
+    # Executado nos processos trabalhadores; a cadeia atualizada volta para o processo principal
+    return chain.run(cost_function, num_iterations)
+
+
+def parallel_simulated_annealing(
+    cost_function,
+    param_ranges,
+    initial_temperature,
+    cooling_rate,
+    num_iterations,
+    num_chains=4,
+    mode="independent",
+    sync_interval=1000,
+    temperature_ratio=2.0,
+    max_workers=None,
+    seed=None
+):
+    """
+    Executa várias cadeias de Simulated Annealing em processos separados e retorna a melhor.
+
+    As cadeias avançam em trechos de 'sync_interval' iterações. Entre os trechos:
+      - "independent": nada acontece (múltiplos inícios independentes);
+      - "restart": a cadeia com o pior melhor-custo reinicia a partir da melhor solução global;
+      - "tempering": replica exchange. A cadeia k roda com temperatura inicial
+        initial_temperature * temperature_ratio**k e cadeias vizinhas trocam de estado com
+        probabilidade min(1, exp((E_k - E_k+1) * (1/T_k - 1/T_k+1))).
+
+    Args:
+        cost_function (callable): Mesma função de custo de simulated_annealing. Deve ser
+                                  serializável (definida no nível do módulo).
+        param_ranges, initial_temperature, cooling_rate, num_iterations: Como em simulated_annealing
+                                  (num_iterations é por cadeia).
+        num_chains (int): Número de cadeias.
+        mode (str): "independent", "restart" ou "tempering".
+        sync_interval (int): Iterações entre sincronizações.
+        temperature_ratio (float): Razão entre temperaturas de cadeias vizinhas no modo "tempering".
+        max_workers (int): Número de processos. Padrão: min(num_chains, os.cpu_count()).
+        seed (int): Semente para gerar as sementes de cada cadeia (reprodutibilidade).
+
+    Returns:
+        tuple: (melhor solução, melhor custo, traces). traces[k] é a lista de
+               (iteração, custo atual, melhor custo) da cadeia k após cada trecho.
+    """
+    if mode not in ("independent", "restart", "tempering"):
+        raise ValueError(f"Modo desconhecido: {mode}")
+
+    master_rng = random.Random(seed)
+    chains = []
+    for k in range(num_chains):
+        temperature = initial_temperature * (temperature_ratio ** k if mode == "tempering" else 1.0)
+        chains.append(AnnealingChain(param_ranges, temperature, cooling_rate, seed=master_rng.randrange(2**32)))
+
+    max_workers = max_workers or min(num_chains, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        done = 0
+        sync_round = 0
+        while done < num_iterations:
+            segment = min(sync_interval, num_iterations - done)
+            chains = list(executor.map(_run_chain_segment, chains, repeat(cost_function), repeat(segment)))
+            done += segment
+
+            if mode == "restart":
+                best = min(chains, key=lambda c: c.best_cost)
+                worst = max(chains, key=lambda c: c.best_cost)
+                if worst is not best:
+                    worst.current_solution = list(best.best_solution)
+                    worst.current_cost = worst.best_cost = best.best_cost
+                    worst.best_solution = list(best.best_solution)
+
+            elif mode == "tempering":
+                # Alterna entre os pares (0,1),(2,3)... e (1,2),(3,4)... a cada sincronização
+                for k in range(sync_round % 2, num_chains - 1, 2):
+                    a, b = chains[k], chains[k + 1]
+                    log_ratio = (a.current_cost - b.current_cost) * (1 / a.temperature - 1 / b.temperature)
+                    if log_ratio >= 0 or master_rng.random() < math.exp(log_ratio):
+                        a.current_solution, b.current_solution = b.current_solution, a.current_solution
+                        a.current_cost, b.current_cost = b.current_cost, a.current_cost
+                        for chain in (a, b):
+                            if chain.current_cost < chain.best_cost:
+                                chain.best_solution = list(chain.current_solution)
+                                chain.best_cost = chain.current_cost
+            sync_round += 1
+
+    best = min(chains, key=lambda c: c.best_cost)
+    return best.best_solution, best.best_cost, [chain.trace for chain in chains]
+
+
 if __name__ == "__main__":
     # Definindo os limites para cada um dos 5 parâmetros
     # [frequência1 (1-200), amplitude1 (0.1-1.0), pulso1 (10-500), frequência2 (1-200), amplitude2 (0.1-1.0)]
@@ -151,4 +660,67 @@ if __name__ == "__main__":
     if final_activity < 1.0: # Um limiar arbitrário para considerar "desativado"
         print("\nO Guardião foi desativado com sucesso!")
     else:
-        print("\nO Guardião robô ainda está ativo. Tente mais iterações ou ajuste os parâmetros do SA.")
\ No newline at end of file
+        print("\nO Guardião robô ainda está ativo. Tente mais iterações ou ajuste os parâmetros do SA.")
+
+    # Várias cadeias em paralelo (replica exchange) com redução para a melhor solução
+    print("\n--- Parallel Tempering (4 cadeias) ---")
+    best_params, best_activity, traces = parallel_simulated_annealing(
+        dinosaur_activity,
+        parameter_ranges,
+        initial_temp,
+        cooling_rate,
+        iterations,
+        num_chains=4,
+        mode="tempering",
+        seed=42
+    )
+    for k, trace in enumerate(traces):
+        print(f"Cadeia {k}: melhor custo final = {trace[-1][2]:.4f}")
+    print(f"Melhores parâmetros encontrados: {best_params}")
+    print(f"Atividade mínima alcançada (custo): {best_activity:.4f}")
+
+    # Versão vetorizada: 16 vizinhos avaliados em lote por iteração
+    print("\n--- Simulated Annealing Vetorizado (16 vizinhos por iteração) ---")
+    best_params, best_activity = vectorized_simulated_annealing(
+        dinosaur_activity_batch,
+        parameter_ranges,
+        initial_temp,
+        cooling_rate,
+        iterations
+    )
+    print(f"Melhores parâmetros encontrados: {best_params.tolist()}")
+    print(f"Atividade mínima alcançada (custo): {best_activity:.4f}")
+
+    # Com cache: parâmetros quantizados e reamostragem só quando o ruído afeta a decisão
+    print("\n--- Simulated Annealing com Cache de Avaliações ---")
+    cached_activity = CachedCost(dinosaur_activity, resolution=[0.5, 0.005, 0.5, 0.5, 0.005])
+    final_params, final_activity, report = simulated_annealing(
+        cached_activity,
+        parameter_ranges,
+        initial_temp,
+        cooling_rate,
+        iterations,
+        verbose=False,
+        return_report=True
+    )
+    print(f"Melhores parâmetros encontrados: {final_params}")
+    print(f"Atividade mínima alcançada (custo): {final_activity:.4f}")
+    print(f"Iterações: {report['iterations']}, avaliações reais da função de custo: {report['evaluations']}")
+    print(f"Estatísticas do cache: {cached_activity.stats()}")
+
+    # Esquema adaptativo de Lam com parada antecipada por estagnação
+    print("\n--- Simulated Annealing com Esquema de Lam e Parada Antecipada ---")
+    final_params, final_activity, report = simulated_annealing(
+        dinosaur_activity,
+        parameter_ranges,
+        initial_temp,
+        cooling_rate,
+        iterations,
+        verbose=False,
+        schedule=LamSchedule(iterations),
+        stagnation_window=5000,
+        return_report=True
+    )
+    print(f"Melhores parâmetros encontrados: {final_params}")
+    print(f"Atividade mínima alcançada (custo): {final_activity:.4f}")
+    print(f"Motivo da parada: {report['stop_reason']}, iterações: {report['iterations']}, avaliações: {report['evaluations']}")
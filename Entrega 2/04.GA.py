@@ -1,4 +1,12 @@
+import multiprocessing
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from cache_aptidao import CacheAptidao, chave_genoma, remover_duplicados as _remover_duplicados
 
 # --- Configurações do Problema ---
 # A sequência alvo secreta que o algoritmo genético precisa encontrar.
@@ -106,10 +114,29 @@ def mutar(cromossomo: Cromossomo, taxa_mutacao: float) -> Cromossomo:
             cromossomo.genes[i] = random.randint(VALOR_MIN_MODULO, VALOR_MAX_MODULO)
     return cromossomo
 
+# --- Cache de Aptidão ---
+# O cache (cache_aptidao.CacheAptidao) recebe a aptidão de um cromossomo, a aptidão de uma
+# lista de cromossomos de uma vez (motor vetorizado) e a chave do genoma:
+#   CacheAptidao(calcular_aptidao, calcular_aptidao_cromossomos, chave=chave_cromossomo)
+
+def chave_cromossomo(cromossomo: Cromossomo) -> int:
+    """Os genes do cromossomo empacotados em um inteiro, um byte por gene."""
+    return chave_genoma(cromossomo.genes)
+
+def calcular_aptidao_cromossomos(populacao: list[Cromossomo]) -> list[float]:
+    """Aptidão de uma lista de cromossomos com uma única avaliação vetorizada (calcular_aptidao_populacao)."""
+    return calcular_aptidao_populacao(np.array([c.genes for c in populacao], dtype=np.int8)).tolist()
+
+def remover_duplicados(populacao: list[Cromossomo]) -> list[Cromossomo]:
+    """Troca cromossomos com genoma repetido por aleatórios novos (cache_aptidao.remover_duplicados)."""
+    return _remover_duplicados(populacao, Cromossomo, chave=chave_cromossomo)
+
 # --- Função Principal do Algoritmo Genético ---
-def executar_algoritmo_genetico():
+def executar_algoritmo_genetico(cache: CacheAptidao = None, populacao_unica: bool = False):
     """
     Executa o algoritmo genético para encontrar a sequência alvo.
+    Se 'cache' for fornecido, as aptidões são memorizadas entre gerações; com
+    'populacao_unica', genomas repetidos são substituídos antes da avaliação.
     """
     print("Iniciando o Algoritmo Genético para desvendar o Livro de Oraculum...")
     print(f"Sequência alvo secreta (conhecida apenas pelo simulador): {SEQUENCIA_ALVO_SECRETA}")
@@ -119,8 +146,15 @@ def executar_algoritmo_genetico():
 
     for geracao in range(1, NUM_GERACOES + 1):
         # 2. Avaliação da Aptidão de cada Cromossomo na População
-        for cromossomo in populacao:
-            calcular_aptidao(cromossomo)
+        if populacao_unica:
+            populacao = remover_duplicados(populacao)
+        if cache is None:
+            for cromossomo in populacao:
+                calcular_aptidao(cromossomo)
+        else:
+            for cromossomo, aptidao in zip(populacao, cache.avaliar_populacao(populacao)):
+                cromossomo.aptidao = aptidao
+        estatisticas_cache = cache.registrar_geracao(geracao) if cache is not None else None
 
         # Encontra o melhor indivíduo da geração atual para monitoramento
         melhor_cromossomo_geracao = max(populacao, key=lambda c: c.aptidao)
@@ -130,6 +164,9 @@ def executar_algoritmo_genetico():
             print(f"\n--- Geração {geracao} ---")
             print(f"Melhor Cromossomo: {melhor_cromossomo_geracao.genes}")
             print(f"Aptidão: {melhor_cromossomo_geracao.aptidao:.2f}")
+            if estatisticas_cache is not None:
+                print(f"Cache: {estatisticas_cache['acertos']} acertos, {estatisticas_cache['faltas']} faltas, "
+                      f"{estatisticas_cache['duplicados']} duplicados, {estatisticas_cache['tamanho']} genomas guardados")
             
             # Verifica se a solução ideal foi encontrada (aptidão máxima possível)
             if melhor_cromossomo_geracao.aptidao == (NUM_MODULOS * 100):
@@ -165,8 +202,207 @@ def executar_algoritmo_genetico():
     print("O robô aplicou a melhor sequência que conseguiu otimizar.")
     return melhor_cromossomo_final.genes
 
+# --- Motor Vetorizado: População como Matriz (tamanho_populacao, NUM_MODULOS) ---
+# As mesmas operações de cima, mas aplicadas à geração inteira de uma vez com NumPy.
+# Cada linha da matriz é um cromossomo; não há objetos Cromossomo nem laços gene a gene.
+
+ALVO_ARRAY = np.array(SEQUENCIA_ALVO_SECRETA, dtype=np.int8)
+
+def gerar_populacao_inicial_vetorizada(tamanho_populacao: int, rng: np.random.Generator) -> np.ndarray:
+    """Gera a população inicial como uma matriz de inteiros (tamanho_populacao, NUM_MODULOS)."""
+    return rng.integers(VALOR_MIN_MODULO, VALOR_MAX_MODULO + 1, size=(tamanho_populacao, NUM_MODULOS), dtype=np.int8)
+
+def calcular_aptidao_populacao(populacao: np.ndarray) -> np.ndarray:
+    """
+    Calcula a aptidão de todas as linhas da população (mesma fórmula de calcular_aptidao):
+    100 pontos por módulo correto menos a soma das distâncias para a sequência alvo.
+    """
+    risco_total_alarme = np.abs(populacao - ALVO_ARRAY).sum(axis=1)
+    modulos_corretos = (populacao == ALVO_ARRAY).sum(axis=1)
+    return modulos_corretos * 100 - risco_total_alarme
+
+def selecionar_pais_vetorizado(populacao: np.ndarray, aptidoes: np.ndarray, tamanho_torneio: int,
+                               rng: np.random.Generator) -> np.ndarray:
+    """
+    Seleção por torneio para a população inteira: sorteia uma matriz (tamanho_populacao, tamanho_torneio)
+    de índices e escolhe, em cada linha, o candidato de maior aptidão.
+    """
+    tamanho_populacao = len(populacao)
+    candidatos = rng.integers(0, tamanho_populacao, size=(tamanho_populacao, tamanho_torneio))
+    vencedores = candidatos[np.arange(tamanho_populacao), np.argmax(aptidoes[candidatos], axis=1)]
+    return populacao[vencedores]
+
+def cruzar_populacao(pais: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Cruzamento de um ponto entre pares consecutivos de pais (0 com 1, 2 com 3, ...).
+    Se o número de pais for ímpar, o último é cruzado com o primeiro, como em executar_algoritmo_genetico.
+    """
+    tamanho_populacao = len(pais)
+    if tamanho_populacao % 2:
+        pais = np.concatenate([pais, pais[:1]])
+    pai1, pai2 = pais[0::2], pais[1::2]
+
+    # Máscara (pares, NUM_MODULOS): True nos genes antes do ponto de corte de cada par
+    pontos_cruzamento = rng.integers(1, NUM_MODULOS, size=(len(pai1), 1))
+    antes_do_corte = np.arange(NUM_MODULOS) < pontos_cruzamento
+
+    filhos = np.empty_like(pais)
+    filhos[0::2] = np.where(antes_do_corte, pai1, pai2)
+    filhos[1::2] = np.where(antes_do_corte, pai2, pai1)
+    return filhos[:tamanho_populacao]
+
+def mutar_populacao(populacao: np.ndarray, taxa_mutacao: float, rng: np.random.Generator) -> np.ndarray:
+    """Cada gene da população tem chance 'taxa_mutacao' de receber um novo valor aleatório (in-place)."""
+    mascara = rng.random(populacao.shape) < taxa_mutacao
+    populacao[mascara] = rng.integers(VALOR_MIN_MODULO, VALOR_MAX_MODULO + 1, size=int(mascara.sum()))
+    return populacao
+
+def executar_algoritmo_genetico_vetorizado(tamanho_populacao: int = TAMANHO_POPULACAO,
+                                           num_geracoes: int = NUM_GERACOES,
+                                           seed: int = None) -> list[int]:
+    """
+    Executa o algoritmo genético com a população inteira em uma matriz NumPy.
+    Torna práticas populações muito maiores (ex: 100 mil indivíduos por 500 gerações).
+    """
+    print(f"\nIniciando o Algoritmo Genético vetorizado (população de {tamanho_populacao})...")
+    rng = np.random.default_rng(seed)
+    aptidao_maxima = NUM_MODULOS * 100
+
+    populacao = gerar_populacao_inicial_vetorizada(tamanho_populacao, rng)
+
+    for geracao in range(1, num_geracoes + 1):
+        aptidoes = calcular_aptidao_populacao(populacao)
+        indice_melhor = int(np.argmax(aptidoes))
+
+        if geracao % 50 == 0 or aptidoes[indice_melhor] == aptidao_maxima:
+            print(f"\n--- Geração {geracao} ---")
+            print(f"Melhor Cromossomo: {populacao[indice_melhor].tolist()}")
+            print(f"Aptidão: {aptidoes[indice_melhor]:.2f}")
+
+            if aptidoes[indice_melhor] == aptidao_maxima:
+                print("\n Solução ótima encontrada! O livro foi desvendado sem alarmes!")
+                return populacao[indice_melhor].tolist()
+
+        pais = selecionar_pais_vetorizado(populacao, aptidoes, TAMANHO_TORNEIO, rng)
+        populacao = mutar_populacao(cruzar_populacao(pais, rng), TAXA_MUTACAO, rng)
+
+    aptidoes = calcular_aptidao_populacao(populacao)
+    indice_melhor = int(np.argmax(aptidoes))
+    print("\nO algoritmo genético vetorizado concluiu as gerações.")
+    print(f"Melhor solução encontrada: {populacao[indice_melhor].tolist()}")
+    print(f"Aptidão final: {aptidoes[indice_melhor]:.2f}")
+    return populacao[indice_melhor].tolist()
+
+# --- Modelo de Ilhas: várias populações em processos separados, com migração ---
+
+class Ilha:
+    """Estado de uma população (ilha) que evolui em um processo trabalhador."""
+
+    def __init__(self, indice: int, tamanho_populacao: int, seed: int):
+        self.indice = indice
+        self.rng = np.random.default_rng(seed)
+        self.populacao = gerar_populacao_inicial_vetorizada(tamanho_populacao, self.rng)
+        self.aptidoes = calcular_aptidao_populacao(self.populacao)
+        self.historico = [int(self.aptidoes.max())]  # Melhor aptidão da ilha em cada geração (a partir da 0)
+
+    def melhores(self, quantidade: int) -> np.ndarray:
+        return self.populacao[np.argsort(self.aptidoes)[-quantidade:]]
+
+    def receber_migrantes(self, migrantes: np.ndarray):
+        # Os migrantes substituem os piores indivíduos da ilha
+        piores = np.argsort(self.aptidoes)[:len(migrantes)]
+        self.populacao[piores] = migrantes
+        self.aptidoes[piores] = calcular_aptidao_populacao(migrantes)
+
+def _evoluir_ilha(ilha: Ilha, num_geracoes: int, parar) -> Ilha:
+    # Executado no processo trabalhador: evolui a ilha até a próxima migração,
+    # ou até alguma ilha (esta ou outra) sinalizar que encontrou a solução ótima.
+    aptidao_maxima = NUM_MODULOS * 100
+    for _ in range(num_geracoes):
+        if parar.is_set():
+            break
+        pais = selecionar_pais_vetorizado(ilha.populacao, ilha.aptidoes, TAMANHO_TORNEIO, ilha.rng)
+        ilha.populacao = mutar_populacao(cruzar_populacao(pais, ilha.rng), TAXA_MUTACAO, ilha.rng)
+        ilha.aptidoes = calcular_aptidao_populacao(ilha.populacao)
+        ilha.historico.append(int(ilha.aptidoes.max()))
+        if ilha.historico[-1] == aptidao_maxima:
+            parar.set()
+            break
+    return ilha
+
+def _migrar(ilhas: list[Ilha], num_migrantes: int, topologia: str):
+    # Migração: os emigrantes são escolhidos antes de qualquer ilha receber migrantes
+    num_ilhas = len(ilhas)
+    emigrantes = [ilha.melhores(num_migrantes) for ilha in ilhas]
+    for origem in range(num_ilhas):
+        if topologia == "anel":
+            destinos = [(origem + 1) % num_ilhas]
+        else:
+            destinos = [d for d in range(num_ilhas) if d != origem]
+        for destino in destinos:
+            if destino != origem:
+                ilhas[destino].receber_migrantes(emigrantes[origem])
+
+def executar_modelo_ilhas(num_ilhas: int = 4,
+                          tamanho_populacao: int = TAMANHO_POPULACAO,
+                          num_geracoes: int = NUM_GERACOES,
+                          intervalo_migracao: int = 20,
+                          num_migrantes: int = 5,
+                          topologia: str = "anel",
+                          max_workers: int = None,
+                          seed: int = None) -> tuple[list[int], list[list[int]]]:
+    """
+    Executa o algoritmo genético no modelo de ilhas.
+
+    Cada ilha evolui 'intervalo_migracao' gerações em um processo trabalhador; depois, os
+    'num_migrantes' melhores de cada ilha substituem os piores das ilhas vizinhas.
+    Topologias: "anel" (ilha i envia para i+1) ou "completa" (cada ilha envia para todas).
+    Quando uma ilha atinge a aptidão máxima, todas param.
+
+    Returns:
+        tuple: Os genes da melhor solução e o histórico da melhor aptidão de cada ilha por geração.
+    """
+    if topologia not in ("anel", "completa"):
+        raise ValueError(f"Topologia desconhecida: {topologia}")
+
+    print(f"\nIniciando o modelo de ilhas ({num_ilhas} ilhas, topologia {topologia})...")
+    rng = np.random.default_rng(seed)
+    ilhas = [Ilha(i, tamanho_populacao, int(rng.integers(2**32))) for i in range(num_ilhas)]
+    max_workers = max_workers or min(num_ilhas, os.cpu_count() or 1)
+
+    with multiprocessing.Manager() as gerenciador, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        parar = gerenciador.Event()
+        geracao = 0
+        while geracao < num_geracoes and not parar.is_set():
+            geracoes_trecho = min(intervalo_migracao, num_geracoes - geracao)
+            ilhas = list(executor.map(_evoluir_ilha, ilhas, repeat(geracoes_trecho), repeat(parar)))
+            geracao += geracoes_trecho
+
+            if parar.is_set() or geracao >= num_geracoes:
+                break
+
+            _migrar(ilhas, num_migrantes, topologia)
+
+    melhor_ilha = max(ilhas, key=lambda ilha: ilha.aptidoes.max())
+    melhor_genes = melhor_ilha.populacao[np.argmax(melhor_ilha.aptidoes)].tolist()
+    for ilha in ilhas:
+        print(f"Ilha {ilha.indice}: {len(ilha.historico) - 1} gerações, melhor aptidão = {max(ilha.historico)}")
+    print(f"Melhor solução encontrada: {melhor_genes} (ilha {melhor_ilha.indice})")
+    return melhor_genes, [ilha.historico for ilha in ilhas]
+
 # --- Execução do Algoritmo ---
 if __name__ == "__main__":
     solucao_encontrada = executar_algoritmo_genetico()
     print(f"\nSequência alvo real (para comparação): {SEQUENCIA_ALVO_SECRETA}")
     print(f"Sequência encontrada pelo robô: {solucao_encontrada}")
+
+    cache = CacheAptidao(calcular_aptidao, calcular_aptidao_cromossomos, chave=chave_cromossomo)
+    solucao_com_cache = executar_algoritmo_genetico(cache=cache, populacao_unica=True)
+    print(f"Sequência encontrada com cache de aptidão: {solucao_com_cache}")
+    print(f"Avaliações de aptidão: {cache.faltas} (acertos no cache: {cache.acertos})")
+
+    solucao_vetorizada = executar_algoritmo_genetico_vetorizado(tamanho_populacao=100_000)
+    print(f"Sequência encontrada pelo motor vetorizado: {solucao_vetorizada}")
+
+    solucao_ilhas, historicos = executar_modelo_ilhas(num_ilhas=4, tamanho_populacao=50, topologia="anel")
+    print(f"Sequência encontrada pelo modelo de ilhas: {solucao_ilhas}")
@@ -0,0 +1,122 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+import numpy as np
+
+# Beam search vetorizado sobre uma "rede" de candidatos (uma lista de palavras por posição).
+# Cada hipótese guarda apenas o score acumulado e um ponteiro para a hipótese anterior,
+# em vez de copiar o prefixo inteiro; a frase é reconstruída no final.
+
+
+class ValidWordScorer:
+    """
+    Pontua um lote de palavras candidatas: 1 para cada palavra do vocabulário válido, 0 caso contrário.
+    É a versão incremental de heuristic_score: somar os pontos das palavras escolhidas
+    dá o mesmo resultado que pontuar a frase inteira.
+    """
+
+    def __init__(self, valid_words):
+        self.valid_words = np.array(sorted(valid_words))
+
+    def __call__(self, words):
+        return np.isin(words, self.valid_words).astype(np.int64)
+
+
+def beam_search_translation(candidates, beam_width, word_scorer):
+    """
+    Executa o beam search sobre os candidatos de cada posição.
+
+    Args:
+        candidates (list of lists): Palavras candidatas para cada posição da frase.
+        beam_width (int): Número de hipóteses mantidas por posição.
+        word_scorer (callable): Recebe um array NumPy com as palavras de uma posição e
+                                retorna o score de cada uma (o score de uma frase é a soma).
+
+    Returns:
+        tuple: A melhor frase (lista de palavras) e o seu score.
+
+    Mudança de comportamento em relação à versão original de 02-Beam_Search.py: ela
+    retornava a pior hipótese do beam final e o seu score com o sinal trocado (o demo
+    imprimia "enter a path of knowledge now" com pontuação -5). Agora o retorno é a melhor
+    hipótese e o score positivo ("enter the path of knowledge now", 6). Quem comparava com
+    a saída antiga deve esperar a frase melhor e o score com o sinal invertido.
+    """
+    beam_scores = np.zeros(1, dtype=np.int64)
+    back_pointers = []  # Para cada posição: (índice da hipótese pai, palavra escolhida)
+
+    for position in candidates:
+        words = np.asarray(position)
+        word_scores = np.asarray(word_scorer(words))
+
+        # Como o score é aditivo, só as beam_width melhores palavras da posição podem entrar no beam
+        if len(words) > beam_width:
+            top_words = np.argpartition(-word_scores, beam_width - 1)[:beam_width]
+            words, word_scores = words[top_words], word_scores[top_words]
+
+        # Score de todas as extensões (hipótese x palavra) de uma vez
+        totals = (beam_scores[:, None] + word_scores[None, :]).ravel()
+        k = min(beam_width, totals.size)
+        best = np.argpartition(-totals, k - 1)[:k]
+        best = best[np.argsort(-totals[best], kind="stable")]
+
+        parents, word_idx = np.divmod(best, len(words))
+        back_pointers.append((parents, words[word_idx]))
+        beam_scores = totals[best]
+
+    # A melhor hipótese está na posição 0 (o beam está ordenado); segue os ponteiros de volta
+    sentence = []
+    hypothesis = 0
+    for parents, words in reversed(back_pointers):
+        sentence.append(str(words[hypothesis]))
+        hypothesis = parents[hypothesis]
+    sentence.reverse()
+
+    best_score = beam_scores[0].item() if len(beam_scores) else 0
+    return sentence, best_score
+
+
+def _translate_chunk(lattices, beam_width, word_scorer):
+    # Executado nos processos trabalhadores: um bloco inteiro por tarefa reduz o custo de pickling
+    return [beam_search_translation(candidates, beam_width, word_scorer) for candidates in lattices]
+
+
+def beam_search_batch(lattices, beam_width, word_scorer, max_workers=None, chunksize=None):
+    """
+    Traduz muitas redes de candidatos independentes em paralelo com um ProcessPoolExecutor.
+
+    Args:
+        lattices (iterable): Iterável de redes de candidatos (cada uma no formato de 'candidates').
+                             É consumido aos poucos, então pode ser um gerador.
+        beam_width (int): Largura do beam usada em todas as redes.
+        word_scorer (callable): Pontuador de palavras; precisa ser serializável (pickle),
+                                como ValidWordScorer.
+        max_workers (int): Número de processos. Padrão: os.cpu_count(). Com 1, roda no processo atual.
+        chunksize (int): Redes enviadas por tarefa. Padrão: ~4 tarefas por processo quando o
+                         tamanho é conhecido, senão 64.
+
+    Yields:
+        tuple: (frase, score) de cada rede, na mesma ordem da entrada.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(lattices) // (4 * max_workers)) if hasattr(lattices, "__len__") else 64
+
+    lattices = iter(lattices)
+    chunks = iter(lambda: list(islice(lattices, chunksize)), [])
+
+    if max_workers == 1:
+        for chunk in chunks:
+            yield from _translate_chunk(chunk, beam_width, word_scorer)
+        return
+
+    # Mantém no máximo 2 blocos por processo em andamento, para não ler toda a entrada de uma vez
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_translate_chunk, chunk, beam_width, word_scorer))
+            if len(pending) >= 2 * max_workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
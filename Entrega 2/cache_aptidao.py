@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+# --- Cache de Aptidão ---
+# Usado pelos algoritmos genéticos de 04.GA.py e de Entrega 3/01-CSP.py. Com poucos genomas
+# distintos, o elitismo e a convergência fazem a população repetir os mesmos; o cache guarda
+# a aptidão de cada genoma, então a função de aptidão (que pode ser cara, como uma simulação
+# ou um teste no mundo real) roda uma única vez por genoma.
+# As funções de aptidão e a chave do genoma são passadas ao cache: ele não conhece o problema.
+
+
+def chave_genoma(genes) -> int:
+    """Empacota um genoma de inteiros pequenos (0 a 255) em um inteiro, um byte por gene."""
+    return int.from_bytes(bytes(genes), "little")
+
+
+class CacheAptidao:
+    """
+    Cache limitado (LRU) de aptidões, compartilhado entre gerações.
+
+    A chave é o genoma empacotado em um inteiro, então cada genoma distinto é avaliado pela
+    função de aptidão uma única vez enquanto estiver no cache. Por geração são contados os
+    acertos (aptidão reaproveitada), as faltas (avaliações reais) e os duplicados
+    (indivíduos com um genoma que já apareceu na mesma geração).
+    """
+    def __init__(self, aptidao, aptidao_populacao=None, chave=chave_genoma, tamanho_maximo: int = 100_000):
+        """
+        Args:
+            aptidao: Função indivíduo -> aptidão, chamada para cada genoma fora do cache.
+            aptidao_populacao: Função opcional lista de indivíduos -> lista de aptidões. Com ela,
+                               avaliar_populacao avalia de uma vez todos os genomas fora do cache.
+            chave: Função indivíduo -> inteiro que identifica o genoma (padrão: chave_genoma,
+                   para indivíduos que já são a lista de genes).
+            tamanho_maximo (int): Número máximo de genomas guardados.
+        """
+        self.aptidao = aptidao
+        self.aptidao_populacao = aptidao_populacao
+        self.chave = chave
+        self.tamanho_maximo = tamanho_maximo
+        self.valores = OrderedDict()  # LRU: o menos usado recentemente é descartado primeiro
+        self.acertos = 0
+        self.faltas = 0
+        self.duplicados = 0
+        self.historico = []  # Dicionário de estatísticas de cada geração (ver registrar_geracao)
+        self._anteriores = (0, 0, 0)
+        self._chaves_geracao = set()
+
+    def _consultar(self, chave: int):
+        # Conta o duplicado da geração e o acerto; retorna a aptidão guardada ou None
+        if chave in self._chaves_geracao:
+            self.duplicados += 1
+        self._chaves_geracao.add(chave)
+
+        aptidao = self.valores.get(chave)
+        if aptidao is not None:
+            self.acertos += 1
+            self.valores.move_to_end(chave)
+        return aptidao
+
+    def _guardar(self, chave: int, aptidao):
+        self.valores[chave] = aptidao
+        while len(self.valores) > self.tamanho_maximo:
+            self.valores.popitem(last=False)
+
+    def avaliar(self, individuo):
+        """Retorna a aptidão do indivíduo, calculando-a só se o genoma não estiver no cache."""
+        chave = self.chave(individuo)
+        aptidao = self._consultar(chave)
+        if aptidao is None:
+            self.faltas += 1
+            aptidao = self.aptidao(individuo)
+            self._guardar(chave, aptidao)
+        return aptidao
+
+    def avaliar_populacao(self, populacao: list) -> list:
+        """
+        Mesmo que [avaliar(i) for i in populacao], mas os genomas fora do cache são avaliados
+        de uma vez com aptidao_populacao, se houver. Um genoma repetido na mesma chamada é
+        avaliado uma vez só (as cópias contam como acertos). Retorna a lista de aptidões.
+        """
+        aptidoes = [None] * len(populacao)
+        pendentes = {}  # Chave -> posições na população dos genomas ainda não avaliados
+        for i, individuo in enumerate(populacao):
+            chave = self.chave(individuo)
+            aptidao = self._consultar(chave)
+            if aptidao is not None:
+                aptidoes[i] = aptidao
+            elif chave in pendentes:
+                self.acertos += 1
+                pendentes[chave].append(i)
+            else:
+                self.faltas += 1
+                pendentes[chave] = [i]
+
+        if pendentes:
+            novos = [populacao[posicoes[0]] for posicoes in pendentes.values()]
+            if self.aptidao_populacao is not None:
+                valores = self.aptidao_populacao(novos)
+            else:
+                valores = [self.aptidao(individuo) for individuo in novos]
+            for (chave, posicoes), aptidao in zip(pendentes.items(), valores):
+                self._guardar(chave, aptidao)
+                for i in posicoes:
+                    aptidoes[i] = aptidao
+        return aptidoes
+
+    def registrar_geracao(self, geracao: int) -> dict:
+        """
+        Fecha a geração: guarda em 'historico' e retorna um dicionário com 'geracao',
+        'acertos', 'faltas' e 'duplicados' desde a geração anterior e o 'tamanho' do cache.
+        """
+        acertos_antes, faltas_antes, duplicados_antes = self._anteriores
+        estatisticas = {
+            "geracao": geracao,
+            "acertos": self.acertos - acertos_antes,
+            "faltas": self.faltas - faltas_antes,
+            "duplicados": self.duplicados - duplicados_antes,
+            "tamanho": len(self.valores),
+        }
+        self._anteriores = (self.acertos, self.faltas, self.duplicados)
+        self._chaves_geracao.clear()
+        self.historico.append(estatisticas)
+        return estatisticas
+
+
+def remover_duplicados(populacao: list, criar_aleatorio, chave=chave_genoma, tentativas: int = 100) -> list:
+    """
+    Substitui indivíduos repetidos por indivíduos aleatórios (criar_aleatorio()) ainda não
+    presentes na população, para que cada genoma seja avaliado uma vez por geração e a
+    diversidade seja mantida. Desiste após 'tentativas' sorteios por indivíduo (espaço de
+    busca esgotado).
+    """
+    vistos = set()
+    unica = []
+    for individuo in populacao:
+        chave_individuo = chave(individuo)
+        sorteios = 0
+        while chave_individuo in vistos and sorteios < tentativas:
+            individuo = criar_aleatorio()
+            chave_individuo = chave(individuo)
+            sorteios += 1
+        vistos.add(chave_individuo)
+        unica.append(individuo)
+    return unica
@@ -0,0 +1,139 @@
+# Representação compacta (CSR - compressed sparse row) dos grafos das ruínas.
+# Os nomes das salas são convertidos em ids inteiros e as adjacências ficam em dois
+# buffers contíguos: 'inicios' (offsets, tamanho n+1) e 'destinos' (vizinhos, tamanho m).
+# Os vizinhos do nó i são destinos[inicios[i]:inicios[i+1]].
+from array import array
+import mmap
+
+
+class GrafoCSR:
+    def __init__(self, nomes, inicios, destinos):
+        """
+        Args:
+            nomes (list): Nome de cada nó, indexado pelo id.
+            inicios (array): Offsets de cada nó em 'destinos' (tamanho len(nomes) + 1).
+            destinos (array): Ids dos vizinhos, agrupados por nó de origem.
+        """
+        self.nomes = nomes
+        self.indice = {nome: i for i, nome in enumerate(nomes)}
+        self.inicios = inicios
+        self.destinos = destinos
+        self._vista = memoryview(destinos)  # Fatias sem cópia
+
+    # --- Construção ---
+
+    @classmethod
+    def de_arestas(cls, arestas, nomes=None):
+        """
+        Constrói o grafo a partir de um iterável de pares (origem, destino) de nomes.
+        Os ids são atribuídos na ordem em que os nomes aparecem.
+        """
+        nomes = list(nomes) if nomes is not None else []
+        indice = {nome: i for i, nome in enumerate(nomes)}
+        origens = array("i")
+        alvos = array("i")
+
+        for origem, destino in arestas:
+            for nome in (origem, destino):
+                if nome not in indice:
+                    indice[nome] = len(nomes)
+                    nomes.append(nome)
+            origens.append(indice[origem])
+            alvos.append(indice[destino])
+
+        return cls(nomes, *_compactar(len(nomes), origens, alvos))
+
+    @classmethod
+    def de_dicionario(cls, grafo):
+        """Converte um dicionário {nó: [vizinhos]} (como grafo_ruinas) para CSR."""
+        arestas = ((origem, vizinho) for origem, vizinhos in grafo.items() for vizinho in vizinhos)
+        return cls.de_arestas(arestas, nomes=grafo.keys())
+
+    @classmethod
+    def de_arquivo(cls, caminho_arquivo, separador="\t", mapear_memoria=False):
+        """
+        Carrega uma lista de arestas em texto, uma aresta "origem<separador>destino" por linha.
+        Linhas vazias e iniciadas por '#' são ignoradas. Uma linha só com um nome declara
+        um nó sem arestas de saída.
+
+        Com mapear_memoria=True o arquivo é lido por mmap, sem carregá-lo inteiro na memória.
+        """
+        nomes = []
+
+        def processar(linhas):
+            for linha in linhas:
+                linha = linha.strip()
+                if not linha or linha.startswith("#"):
+                    continue
+                partes = linha.split(separador)
+                if len(partes) == 1:
+                    nomes.append(partes[0].strip())
+                else:
+                    yield partes[0].strip(), partes[1].strip()
+
+        with open(caminho_arquivo, "rb") as arquivo:
+            if mapear_memoria:
+                with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                    linhas = (linha.decode("utf-8") for linha in iter(mapa.readline, b""))
+                    grafo = cls.de_arestas(processar(linhas))
+            else:
+                linhas = (linha.decode("utf-8") for linha in arquivo)
+                grafo = cls.de_arestas(processar(linhas))
+
+        # Nós declarados sem arestas que não apareceram em nenhuma aresta
+        for nome in nomes:
+            if nome not in grafo.indice:
+                grafo.indice[nome] = len(grafo.nomes)
+                grafo.nomes.append(nome)
+                grafo.inicios.append(grafo.inicios[-1])
+        return grafo
+
+    # --- Consulta ---
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def num_arestas(self):
+        return len(self.destinos)
+
+    def vizinhos(self, no):
+        """Retorna os ids dos vizinhos do nó 'no' (id inteiro) sem copiar o buffer."""
+        return self._vista[self.inicios[no]:self.inicios[no + 1]]
+
+    def get(self, no, padrao=()):
+        # Mesmo uso de dict.get, para que dls/iddfs rodem diretamente sobre o grafo CSR
+        if 0 <= no < len(self.nomes):
+            return self.vizinhos(no)
+        return padrao
+
+    def id(self, nome):
+        return self.indice[nome]
+
+    def nomes_de(self, ids):
+        """Converte uma lista de ids (ex: um caminho) de volta para nomes."""
+        return [self.nomes[i] for i in ids]
+
+    def reverso(self):
+        """Grafo com todas as arestas invertidas (predecessores), com os mesmos ids."""
+        n = len(self.nomes)
+        origens = array("i")
+        for no in range(n):
+            origens.extend([no] * (self.inicios[no + 1] - self.inicios[no]))
+        inicios, destinos = _compactar(n, self.destinos, origens)
+        return GrafoCSR(self.nomes, inicios, destinos)
+
+
+def _compactar(n, origens, alvos):
+    # Ordenação por contagem das arestas pela origem: O(n + m)
+    inicios = array("q", [0]) * (n + 1)
+    for origem in origens:
+        inicios[origem + 1] += 1
+    for i in range(n):
+        inicios[i + 1] += inicios[i]
+
+    destinos = array("i", [0]) * len(alvos)
+    posicao = array("q", inicios)
+    for origem, alvo in zip(origens, alvos):
+        destinos[posicao[origem]] = alvo
+        posicao[origem] += 1
+    return inicios, destinos
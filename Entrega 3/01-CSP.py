@@ -1,97 +1,21 @@
 import random
-
-# --- 1. Definição dos Domínios ---
-DOMINIO_NUCLEOS = ['Fogo do Dragão', 'Sussurro Fantasma', 'Vontade de Ferro', 'Véu Sombrio', 'Coração de Jade']
-DOMINIO_ABORDAGENS = ['Furtividade', 'Combate', 'Hacking', 'Diplomacia']
-
-# --- 2. Função de Aptidão (Fitness Function) ---
-# Esta função avalia quão boa é uma solução (cromossomo)
-# Quanto maior a aptidão, melhor a solução. Penalidades são subtraídas de um valor base.
-def calcular_aptidao(cromossomo):
-    # Desempacota o cromossomo para facilitar a leitura
-    nucleo_f1, nucleo_f2, nucleo_f3, abordagem_f1, abordagem_f2, abordagem_f3 = cromossomo
-
-    aptidao = 1000  # Pontuação base máxima
-
-    # --- Restrições de Núcleo e Abordagem por Fortaleza ---
-
-    # Fortaleza 1 (Templo dos Sussurros)
-    if abordagem_f1 == 'Furtividade':
-        if nucleo_f1 != 'Sussurro Fantasma':
-            aptidao -= 100  # Penalidade alta por não ter o núcleo ideal para furtividade
-    elif abordagem_f1 == 'Combate':
-        if nucleo_f1 != 'Fogo do Dragão':
-            aptidao -= 100  # Penalidade alta por não ter o núcleo ideal para combate
-    else: # Outras abordagens para F1 têm penalidade base
-        aptidao -= 50
-    
-    # Penalidade geral por desalinhamento para F1 se não for um dos casos ideais
-    if (abordagem_f1 == 'Furtividade' and nucleo_f1 != 'Sussurro Fantasma') or \
-       (abordagem_f1 == 'Combate' and nucleo_f1 != 'Fogo do Dragão'):
-        pass # Já penalizado acima
-    elif (abordagem_f1 == 'Hacking' and nucleo_f1 == 'Vontade de Ferro') or \
-         (abordagem_f1 == 'Diplomacia' and nucleo_f1 == 'Coração de Jade'):
-        aptidao -= 20 # Pequena penalidade por usar abordagem não ideal para F1 mas com núcleo sinérgico
-    else:
-        aptidao -= 30 # Penalidade por desalinhamento geral
-
-    # Fortaleza 2 (Ciber-Pagode)
-    if abordagem_f2 == 'Hacking':
-        if nucleo_f2 != 'Vontade de Ferro':
-            aptidao -= 100
-    elif abordagem_f2 == 'Furtividade':
-        if nucleo_f2 != 'Véu Sombrio':
-            aptidao -= 100
-    else: # Outras abordagens para F2 têm penalidade base
-        aptidao -= 50
-
-    # Penalidade geral por desalinhamento para F2
-    if (abordagem_f2 == 'Hacking' and nucleo_f2 != 'Vontade de Ferro') or \
-       (abordagem_f2 == 'Furtividade' and nucleo_f2 != 'Véu Sombrio'):
-        pass
-    elif (abordagem_f2 == 'Combate' and nucleo_f2 == 'Fogo do Dragão'):
-        aptidao -= 20
-    else:
-        aptidao -= 30
-
-    # Fortaleza 3 (Distrito do Mercado Flutuante)
-    if abordagem_f3 == 'Diplomacia':
-        if nucleo_f3 != 'Coração de Jade':
-            aptidao -= 100
-    elif abordagem_f3 == 'Combate':
-        if nucleo_f3 != 'Fogo do Dragão':
-            aptidao -= 100
-    else: # Outras abordagens para F3 têm penalidade base
-        aptidao -= 50
-
-    # Penalidade geral por desalinhamento para F3
-    if (abordagem_f3 == 'Diplomacia' and nucleo_f3 != 'Coração de Jade') or \
-       (abordagem_f3 == 'Combate' and nucleo_f3 != 'Fogo do Dragão'):
-        pass
-    elif (abordagem_f3 == 'Furtividade' and nucleo_f3 == 'Sussurro Fantasma'):
-        aptidao -= 20
-    else:
-        aptidao -= 30
-
-    # --- Restrição de Inventário Limitado de Núcleos ---
-    # Todos os núcleos devem ser diferentes
-    nucleos_usados = [nucleo_f1, nucleo_f2, nucleo_f3]
-    if len(set(nucleos_usados)) < 3: # Se houver repetição, o tamanho do set será menor que 3
-        aptidao -= 200 # Penalidade muito alta por violar esta restrição crítica
-
-    # --- Restrição de Sinergia/Conflito de Abordagens ---
-    # Combate em fortalezas adjacentes
-    if abordagem_f1 == 'Combate' and abordagem_f2 == 'Combate':
-        aptidao -= 150 # Penalidade alta por aumentar o alerta
-    if abordagem_f2 == 'Combate' and abordagem_f3 == 'Combate':
-        aptidao -= 150 # Penalidade alta por aumentar o alerta
-
-    # Diplomacia só é eficaz na Fortaleza 3
-    if abordagem_f1 == 'Diplomacia' or abordagem_f2 == 'Diplomacia':
-        aptidao -= 75 # Penalidade por usar diplomacia onde não é eficaz
-
-    # Garante que a aptidão não seja negativa
-    return max(0, aptidao)
+import sys
+import time
+from pathlib import Path
+
+# --- 1. Definição dos Domínios e 2. Função de Aptidão (Fitness Function) ---
+# Os domínios, as fortalezas e as penalidades ficam em restricoes.py, compilados em tabelas.
+# calcular_aptidao avalia quão boa é uma solução (cromossomo): quanto maior, melhor.
+# O GA avalia cada geração de uma vez com calcular_aptidao_populacao (população em inteiros).
+from restricoes import (
+    DOMINIO_NUCLEOS, DOMINIO_ABORDAGENS, NUM_FORTALEZAS, calcular_aptidao, calcular_aptidao_populacao, codificar,
+    codificar_populacao, fortalezas_aleatorias,
+)
+from solver_csp import resolver_infiltracao
+
+# O cache de aptidão é o mesmo do GA da Entrega 2 (Entrega 2/cache_aptidao.py)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "Entrega 2"))
+from cache_aptidao import CacheAptidao, chave_genoma, remover_duplicados as _remover_duplicados
 
 # --- 3. Funções do Algoritmo Genético ---
 
@@ -148,14 +72,118 @@ def mutacao(cromossomo, taxa_mutacao=0.1):
                 cromossomo[i] = random.choice(DOMINIO_ABORDAGENS)
     return cromossomo
 
+# --- Operadores que preservam núcleos únicos ---
+# Os núcleos formam uma permutação parcial (NUM_FORTALEZAS núcleos distintos entre os disponíveis).
+# Em vez de re-sortear todos os núcleos quando aparece uma duplicata, estes operadores
+# nunca criam duplicatas e preservam o que foi herdado dos pais.
+
+# Mutação por troca: troca os núcleos de duas fortalezas
+def mutacao_troca(cromossomo, taxa_mutacao=0.1):
+    if random.random() < taxa_mutacao:
+        i, j = random.sample(range(NUM_FORTALEZAS), 2)
+        cromossomo[i], cromossomo[j] = cromossomo[j], cromossomo[i]
+    return cromossomo
+
+# Mutação por conjunto: troca um núcleo por um que ainda não está em uso (e as abordagens como antes)
+def mutacao_nucleo_livre(cromossomo, taxa_mutacao=0.1):
+    for i in range(len(cromossomo)):
+        if random.random() < taxa_mutacao:
+            if i < NUM_FORTALEZAS:
+                livres = [n for n in DOMINIO_NUCLEOS if n not in cromossomo[:NUM_FORTALEZAS]]
+                if livres:
+                    cromossomo[i] = random.choice(livres)
+            else:
+                cromossomo[i] = random.choice(DOMINIO_ABORDAGENS)
+    return cromossomo
+
+def _segmento_aleatorio():
+    inicio = random.randrange(NUM_FORTALEZAS)
+    fim = random.randint(inicio + 1, NUM_FORTALEZAS)
+    return inicio, fim
+
+def _pmx(nucleos1, nucleos2, inicio, fim):
+    # O filho recebe o segmento de nucleos1; fora dele, os genes de nucleos2, seguindo o
+    # mapeamento do segmento quando o núcleo já foi usado
+    filho = list(nucleos2)
+    filho[inicio:fim] = nucleos1[inicio:fim]
+    mapeamento = dict(zip(nucleos1[inicio:fim], nucleos2[inicio:fim]))
+    for i in list(range(inicio)) + list(range(fim, len(filho))):
+        nucleo = nucleos2[i]
+        while nucleo in mapeamento:
+            nucleo = mapeamento[nucleo]
+        filho[i] = nucleo
+    return filho
+
+def _ox(nucleos1, nucleos2, inicio, fim):
+    # O filho recebe o segmento de nucleos1; as demais posições são preenchidas na ordem
+    # em que os núcleos aparecem em nucleos2 (a partir do fim do segmento), sem repetir
+    segmento = nucleos1[inicio:fim]
+    tamanho = len(nucleos2)
+    restantes = [nucleos2[(fim + k) % tamanho] for k in range(tamanho)]
+    restantes = [n for n in restantes if n not in segmento]
+    filho = [None] * tamanho
+    filho[inicio:fim] = segmento
+    for k, i in enumerate([(fim + k) % tamanho for k in range(tamanho - len(segmento))]):
+        filho[i] = restantes[k]
+    return filho
+
+def _crossover_permutacao(pai1, pai2, operador):
+    # Operador de permutação nos núcleos e um ponto de corte nas abordagens
+    inicio, fim = _segmento_aleatorio()
+    nucleos1, nucleos2 = pai1[:NUM_FORTALEZAS], pai2[:NUM_FORTALEZAS]
+    corte = random.randint(0, NUM_FORTALEZAS)
+    abordagens1, abordagens2 = pai1[NUM_FORTALEZAS:], pai2[NUM_FORTALEZAS:]
+    filho1 = operador(nucleos1, nucleos2, inicio, fim) + abordagens1[:corte] + abordagens2[corte:]
+    filho2 = operador(nucleos2, nucleos1, inicio, fim) + abordagens2[:corte] + abordagens1[corte:]
+    return filho1, filho2
+
+# Crossover PMX (partially mapped) nos núcleos
+def crossover_pmx(pai1, pai2):
+    return _crossover_permutacao(pai1, pai2, _pmx)
+
+# Crossover OX (order crossover) nos núcleos
+def crossover_ox(pai1, pai2):
+    return _crossover_permutacao(pai1, pai2, _ox)
+
+# --- Cache de Aptidão ---
+# Com 5 núcleos e 4 abordagens existem poucos cromossomos distintos, e o elitismo e a
+# convergência fazem a população repetir os mesmos. O cache evita recalcular a aptidão:
+#   CacheAptidao(calcular_aptidao, aptidoes_em_lote, chave=chave_cromossomo)
+
+def chave_cromossomo(cromossomo):
+    """Empacota o genoma em um inteiro: o índice de cada núcleo e abordagem, um byte cada."""
+    return chave_genoma(codificar(cromossomo))
+
+def aptidoes_em_lote(populacao):
+    """Toda a população em uma matriz de índices e uma única avaliação vetorizada."""
+    return calcular_aptidao_populacao(codificar_populacao(populacao)).tolist()
+
+def remover_duplicados(populacao):
+    """Troca cromossomos com genoma repetido por aleatórios novos (cache_aptidao.remover_duplicados)."""
+    return _remover_duplicados(populacao, criar_cromossomo_aleatorio, chave=chave_cromossomo)
+
 # --- 4. Loop Principal do Algoritmo Genético ---
-def algoritmo_genetico(tamanho_populacao=50, num_geracoes=1000, taxa_mutacao=0.1):
+# operadores: "reparo" (crossover de um ponto e re-sorteio dos núcleos duplicados, o original),
+#             "pmx" ou "ox" (operadores de permutação nos núcleos, sem reparo)
+# aptidao_alvo: a busca para ao atingir esta aptidão
+def algoritmo_genetico(tamanho_populacao=50, num_geracoes=1000, taxa_mutacao=0.1, cache=None, populacao_unica=False,
+                       operadores="reparo", aptidao_alvo=1000, verbose=True):
+    if operadores not in ("reparo", "pmx", "ox"):
+        raise ValueError(f"Operadores desconhecidos: {operadores}")
     populacao = inicializar_populacao(tamanho_populacao)
     melhor_solucao = None
     melhor_aptidao = -1
 
     for geracao in range(num_geracoes):
-        aptidoes = [calcular_aptidao(c) for c in populacao]
+        if populacao_unica:
+            populacao = remover_duplicados(populacao)
+        # A população inteira é avaliada de uma vez (restricoes.calcular_aptidao_populacao)
+        if cache is None:
+            aptidoes = aptidoes_em_lote(populacao)
+            estatisticas_cache = None
+        else:
+            aptidoes = cache.avaliar_populacao(populacao)
+            estatisticas_cache = cache.registrar_geracao(geracao)
 
         # Encontra a melhor solução na geração atual
         idx_melhor_atual = aptidoes.index(max(aptidoes))
@@ -167,9 +195,16 @@ def algoritmo_genetico(tamanho_populacao=50, num_geracoes=1000, taxa_mutacao=0.1
             melhor_solucao = solucao_atual
             # print(f"Geração {geracao}: Nova melhor aptidão = {melhor_aptidao}, Solução = {melhor_solucao}")
 
-        # Critério de parada: se encontrar uma solução perfeita
-        if melhor_aptidao == 1000:
-            print(f"\nSolução perfeita encontrada na Geração {geracao}!")
+        # Estatísticas do cache a cada 200 gerações e na última
+        if verbose and estatisticas_cache is not None and (geracao % 200 == 0 or melhor_aptidao >= aptidao_alvo):
+            print(f"Geração {geracao}: melhor aptidão {melhor_aptidao}; cache: {estatisticas_cache['acertos']} acertos, "
+                  f"{estatisticas_cache['faltas']} faltas, {estatisticas_cache['duplicados']} duplicados, "
+                  f"{estatisticas_cache['tamanho']} genomas guardados")
+
+        # Critério de parada: se encontrar uma solução perfeita (ou a aptidão alvo)
+        if melhor_aptidao >= aptidao_alvo:
+            if verbose:
+                print(f"\nSolução perfeita encontrada na Geração {geracao}!")
             break
 
         nova_populacao = []
@@ -179,18 +214,26 @@ def algoritmo_genetico(tamanho_populacao=50, num_geracoes=1000, taxa_mutacao=0.1
         # Preenche o resto da nova população
         while len(nova_populacao) < tamanho_populacao:
             pai1, pai2 = selecao_torneio(populacao, aptidoes)
-            filho1, filho2 = crossover(list(pai1), list(pai2)) # Passa cópias para crossover
-
-            mutacao(filho1, taxa_mutacao)
-            mutacao(filho2, taxa_mutacao)
-
-            # Garante que os núcleos dos filhos continuem únicos após crossover/mutação
-            # Esta é uma correção importante para o problema de núcleos únicos
-            if len(set(filho1[:3])) != 3:
-                # Se houver duplicatas, tenta gerar novos núcleos aleatórios e únicos
-                filho1[:3] = random.sample(DOMINIO_NUCLEOS, 3)
-            if len(set(filho2[:3])) != 3:
-                filho2[:3] = random.sample(DOMINIO_NUCLEOS, 3)
+            if operadores == "reparo":
+                filho1, filho2 = crossover(list(pai1), list(pai2)) # Passa cópias para crossover
+
+                mutacao(filho1, taxa_mutacao)
+                mutacao(filho2, taxa_mutacao)
+
+                # Garante que os núcleos dos filhos continuem únicos após crossover/mutação
+                # Esta é uma correção importante para o problema de núcleos únicos
+                if len(set(filho1[:3])) != 3:
+                    # Se houver duplicatas, tenta gerar novos núcleos aleatórios e únicos
+                    filho1[:3] = random.sample(DOMINIO_NUCLEOS, 3)
+                if len(set(filho2[:3])) != 3:
+                    filho2[:3] = random.sample(DOMINIO_NUCLEOS, 3)
+            else:
+                # Os núcleos continuam únicos por construção
+                crossover_nucleos = crossover_pmx if operadores == "pmx" else crossover_ox
+                filho1, filho2 = crossover_nucleos(pai1, pai2)
+                for filho in (filho1, filho2):
+                    mutacao_nucleo_livre(filho, taxa_mutacao)
+                    mutacao_troca(filho, taxa_mutacao)
 
             nova_populacao.append(filho1)
             if len(nova_populacao) < tamanho_populacao:
@@ -200,19 +243,81 @@ def algoritmo_genetico(tamanho_populacao=50, num_geracoes=1000, taxa_mutacao=0.1
 
     return melhor_solucao, melhor_aptidao
 
+# --- 5. Comparação dos operadores ---
+# Para cada conjunto de operadores, roda o GA várias vezes até atingir a aptidão ótima
+# (dada pelo solver exato) e mede gerações e tempo de parede.
+def comparar_operadores(aptidao_otima, num_execucoes=50, tamanho_populacao=20, num_geracoes=500, taxa_mutacao=0.15):
+    resultados = {}
+    for operadores in ("reparo", "pmx", "ox"):
+        geracoes, tempos, sucessos = [], [], 0
+        for execucao in range(num_execucoes):
+            random.seed(execucao)  # Mesmas sementes para todos os operadores
+            cache = CacheAptidao(calcular_aptidao, aptidoes_em_lote, chave=chave_cromossomo)
+            inicio = time.perf_counter()
+            _, aptidao = algoritmo_genetico(tamanho_populacao, num_geracoes, taxa_mutacao, cache=cache,
+                                            operadores=operadores, aptidao_alvo=aptidao_otima, verbose=False)
+            tempos.append(time.perf_counter() - inicio)
+            geracoes.append(len(cache.historico))
+            sucessos += aptidao >= aptidao_otima
+        resultados[operadores] = {
+            "geracoes_media": sum(geracoes) / num_execucoes,
+            "tempo_medio": sum(tempos) / num_execucoes,
+            "sucessos": sucessos,
+            "execucoes": num_execucoes,
+        }
+    return resultados
+
+# --- 6. Escala do solver exato ---
+# O GA está preso às 3 fortalezas de restricoes.py; o solver aceita qualquer lista de fortalezas.
+# Mede o solver em instâncias sorteadas maiores (com 2 núcleos a mais que fortalezas).
+def medir_solver(tamanhos=(10, 20, 30), semente=0):
+    resultados = []
+    for num_fortalezas in tamanhos:
+        rng = random.Random(semente + num_fortalezas)
+        nucleos = [f"Núcleo {j + 1}" for j in range(num_fortalezas + 2)]
+        fortalezas = fortalezas_aleatorias(num_fortalezas, nucleos, rng)
+        inicio = time.perf_counter()
+        _, _, estatisticas = resolver_infiltracao(fortalezas, nucleos)
+        resultados.append({"fortalezas": num_fortalezas, "tempo": time.perf_counter() - inicio, "nos": estatisticas["nos"]})
+    return resultados
+
 # --- Execução do Algoritmo ---
-print("Iniciando simulação do Algoritmo Genético para Infiltração Cyberpunk...\n")
-solucao_final, aptidao_final = algoritmo_genetico(tamanho_populacao=100, num_geracoes=2000, taxa_mutacao=0.15)
-
-print("\n--- Resultado Final ---")
-if solucao_final:
-    print(f"Melhor Solução Encontrada (Aptidão: {aptidao_final}):")
-    print(f"  Fortaleza 1 (Templo dos Sussurros):")
-    print(f"    Núcleo: {solucao_final[0]}")
-    print(f"    Abordagem: {solucao_final[3]}")
-    print(f"  Fortaleza 2 (Ciber-Pagode):")
-    print(f"    Núcleo: {solucao_final[1]}")
-    print(f"    Abordagem: {solucao_final[4]}")
-    print(f"  Fortaleza 3 (Distrito do Mercado Flutuante):")
-    print(f"    Núcleo: {solucao_final[2]}")
-    print(f"    Abordagem: {solucao_final[5]}")
\ No newline at end of file
+if __name__ == "__main__":
+    print("Iniciando simulação do Algoritmo Genético para Infiltração Cyberpunk...\n")
+    cache_aptidao = CacheAptidao(calcular_aptidao, aptidoes_em_lote, chave=chave_cromossomo)
+    solucao_final, aptidao_final = algoritmo_genetico(tamanho_populacao=100, num_geracoes=2000, taxa_mutacao=0.15, cache=cache_aptidao)
+    geracoes_executadas = len(cache_aptidao.historico)
+    print(f"Avaliações de aptidão: {cache_aptidao.faltas} em {geracoes_executadas} gerações "
+          f"(acertos no cache: {cache_aptidao.acertos}, duplicados: {cache_aptidao.duplicados})")
+
+    print("\n--- Resultado Final ---")
+    if solucao_final:
+        print(f"Melhor Solução Encontrada (Aptidão: {aptidao_final}):")
+        print(f"  Fortaleza 1 (Templo dos Sussurros):")
+        print(f"    Núcleo: {solucao_final[0]}")
+        print(f"    Abordagem: {solucao_final[3]}")
+        print(f"  Fortaleza 2 (Ciber-Pagode):")
+        print(f"    Núcleo: {solucao_final[1]}")
+        print(f"    Abordagem: {solucao_final[4]}")
+        print(f"  Fortaleza 3 (Distrito do Mercado Flutuante):")
+        print(f"    Núcleo: {solucao_final[2]}")
+        print(f"    Abordagem: {solucao_final[5]}")
+
+    # --- Comparação com o solver exato (AC-3 + MRV + branch-and-bound) ---
+    inicio_solver = time.perf_counter()
+    solucao_exata, aptidao_exata, estatisticas_solver = resolver_infiltracao()
+    tempo_solver = time.perf_counter() - inicio_solver
+    print("\n--- Solver Exato ---")
+    print(f"Ótimo comprovado (Aptidão: {aptidao_exata}) em {tempo_solver * 1000:.2f} ms, {estatisticas_solver['nos']} nós:")
+    print(f"  Núcleos: {solucao_exata[:NUM_FORTALEZAS]}")
+    print(f"  Abordagens: {solucao_exata[NUM_FORTALEZAS:]}")
+
+    print(f"\n--- Operadores: gerações até o ótimo ({aptidao_exata}) ---")
+    for operadores, resultado in comparar_operadores(aptidao_exata).items():
+        print(f"  {operadores:>6}: {resultado['geracoes_media']:.1f} gerações, "
+              f"{resultado['tempo_medio'] * 1000:.1f} ms, ótimo em {resultado['sucessos']}/{resultado['execucoes']} execuções")
+    print(f"  solver: {tempo_solver * 1000:.1f} ms, ótimo sempre (comprovado)")
+
+    print("\n--- Solver Exato: instâncias maiores ---")
+    for resultado in medir_solver():
+        print(f"  {resultado['fortalezas']} fortalezas: {resultado['tempo'] * 1000:.0f} ms, {resultado['nos']} nós")
@@ -0,0 +1,171 @@
+import random
+
+import numpy as np
+
+# --- Restrições da Infiltração Cyberpunk, compiladas em tabelas ---
+# As fortalezas são descritas por dados; as penalidades de cada fortaleza são pré-calculadas
+# em uma tabela indexada por (fortaleza, núcleo, abordagem) e as restrições entre fortalezas
+# viram comparações vetorizadas. Adicionar uma fortaleza é só acrescentar uma entrada em FORTALEZAS.
+#
+# Um cromossomo tem os núcleos das fortalezas seguidos das abordagens:
+# [núcleo_f1, ..., núcleo_fN, abordagem_f1, ..., abordagem_fN]
+
+# --- Domínios ---
+DOMINIO_NUCLEOS = ['Fogo do Dragão', 'Sussurro Fantasma', 'Vontade de Ferro', 'Véu Sombrio', 'Coração de Jade']
+DOMINIO_ABORDAGENS = ['Furtividade', 'Combate', 'Hacking', 'Diplomacia']
+INDICE_NUCLEO = {nucleo: i for i, nucleo in enumerate(DOMINIO_NUCLEOS)}
+INDICE_ABORDAGEM = {abordagem: i for i, abordagem in enumerate(DOMINIO_ABORDAGENS)}
+
+# --- Fortalezas ---
+# 'ideais': abordagem -> núcleo ideal (penalidade alta se o núcleo for outro).
+# 'sinergias': abordagem não ideal -> núcleo que reduz a penalidade de desalinhamento.
+# 'diplomacia_eficaz': se False, usar Diplomacia nesta fortaleza é penalizado.
+FORTALEZAS = [
+    {
+        'nome': 'Templo dos Sussurros',
+        'ideais': {'Furtividade': 'Sussurro Fantasma', 'Combate': 'Fogo do Dragão'},
+        'sinergias': {'Hacking': 'Vontade de Ferro', 'Diplomacia': 'Coração de Jade'},
+        'diplomacia_eficaz': False,
+    },
+    {
+        'nome': 'Ciber-Pagode',
+        'ideais': {'Hacking': 'Vontade de Ferro', 'Furtividade': 'Véu Sombrio'},
+        'sinergias': {'Combate': 'Fogo do Dragão'},
+        'diplomacia_eficaz': False,
+    },
+    {
+        'nome': 'Distrito do Mercado Flutuante',
+        'ideais': {'Diplomacia': 'Coração de Jade', 'Combate': 'Fogo do Dragão'},
+        'sinergias': {'Furtividade': 'Sussurro Fantasma'},
+        'diplomacia_eficaz': True,
+    },
+]
+NUM_FORTALEZAS = len(FORTALEZAS)
+
+# --- Pesos das penalidades ---
+APTIDAO_BASE = 1000
+PENALIDADE_NUCLEO_ERRADO = 100        # Abordagem ideal sem o núcleo ideal
+PENALIDADE_ABORDAGEM_NAO_IDEAL = 50   # Abordagem que não é ideal para a fortaleza
+PENALIDADE_SINERGIA = 20              # Desalinhamento atenuado por um núcleo sinérgico
+PENALIDADE_DESALINHAMENTO = 30        # Desalinhamento geral
+PENALIDADE_NUCLEO_REPETIDO = 200      # Inventário limitado: todos os núcleos devem ser diferentes
+PENALIDADE_COMBATE_ADJACENTE = 150    # Combate em duas fortalezas vizinhas (por par)
+PENALIDADE_DIPLOMACIA_INEFICAZ = 75   # Diplomacia onde ela não é eficaz (aplicada uma vez)
+
+COMBATE = INDICE_ABORDAGEM['Combate']
+DIPLOMACIA = INDICE_ABORDAGEM['Diplomacia']
+
+
+def _penalidade_fortaleza(fortaleza, nucleo, abordagem):
+    # Mesmas regras da antiga cadeia de if/elif, para uma fortaleza
+    nucleo_ideal = fortaleza['ideais'].get(abordagem)
+    if nucleo_ideal is not None:
+        if nucleo != nucleo_ideal:
+            return PENALIDADE_NUCLEO_ERRADO  # Já cobre o desalinhamento
+        return PENALIDADE_DESALINHAMENTO
+    if fortaleza['sinergias'].get(abordagem) == nucleo:
+        return PENALIDADE_ABORDAGEM_NAO_IDEAL + PENALIDADE_SINERGIA
+    return PENALIDADE_ABORDAGEM_NAO_IDEAL + PENALIDADE_DESALINHAMENTO
+
+
+def compilar_tabela(fortalezas, nucleos=DOMINIO_NUCLEOS, abordagens=DOMINIO_ABORDAGENS):
+    """Tabela (fortaleza, núcleo, abordagem) -> penalidade individual da fortaleza."""
+    tabela = np.zeros((len(fortalezas), len(nucleos), len(abordagens)), dtype=np.int64)
+    for f, fortaleza in enumerate(fortalezas):
+        for n, nucleo in enumerate(nucleos):
+            for a, abordagem in enumerate(abordagens):
+                tabela[f, n, a] = _penalidade_fortaleza(fortaleza, nucleo, abordagem)
+    return tabela
+
+
+def fortalezas_aleatorias(num_fortalezas, nucleos=DOMINIO_NUCLEOS, rng=random):
+    """Fortalezas sorteadas no formato de FORTALEZAS, para testes e medições de escala."""
+    fortalezas = []
+    for f in range(num_fortalezas):
+        abordagens = rng.sample(DOMINIO_ABORDAGENS, len(DOMINIO_ABORDAGENS))
+        fortalezas.append({
+            'nome': f'Fortaleza {f + 1}',
+            'ideais': {abordagem: rng.choice(nucleos) for abordagem in abordagens[:2]},
+            'sinergias': {abordagem: rng.choice(nucleos) for abordagem in abordagens[2:] if rng.random() < 0.7},
+            'diplomacia_eficaz': rng.random() < 0.5,
+        })
+    return fortalezas
+
+
+TABELA_PENALIDADES = compilar_tabela(FORTALEZAS)
+TABELA_PENALIDADES_LISTA = TABELA_PENALIDADES.tolist()  # Indexação rápida para um cromossomo só
+DIPLOMACIA_INEFICAZ = np.array([not f['diplomacia_eficaz'] for f in FORTALEZAS])
+FORTALEZAS_DIPLOMACIA_INEFICAZ = [f for f, fortaleza in enumerate(FORTALEZAS) if not fortaleza['diplomacia_eficaz']]
+
+
+# --- Conversão entre nomes e inteiros ---
+
+def codificar(cromossomo):
+    """Converte um cromossomo de nomes para uma lista de índices inteiros."""
+    return ([INDICE_NUCLEO[n] for n in cromossomo[:NUM_FORTALEZAS]] +
+            [INDICE_ABORDAGEM[a] for a in cromossomo[NUM_FORTALEZAS:]])
+
+
+def decodificar(indices):
+    """Converte uma lista de índices inteiros de volta para nomes."""
+    return ([DOMINIO_NUCLEOS[n] for n in indices[:NUM_FORTALEZAS]] +
+            [DOMINIO_ABORDAGENS[a] for a in indices[NUM_FORTALEZAS:]])
+
+
+def codificar_populacao(populacao):
+    """Converte uma lista de cromossomos de nomes para uma matriz (tamanho_populacao, 2 * NUM_FORTALEZAS)."""
+    return np.array([codificar(c) for c in populacao], dtype=np.int8).reshape(len(populacao), 2 * NUM_FORTALEZAS)
+
+
+# --- Aptidão ---
+
+def calcular_aptidao_indices(indices):
+    """Aptidão de um cromossomo já codificado em inteiros, usando as tabelas compiladas."""
+    nucleos = indices[:NUM_FORTALEZAS]
+    abordagens = indices[NUM_FORTALEZAS:]
+
+    penalidade = 0
+    for f in range(NUM_FORTALEZAS):
+        penalidade += TABELA_PENALIDADES_LISTA[f][nucleos[f]][abordagens[f]]
+
+    if len(set(nucleos)) < NUM_FORTALEZAS:
+        penalidade += PENALIDADE_NUCLEO_REPETIDO
+    for f in range(NUM_FORTALEZAS - 1):
+        if abordagens[f] == COMBATE and abordagens[f + 1] == COMBATE:
+            penalidade += PENALIDADE_COMBATE_ADJACENTE
+    if any(abordagens[f] == DIPLOMACIA for f in FORTALEZAS_DIPLOMACIA_INEFICAZ):
+        penalidade += PENALIDADE_DIPLOMACIA_INEFICAZ
+
+    return max(0, APTIDAO_BASE - penalidade)
+
+
+def calcular_aptidao(cromossomo):
+    """Aptidão de um cromossomo de nomes (mesmo resultado da antiga cadeia de if/elif)."""
+    return calcular_aptidao_indices(codificar(cromossomo))
+
+
+def calcular_aptidao_populacao(populacao):
+    """
+    Aptidão de uma população inteira codificada como matriz de inteiros
+    (tamanho_populacao, 2 * NUM_FORTALEZAS), com uma única expressão NumPy por restrição.
+    """
+    nucleos = populacao[:, :NUM_FORTALEZAS]
+    abordagens = populacao[:, NUM_FORTALEZAS:]
+
+    # Penalidades individuais: consulta direta na tabela (fortaleza, núcleo, abordagem)
+    penalidade = TABELA_PENALIDADES[np.arange(NUM_FORTALEZAS), nucleos, abordagens].sum(axis=1)
+
+    # Núcleos repetidos: após ordenar, há dois vizinhos iguais
+    nucleos_ordenados = np.sort(nucleos, axis=1)
+    repetidos = (nucleos_ordenados[:, 1:] == nucleos_ordenados[:, :-1]).any(axis=1)
+    penalidade += repetidos * PENALIDADE_NUCLEO_REPETIDO
+
+    # Combate em fortalezas adjacentes (cada par conta)
+    combate = abordagens == COMBATE
+    penalidade += (combate[:, 1:] & combate[:, :-1]).sum(axis=1) * PENALIDADE_COMBATE_ADJACENTE
+
+    # Diplomacia em alguma fortaleza onde não é eficaz
+    diplomacia_ineficaz = ((abordagens == DIPLOMACIA) & DIPLOMACIA_INEFICAZ).any(axis=1)
+    penalidade += diplomacia_ineficaz * PENALIDADE_DIPLOMACIA_INEFICAZ
+
+    return np.maximum(0, APTIDAO_BASE - penalidade)
@@ -0,0 +1,434 @@
+import math
+from collections import deque
+from itertools import product
+
+import numpy as np
+
+from restricoes import (
+    APTIDAO_BASE, DOMINIO_ABORDAGENS, DOMINIO_NUCLEOS, FORTALEZAS,
+    PENALIDADE_COMBATE_ADJACENTE, PENALIDADE_DIPLOMACIA_INEFICAZ, compilar_tabela,
+)
+
+# --- Solver exato para a Infiltração Cyberpunk ---
+# Restrições rígidas binárias são propagadas com AC-3 a cada atribuição (MAC);
+# restrições suaves (penalidades) são minimizadas com branch-and-bound usando o limite
+# inferior de cada restrição. A variável escolhida é a de menor domínio (MRV), com
+# desempate pelo grau, e os filhos são visitados em ordem crescente de limite. Uma heurística
+# opcional completa cada nó em uma solução que vira incumbente cedo. Ao final da busca o
+# resultado é o ótimo comprovado.
+
+
+class RestricaoSuave:
+    """Penalidade sobre as variáveis do escopo, dada por uma função dos seus valores."""
+
+    def __init__(self, escopo, penalidade):
+        self.escopo = escopo
+        self.penalidade = penalidade
+
+    def limite_inferior(self, atribuicao, dominios):
+        # Menor penalidade possível considerando os domínios atuais das variáveis livres
+        valores = [[atribuicao[v]] if v in atribuicao else dominios[v] for v in self.escopo]
+        return min(self.penalidade(*combinacao) for combinacao in product(*valores))
+
+
+class ProblemaCSP:
+    """
+    Problema de satisfação de restrições com otimização.
+
+    Args:
+        dominios (dict): variável -> lista de valores.
+        rigidas (list): Restrições rígidas binárias (xi, xj, relacao), com relacao(a, b) -> bool.
+        suaves (list): Restrições suaves (RestricaoSuave) cuja soma de penalidades é minimizada.
+        completar (callable): Opcional, completar(atribuicao, dominios) -> atribuição completa
+                              (ou None), heurística que dá boas soluções cedo para a poda.
+    """
+
+    def __init__(self, dominios, rigidas, suaves, completar=None):
+        self.variaveis = list(dominios)
+        self.dominios = {v: list(valores) for v, valores in dominios.items()}
+        self.suaves = suaves
+        self.completar = completar
+
+        # Arcos nos dois sentidos para o AC-3
+        self.arcos = {}
+        self.vizinhos = {v: set() for v in self.variaveis}
+        for xi, xj, relacao in rigidas:
+            self.arcos[(xi, xj)] = relacao
+            self.arcos[(xj, xi)] = lambda b, a, relacao=relacao: relacao(a, b)
+            self.vizinhos[xi].add(xj)
+            self.vizinhos[xj].add(xi)
+
+        self.grau = {v: len(self.vizinhos[v]) for v in self.variaveis}
+        for restricao in suaves:
+            for v in restricao.escopo:
+                self.grau[v] += len(restricao.escopo) - 1
+
+
+def ac3(problema, dominios, fila):
+    """Remove valores sem suporte até a consistência de arco. Retorna False se algum domínio esvaziar."""
+    fila = deque(fila)
+    while fila:
+        xi, xj = fila.popleft()
+        relacao = problema.arcos[(xi, xj)]
+        suportados = [a for a in dominios[xi] if any(relacao(a, b) for b in dominios[xj])]
+        if len(suportados) < len(dominios[xi]):
+            if not suportados:
+                return False
+            dominios[xi] = suportados
+            fila.extend((xk, xi) for xk in problema.vizinhos[xi] if xk != xj)
+    return True
+
+
+def resolver(problema, custo_valor=None):
+    """
+    Branch-and-bound com MAC (AC-3), MRV e grau.
+
+    Args:
+        problema (ProblemaCSP): O problema.
+        custo_valor (callable): Opcional, custo_valor(variavel, valor, dominios) usado para
+                                tentar primeiro os valores mais promissores.
+
+    Returns:
+        tuple: (atribuição ótima como dict, penalidade total, estatísticas). A atribuição é
+               None se as restrições rígidas forem insatisfatíveis.
+    """
+    melhor = {"custo": float("inf"), "atribuicao": None}
+    estatisticas = {"nos": 0, "podas_limite": 0, "podas_ac3": 0}
+
+    dominios = {v: list(valores) for v, valores in problema.dominios.items()}
+    if not ac3(problema, dominios, problema.arcos):
+        return None, float("inf"), estatisticas
+
+    def limite(atribuicao, dominios):
+        return sum(r.limite_inferior(atribuicao, dominios) for r in problema.suaves)
+
+    def considerar(solucao):
+        # Solução completa vinda da heurística: vale só se respeitar as restrições rígidas
+        if solucao is None or not all(relacao(solucao[xi], solucao[xj]) for (xi, xj), relacao in problema.arcos.items()):
+            return
+        custo = sum(r.penalidade(*(solucao[v] for v in r.escopo)) for r in problema.suaves)
+        if custo < melhor["custo"]:
+            melhor["custo"] = custo
+            melhor["atribuicao"] = solucao
+
+    def buscar(atribuicao, dominios, limite_no):
+        estatisticas["nos"] += 1
+        if len(atribuicao) == len(problema.variaveis):
+            custo = limite_no  # Com tudo atribuído, o limite é o custo exato
+            if custo < melhor["custo"]:
+                melhor["custo"] = custo
+                melhor["atribuicao"] = dict(atribuicao)
+            return
+        if problema.completar is not None:
+            considerar(problema.completar(atribuicao, dominios))
+            if limite_no >= melhor["custo"]:
+                estatisticas["podas_limite"] += 1
+                return
+
+        # MRV, com desempate pelo grau
+        livres = [v for v in problema.variaveis if v not in atribuicao]
+        variavel = min(livres, key=lambda v: (len(dominios[v]), -problema.grau[v]))
+        valores = dominios[variavel]
+        if custo_valor is not None:
+            valores = sorted(valores, key=lambda valor: custo_valor(variavel, valor, dominios))
+
+        # Propaga e calcula o limite de todos os filhos antes de descer, para visitar primeiro
+        # o de menor limite: a primeira descida já chega perto do ótimo e poda o resto
+        filhos = []
+        for valor in valores:
+            novos_dominios = dict(dominios)
+            novos_dominios[variavel] = [valor]
+            if problema.vizinhos[variavel] and not ac3(problema, novos_dominios, [(x, variavel) for x in problema.vizinhos[variavel]]):
+                estatisticas["podas_ac3"] += 1
+                continue
+            atribuicao[variavel] = valor
+            filhos.append((limite(atribuicao, novos_dominios), len(filhos), valor, novos_dominios))
+            del atribuicao[variavel]
+
+        for limite_filho, _, valor, novos_dominios in sorted(filhos):
+            if limite_filho >= melhor["custo"]:
+                # Os filhos seguintes têm limite ainda maior
+                estatisticas["podas_limite"] += 1
+                break
+            atribuicao[variavel] = valor
+            buscar(atribuicao, novos_dominios, limite_filho)
+            del atribuicao[variavel]
+
+    buscar({}, dominios, limite({}, dominios))
+    return melhor["atribuicao"], melhor["custo"], estatisticas
+
+
+# --- Modelagem da infiltração ---
+# Cada fortaleza f tem duas variáveis: ("nucleo", f) e ("abordagem", f).
+
+class PenalidadesInfiltracao(RestricaoSuave):
+    """
+    Todas as penalidades da infiltração: as individuais de cada fortaleza (tabela por
+    núcleo e abordagem), Combate em fortalezas adjacentes e Diplomacia onde não é eficaz.
+
+    Ficam numa única restrição para que o limite inferior considere as interações entre elas.
+    O limite é o maior de dois limites válidos:
+      - atribuição mínima de núcleos distintos (algoritmo húngaro) mais as penalidades entre
+        fortalezas que já são inevitáveis; quando todas as abordagens estão fixadas, é o custo ótimo;
+      - relaxação lagrangiana dos núcleos distintos: cada núcleo ganha um preço e a programação
+        dinâmica ao longo das fortalezas escolhe abordagens e núcleos (com Combate e Diplomacia
+        exatos) sem exigir núcleos distintos. Os preços são ajustados por subgradiente, partindo
+        dos preços do nó anterior da busca.
+    Como todas as penalidades são múltiplas de uma mesma granularidade, o limite é arredondado
+    para cima até o próximo múltiplo.
+    """
+
+    def __init__(self, tabela, nucleos, abordagens, diplomacia_ineficaz, iteracoes=20):
+        self.tabela = tabela  # Matriz (fortaleza, núcleo, abordagem) -> penalidade
+        self.num_fortalezas = len(tabela)
+        self.nucleos = list(nucleos)
+        self.abordagens = list(abordagens)
+        self.indice_nucleo = {nucleo: i for i, nucleo in enumerate(self.nucleos)}
+        self.indice_abordagem = {abordagem: i for i, abordagem in enumerate(self.abordagens)}
+        self.diplomacia_ineficaz = diplomacia_ineficaz  # Fortalezas onde Diplomacia é penalizada
+        self.iteracoes = iteracoes
+        self.granularidade = math.gcd(*tabela.ravel().tolist(), PENALIDADE_COMBATE_ADJACENTE,
+                                      PENALIDADE_DIPLOMACIA_INEFICAZ)
+        self._tabela_lista = tabela.tolist()  # Acesso rápido a um valor só
+        self._precos = np.zeros(len(self.nucleos))  # Preços do último nó, ponto de partida do próximo
+        self._cache = {}
+        escopo = [("nucleo", f) for f in range(self.num_fortalezas)] + [("abordagem", f) for f in range(self.num_fortalezas)]
+        super().__init__(escopo, self._penalidade_total)
+
+    def penalidade_individual(self, f, nucleo, abordagem):
+        return self._tabela_lista[f][self.indice_nucleo[nucleo]][self.indice_abordagem[abordagem]]
+
+    def _penalidade_total(self, *valores):
+        nucleos = valores[:self.num_fortalezas]
+        abordagens = valores[self.num_fortalezas:]
+        penalidade = sum(self.penalidade_individual(f, nucleos[f], abordagens[f]) for f in range(self.num_fortalezas))
+        penalidade += PENALIDADE_COMBATE_ADJACENTE * sum(
+            a == b == 'Combate' for a, b in zip(abordagens, abordagens[1:])
+        )
+        if any(abordagens[f] == 'Diplomacia' for f in self.diplomacia_ineficaz):
+            penalidade += PENALIDADE_DIPLOMACIA_INEFICAZ
+        return penalidade
+
+    def custo_minimo(self, f, nucleo, dominios):
+        return self._minimos(f, dominios)[nucleo]
+
+    def _minimos(self, f, dominios):
+        # Menor penalidade de cada núcleo dadas as abordagens ainda possíveis (memorizado por domínio)
+        chave = (f, tuple(dominios[("abordagem", f)]))
+        minimos = self._cache.get(chave)
+        if minimos is None:
+            minimos = {n: min(self.penalidade_individual(f, n, a) for a in chave[1]) for n in self.nucleos}
+            self._cache[chave] = minimos
+        return minimos
+
+    def limite_inferior(self, atribuicao, dominios):
+        custos = self._custos(dominios)
+        limite_hungaro = self._limite_nucleos(custos, dominios)
+        if limite_hungaro == float("inf"):
+            return limite_hungaro
+        limite_lagrangiano, self._precos = self._subgradiente(custos, self._precos)
+        limite = max(limite_hungaro, limite_lagrangiano)
+        # Custos são múltiplos da granularidade (a folga absorve o erro de ponto flutuante)
+        return math.ceil(limite / self.granularidade - 1e-9) * self.granularidade
+
+    def completar(self, atribuicao, dominios):
+        """
+        Solução completa boa (não necessariamente ótima) a partir das duas relaxações: as
+        abordagens da programação dinâmica com os preços atuais e, para elas, a atribuição
+        mínima de núcleos. Quando todas as abordagens já estão fixadas, é a melhor solução do nó.
+        """
+        custos = self._custos(dominios)
+        custo, abordagens, _ = self._melhores_abordagens(custos, self._precos)
+        if custo == float("inf"):
+            return None
+        matriz = custos[np.arange(self.num_fortalezas), :, abordagens].tolist()
+        custo, _, colunas = _atribuicao_minima(matriz)
+        if custo == float("inf"):
+            return None
+        solucao = {("abordagem", f): self.abordagens[a] for f, a in enumerate(abordagens)}
+        solucao.update({("nucleo", f): self.nucleos[n] for f, n in enumerate(colunas)})
+        return solucao
+
+    def _custos(self, dominios):
+        # Tabela restrita aos domínios atuais: infinito nos valores já eliminados
+        permitidos = np.zeros(self.tabela.shape, dtype=bool)
+        for f in range(self.num_fortalezas):
+            nucleos = [self.indice_nucleo[n] for n in dominios[("nucleo", f)]]
+            abordagens = [self.indice_abordagem[a] for a in dominios[("abordagem", f)]]
+            permitidos[f][np.ix_(nucleos, abordagens)] = True
+        return np.where(permitidos, self.tabela, np.inf)
+
+    def _limite_nucleos(self, custos, dominios):
+        custo, _, _ = _atribuicao_minima(custos.min(axis=2).tolist())
+        inevitavel = sum(
+            PENALIDADE_COMBATE_ADJACENTE for f in range(self.num_fortalezas - 1)
+            if dominios[("abordagem", f)] == dominios[("abordagem", f + 1)] == ['Combate']
+        )
+        if any(dominios[("abordagem", f)] == ['Diplomacia'] for f in self.diplomacia_ineficaz):
+            inevitavel += PENALIDADE_DIPLOMACIA_INEFICAZ
+        return custo + inevitavel
+
+    def _subgradiente(self, custos, precos):
+        # Núcleos distintos pagam no máximo a soma dos preços, então o custo da programação
+        # dinâmica com preços menos essa soma é um limite válido para quaisquer preços >= 0.
+        # O subgradiente aumenta o preço dos núcleos repetidos e reduz o dos que sobraram.
+        melhor, melhores_precos = -float("inf"), precos
+        passo = float(self.granularidade)
+        for _ in range(self.iteracoes):
+            custo, _, nucleos = self._melhores_abordagens(custos, precos)
+            limite = custo - precos.sum()
+            if limite > melhor:
+                melhor, melhores_precos = limite, precos
+            subgradiente = np.bincount(nucleos, minlength=len(self.nucleos)) - 1
+            if (subgradiente <= 0).all() and not precos[subgradiente < 0].any():
+                break  # Núcleos já distintos e sem preço nos que sobraram: limite exato da relaxação
+            precos = np.maximum(0, precos + passo * subgradiente)
+            passo *= 0.8
+        return melhor, melhores_precos
+
+    def _melhores_abordagens(self, custos, precos):
+        # Programação dinâmica ao longo das fortalezas. Estado: (abordagem da fortaleza atual,
+        # se já usou Diplomacia onde é ineficaz) -> (menor custo, abordagens até aqui).
+        # Retorna o custo, a abordagem e o núcleo mais barato (com preço) de cada fortaleza.
+        com_precos = custos + precos[None, :, None]
+        escolhidos = com_precos.argmin(axis=1)
+        minimos = np.take_along_axis(com_precos, escolhidos[:, None, :], axis=1)[:, 0, :].tolist()
+        combate = self.indice_abordagem.get('Combate')
+        diplomacia = self.indice_abordagem.get('Diplomacia')
+
+        estados = {(None, False): (0, None)}
+        for f in range(self.num_fortalezas):
+            proximos = {}
+            for abordagem, custo_fortaleza in enumerate(minimos[f]):
+                if custo_fortaleza == float("inf"):
+                    continue
+                usa_diplomacia = abordagem == diplomacia and f in self.diplomacia_ineficaz
+                for (anterior, diplomacia_usada), (custo, caminho) in estados.items():
+                    custo += custo_fortaleza
+                    if anterior == abordagem == combate:
+                        custo += PENALIDADE_COMBATE_ADJACENTE
+                    chave = (abordagem, diplomacia_usada or usa_diplomacia)
+                    if custo < proximos.get(chave, (float("inf"),))[0]:
+                        proximos[chave] = (custo, (abordagem, caminho))
+            estados = proximos
+        if not estados:
+            return float("inf"), None, None
+
+        custo, caminho = min(
+            ((custo + (PENALIDADE_DIPLOMACIA_INEFICAZ if diplomacia_usada else 0), caminho)
+             for (_, diplomacia_usada), (custo, caminho) in estados.items()),
+            key=lambda item: item[0],
+        )
+        abordagens = []
+        while caminho is not None:
+            abordagem, caminho = caminho
+            abordagens.append(abordagem)
+        abordagens.reverse()
+        return custo, abordagens, escolhidos[np.arange(self.num_fortalezas), abordagens]
+
+
+def _atribuicao_minima(custos):
+    # Algoritmo húngaro com potenciais (n linhas <= m colunas), O(n^2 m). Retorna o custo, os
+    # potenciais das colunas (<= 0, zero nas colunas livres), que servem de preços duais, e a
+    # coluna escolhida para cada linha.
+    n = len(custos)
+    m = len(custos[0]) if n else 0
+    if n > m:
+        return float("inf"), [0] * m, None
+    infinito = float("inf")
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    linha_da_coluna = [0] * (m + 1)
+    anterior = [0] * (m + 1)
+    for i in range(1, n + 1):
+        linha_da_coluna[0] = i
+        j0 = 0
+        minimos = [infinito] * (m + 1)
+        usadas = [False] * (m + 1)
+        while True:
+            usadas[j0] = True
+            i0 = linha_da_coluna[j0]
+            delta = infinito
+            j1 = 0
+            for j in range(1, m + 1):
+                if not usadas[j]:
+                    atual = custos[i0 - 1][j - 1] - u[i0] - v[j]
+                    if atual < minimos[j]:
+                        minimos[j] = atual
+                        anterior[j] = j0
+                    if minimos[j] < delta:
+                        delta = minimos[j]
+                        j1 = j
+            if delta == infinito:
+                return infinito, [0] * m, None  # Alguma fortaleza não tem núcleo disponível
+            for j in range(m + 1):
+                if usadas[j]:
+                    u[linha_da_coluna[j]] += delta
+                    v[j] -= delta
+                else:
+                    minimos[j] -= delta
+            j0 = j1
+            if linha_da_coluna[j0] == 0:
+                break
+        while j0:
+            j1 = anterior[j0]
+            linha_da_coluna[j0] = linha_da_coluna[j1]
+            j0 = j1
+    colunas = [0] * n
+    for j in range(1, m + 1):
+        if linha_da_coluna[j]:
+            colunas[linha_da_coluna[j] - 1] = j - 1
+    return -v[0], v[1:], colunas
+
+
+def problema_infiltracao(fortalezas=FORTALEZAS, nucleos=DOMINIO_NUCLEOS, abordagens=DOMINIO_ABORDAGENS):
+    """
+    Monta o problema da infiltração a partir dos dados das fortalezas, com as mesmas
+    penalidades de restricoes.calcular_aptidao. Núcleos únicos são uma restrição rígida.
+
+    Returns:
+        tuple: (ProblemaCSP, função de custo para ordenar os valores).
+    """
+    num_fortalezas = len(fortalezas)
+    dominios = {}
+    for f in range(num_fortalezas):
+        dominios[("nucleo", f)] = list(nucleos)
+    # Todas as variáveis estão na mesma restrição suave, então o grau não as diferencia; o
+    # desempate final é a ordem de inserção, que põe primeiro as fortalezas onde a Diplomacia
+    # é penalizada (a escolha delas afeta todas as outras)
+    ineficaz = {f for f, fortaleza in enumerate(fortalezas) if not fortaleza['diplomacia_eficaz']}
+    for f in sorted(range(num_fortalezas), key=lambda f: f not in ineficaz):
+        dominios[("abordagem", f)] = list(abordagens)
+
+    # Inventário limitado: todos os núcleos diferentes
+    rigidas = [(("nucleo", i), ("nucleo", j), lambda a, b: a != b)
+               for i in range(num_fortalezas) for j in range(i + 1, num_fortalezas)]
+
+    penalidades = PenalidadesInfiltracao(compilar_tabela(fortalezas, nucleos, abordagens), nucleos, abordagens, ineficaz)
+
+    def custo_valor(variavel, valor, dominios):
+        tipo, f = variavel
+        if tipo == "nucleo":
+            return penalidades.custo_minimo(f, valor, dominios)
+        return min(penalidades.penalidade_individual(f, n, valor) for n in dominios[("nucleo", f)])
+
+    return ProblemaCSP(dominios, rigidas, [penalidades], completar=penalidades.completar), custo_valor
+
+
+def resolver_infiltracao(fortalezas=FORTALEZAS, nucleos=DOMINIO_NUCLEOS, abordagens=DOMINIO_ABORDAGENS):
+    """
+    Encontra a melhor solução de forma determinística.
+
+    Returns:
+        tuple: (cromossomo no formato do algoritmo genético, aptidão, estatísticas da busca).
+               O cromossomo é None se não houver núcleos suficientes para todas as fortalezas.
+    """
+    problema, custo_valor = problema_infiltracao(fortalezas, nucleos, abordagens)
+    atribuicao, custo, estatisticas = resolver(problema, custo_valor)
+    if atribuicao is None:
+        return None, 0, estatisticas
+
+    num_fortalezas = len(fortalezas)
+    cromossomo = ([atribuicao[("nucleo", f)] for f in range(num_fortalezas)] +
+                  [atribuicao[("abordagem", f)] for f in range(num_fortalezas)])
+    return cromossomo, max(0, APTIDAO_BASE - custo), estatisticas
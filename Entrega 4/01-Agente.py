@@ -1,3 +1,12 @@
+import time
+
+import numpy as np
+
+from motor_regras import DIAGNOSTICO_PADRAO, MotorIncremental, MotorRegras, REGRAS_PADRAO, colunas_frota
+
+# Regras de diagnóstico compiladas (para usar outra tabela: MotorRegras(carregar_regras(caminho)))
+MOTOR_REGRAS = MotorRegras(REGRAS_PADRAO)
+
 # Define a função principal de diagnóstico para o carro de corrida Star-Racer 3000.
 def diagnosticar_carro(sintomas, estado_componentes):
     """
@@ -14,96 +23,10 @@ def diagnosticar_carro(sintomas, estado_componentes):
               (ação recomendada para o reparo).
               Se nenhum problema for identificado pelas regras, retorna uma sugestão de inspeção.
     """
-    diagnosticos = [] # Inicializa uma lista para armazenar todos os diagnósticos encontrados.
-
-    # --- Regras de Diagnóstico Baseadas em Sintomas Combinados e Individuais ---
-
-    # Regra 1: Perda de potência e fumaça do escapamento (indica problemas graves no motor/energia)
-    if 'perda_potencia' in sintomas and 'fumaça_escapamento' in sintomas:
-        diagnosticos.append({
-            'problema': 'Motor com falha grave ou sistema de energia instável.',
-            'acao_sugerida': 'Verificar velas, injeção e cabos do motor. Inspecionar regulador de voltagem.'
-        })
-
-    # Regra 2: Vibração anormal e direção puxando (sugere problemas em pneus/aerodinâmica)
-    if 'vibracao_anormal' in sintomas and 'direcao_puxando' in sintomas:
-        diagnosticos.append({
-            'problema': 'Pneus ou aerodinâmica comprometidos.',
-            'acao_sugerida': 'Checar balanceamento e alinhamento dos pneus. Inspecionar estado da asa traseira.'
-        })
-
-    # Regra 3: Cheiro queimado (sinal de superaquecimento ou curto-circuito)
-    if 'cheiro_queimado' in sintomas:
-        diagnosticos.append({
-            'problema': 'Superaquecimento de motor, freios ou curto-circuito elétrico.',
-            'acao_sugerida': 'Verificar nível de fluidos, temperatura do motor e fusíveis. Resfriar freios.'
-        })
-
-    # Regra 4: Instabilidade em curvas (relacionado a pneus ou aerodinâmica)
-    if 'instabilidade_curva' in sintomas:
-        diagnosticos.append({
-            'problema': 'Pneus com pressão irregular ou danos aerodinâmicos.',
-            'acao_sugerida': 'Verificar pressão dos pneus. Inspecionar defletores e spoilers.'
-        })
-
-    # Regra 5: Display do painel falhando (problemas no sistema elétrico/energia)
-    if 'display_painel_falha' in sintomas:
-        diagnosticos.append({
-            'problema': 'Falha no sistema de energia ou conectividade do painel.',
-            'acao_sugerida': 'Verificar fusíveis e conexões da bateria. Reiniciar sistema eletrônico.'
-        })
-
-    # Regra 6: Barulho metálico nos freios (indica desgaste de componentes do freio)
-    if 'barulho_metalico_freios' in sintomas:
-        diagnosticos.append({
-            'problema': 'Desgaste das pastilhas de freio ou discos.',
-            'acao_sugerida': 'Substituir pastilhas e verificar discos. Verificar vazamento de fluido.'
-        })
-
-    # Regra 7: Perda de potência (mas sem fumaça do escapamento, diagnóstico mais específico)
-    if 'perda_potencia' in sintomas and 'fumaça_escapamento' not in sintomas:
-        diagnosticos.append({
-            'problema': 'Possível falha de ignição ou obstrução na entrada de ar.',
-            'acao_sugerida': 'Verificar filtro de ar e sistema de ignição.'
-        })
-
-    # Regra 8: Fumaça do escapamento (mas sem perda de potência, outro diagnóstico específico)
-    if 'fumaça_escapamento' in sintomas and 'perda_potencia' not in sintomas:
-        diagnosticos.append({
-            'problema': 'Vazamento de óleo ou problema na combustão.',
-            'acao_sugerida': 'Verificar nível e vazamentos de óleo. Inspecionar bicos injetores.'
-        })
-
-
-    # Verifica se o motor está superaquecido
-    if estado_componentes.get('motor') == 'superaquecido':
-        diagnosticos.append({
-            'problema': 'Motor superaquecido.',
-            'acao_sugerida': 'Desligar o motor imediatamente. Verificar sistema de arrefecimento e nível de fluido.'
-        })
-
-    # Verifica se há pneu furado
-    if estado_componentes.get('pneus') == 'furado':
-        diagnosticos.append({
-            'problema': 'Pneu furado.',
-            'acao_sugerida': 'Substituir pneu danificado.'
-        })
-
-    # Verifica se o sistema de energia está sem energia
-    if estado_componentes.get('sistema_energia') == 'sem_energia':
-        diagnosticos.append({
-            'problema': 'Sem energia no sistema principal.',
-            'acao_sugerida': 'Verificar bateria e alternador. Chamar equipe de resgate.'
-        })
-
-    # Se, após todas as regras, nenhum diagnóstico específico foi adicionado, sugere uma inspeção geral.
-    if not diagnosticos:
-        diagnosticos.append({
-            'problema': 'Nenhum problema aparente com base nos sintomas e regras fornecidas.',
-            'acao_sugerida': 'Realizar uma inspeção de rotina completa.'
-        })
-
-    return diagnosticos
+    # As regras ficam na tabela REGRAS_PADRAO (motor_regras.py), compiladas uma vez em MOTOR_REGRAS.
+    # Os sintomas e estados viram uma máscara de bits e só as regras indexadas por algum
+    # fato presente são testadas.
+    return MOTOR_REGRAS.diagnosticar(sintomas, estado_componentes)
 
 # Função auxiliar para executar e imprimir os resultados de cada cenário.
 def executar_simulacao(cenario_nome, sintomas, estado_componentes):
@@ -216,12 +139,77 @@ estado_componentes_cenario8 = {
     'sistema_freios': 'ok'
 }
 
-# Chama a função de simulação para cada cenário definido.
-executar_simulacao("Motor com Problemas Graves", sintomas_cenario1, estado_componentes_cenario1)
-executar_simulacao("Problemas de Estabilidade (Pneus/Aerodinâmica)", sintomas_cenario2, estado_componentes_cenario2)
-executar_simulacao("Falha Elétrica e Aquecimento", sintomas_cenario3, estado_componentes_cenario3)
-executar_simulacao("Carro Sem Sintomas Aparente", sintomas_cenario4, estado_componentes_cenario4)
-executar_simulacao("Barulho nos Freios e Motor Quente", sintomas_cenario5, estado_componentes_cenario5)
-executar_simulacao("Apenas Perda de Potência", sintomas_cenario6, estado_componentes_cenario6)
-executar_simulacao("Apenas Fumaça do Escapamento", sintomas_cenario7, estado_componentes_cenario7)
-executar_simulacao("Pneu Furado Detectado", sintomas_cenario8, estado_componentes_cenario8)
+# Os 8 cenários como pares (sintomas, estado dos componentes), para o diagnóstico em lote.
+cenarios = [
+    (sintomas_cenario1, estado_componentes_cenario1), (sintomas_cenario2, estado_componentes_cenario2),
+    (sintomas_cenario3, estado_componentes_cenario3), (sintomas_cenario4, estado_componentes_cenario4),
+    (sintomas_cenario5, estado_componentes_cenario5), (sintomas_cenario6, estado_componentes_cenario6),
+    (sintomas_cenario7, estado_componentes_cenario7), (sintomas_cenario8, estado_componentes_cenario8),
+]
+
+
+# --- Diagnóstico incremental (telemetria contínua) ---
+# Em vez de rediagnosticar o estado completo a cada mudança, o motor incremental recebe só
+# as alterações (fatos adicionados/retirados) e emite as regras ativadas e retratadas.
+def executar_telemetria(carro, eventos):
+    """
+    Processa uma sequência de alterações de um carro e imprime as ativações e retratações.
+
+    Args:
+        carro (str): Identificador do carro.
+        eventos (list): Lista de (descrição, fatos adicionados, fatos retirados).
+    """
+    print(f"\n--- Telemetria contínua: {carro} ---")
+    for descricao, adicionados, retirados in eventos:
+        ativacoes, retratacoes = MOTOR_INCREMENTAL.atualizar(carro, adicionados, retirados)
+        print(f"{descricao}")
+        for r in ativacoes:
+            print(f"  + {MOTOR_REGRAS.regras[r]['problema']}")
+        for r in retratacoes:
+            print(f"  - {MOTOR_REGRAS.regras[r]['problema']}")
+    print(f"Diagnóstico atual: {[d['problema'] for d in MOTOR_INCREMENTAL.diagnosticos(carro)]}")
+    print("-" * 40)
+
+
+MOTOR_INCREMENTAL = MotorIncremental(MOTOR_REGRAS)
+
+
+if __name__ == "__main__":
+    # Chama a função de simulação para cada cenário definido.
+    executar_simulacao("Motor com Problemas Graves", sintomas_cenario1, estado_componentes_cenario1)
+    executar_simulacao("Problemas de Estabilidade (Pneus/Aerodinâmica)", sintomas_cenario2, estado_componentes_cenario2)
+    executar_simulacao("Falha Elétrica e Aquecimento", sintomas_cenario3, estado_componentes_cenario3)
+    executar_simulacao("Carro Sem Sintomas Aparente", sintomas_cenario4, estado_componentes_cenario4)
+    executar_simulacao("Barulho nos Freios e Motor Quente", sintomas_cenario5, estado_componentes_cenario5)
+    executar_simulacao("Apenas Perda de Potência", sintomas_cenario6, estado_componentes_cenario6)
+    executar_simulacao("Apenas Fumaça do Escapamento", sintomas_cenario7, estado_componentes_cenario7)
+    executar_simulacao("Pneu Furado Detectado", sintomas_cenario8, estado_componentes_cenario8)
+
+    executar_telemetria("SR-01", [
+        ("Piloto relata perda de potência", ['perda_potencia'], []),
+        ("Sensor detecta fumaça no escapamento", ['fumaça_escapamento'], []),
+        ("Motor superaquece", [('motor', 'superaquecido')], []),
+        ("Potência normalizada", [], ['perda_potencia']),
+        ("Motor resfriado, fumaça cessa", [('motor', 'ok')], ['fumaça_escapamento']),
+    ])
+
+    # --- Diagnóstico em lote da frota ---
+    # Os cenários viram colunas (um array por sintoma e por componente) e todas as regras são
+    # avaliadas de uma vez; o resultado é esparso: um par (carro, regra) por diagnóstico.
+    sintomas_frota, estados_frota, num_carros = colunas_frota(cenarios)
+    carros, regras = MOTOR_REGRAS.diagnosticar_frota(sintomas_frota, estados_frota, num_carros)
+    print("\n--- Diagnóstico em lote dos 8 cenários ---")
+    for carro in range(num_carros):
+        ids = regras[carros == carro].tolist()
+        esperado = diagnosticar_carro(*cenarios[carro])
+        obtido = [MOTOR_REGRAS.diagnostico(r) for r in ids] or [DIAGNOSTICO_PADRAO]
+        print(f"Cenário {carro + 1}: regras {[MOTOR_REGRAS.regras[r]['id'] for r in ids]} "
+              f"({'igual' if obtido == esperado else 'DIFERENTE'} a diagnosticar_carro)")
+
+    # Um milhão de leituras (os 8 cenários repetidos)
+    repeticoes = 125000
+    sintomas_grande = {nome: np.tile(coluna, repeticoes) for nome, coluna in sintomas_frota.items()}
+    estados_grande = {nome: np.tile(coluna, repeticoes) for nome, coluna in estados_frota.items()}
+    inicio = time.perf_counter()
+    carros, regras = MOTOR_REGRAS.diagnosticar_frota(sintomas_grande, estados_grande, num_carros * repeticoes)
+    print(f"{num_carros * repeticoes} carros diagnosticados em {time.perf_counter() - inicio:.3f} s ({len(carros)} diagnósticos)")
@@ -0,0 +1,370 @@
+import json
+
+import numpy as np
+
+# --- Motor de regras indexado para o diagnóstico do Star-Racer 3000 ---
+# As regras são dados: sintomas exigidos, sintomas que não podem estar presentes e estados
+# de componentes exigidos. Cada fato (um sintoma, ou um par (componente, estado)) recebe um
+# bit; uma regra vira duas máscaras inteiras e um diagnóstico vira um teste de bits.
+# Um índice fato -> regras evita olhar regras cujas condições não têm nenhum fato presente.
+
+# Cada regra:
+#   'id': identificador estável da regra
+#   'sintomas': sintomas que precisam estar presentes (todos)
+#   'sem_sintomas': sintomas que não podem estar presentes
+#   'estados': {componente: estado} que precisam valer (todos)
+#   'problema' e 'acao_sugerida': o diagnóstico emitido
+REGRAS_PADRAO = [
+    {
+        'id': 'motor_falha_grave',
+        'sintomas': ['perda_potencia', 'fumaça_escapamento'],
+        'problema': 'Motor com falha grave ou sistema de energia instável.',
+        'acao_sugerida': 'Verificar velas, injeção e cabos do motor. Inspecionar regulador de voltagem.',
+    },
+    {
+        'id': 'pneus_aerodinamica',
+        'sintomas': ['vibracao_anormal', 'direcao_puxando'],
+        'problema': 'Pneus ou aerodinâmica comprometidos.',
+        'acao_sugerida': 'Checar balanceamento e alinhamento dos pneus. Inspecionar estado da asa traseira.',
+    },
+    {
+        'id': 'cheiro_queimado',
+        'sintomas': ['cheiro_queimado'],
+        'problema': 'Superaquecimento de motor, freios ou curto-circuito elétrico.',
+        'acao_sugerida': 'Verificar nível de fluidos, temperatura do motor e fusíveis. Resfriar freios.',
+    },
+    {
+        'id': 'instabilidade_curva',
+        'sintomas': ['instabilidade_curva'],
+        'problema': 'Pneus com pressão irregular ou danos aerodinâmicos.',
+        'acao_sugerida': 'Verificar pressão dos pneus. Inspecionar defletores e spoilers.',
+    },
+    {
+        'id': 'painel_energia',
+        'sintomas': ['display_painel_falha'],
+        'problema': 'Falha no sistema de energia ou conectividade do painel.',
+        'acao_sugerida': 'Verificar fusíveis e conexões da bateria. Reiniciar sistema eletrônico.',
+    },
+    {
+        'id': 'desgaste_freios',
+        'sintomas': ['barulho_metalico_freios'],
+        'problema': 'Desgaste das pastilhas de freio ou discos.',
+        'acao_sugerida': 'Substituir pastilhas e verificar discos. Verificar vazamento de fluido.',
+    },
+    {
+        'id': 'ignicao_entrada_ar',
+        'sintomas': ['perda_potencia'],
+        'sem_sintomas': ['fumaça_escapamento'],
+        'problema': 'Possível falha de ignição ou obstrução na entrada de ar.',
+        'acao_sugerida': 'Verificar filtro de ar e sistema de ignição.',
+    },
+    {
+        'id': 'oleo_combustao',
+        'sintomas': ['fumaça_escapamento'],
+        'sem_sintomas': ['perda_potencia'],
+        'problema': 'Vazamento de óleo ou problema na combustão.',
+        'acao_sugerida': 'Verificar nível e vazamentos de óleo. Inspecionar bicos injetores.',
+    },
+    {
+        'id': 'motor_superaquecido',
+        'estados': {'motor': 'superaquecido'},
+        'problema': 'Motor superaquecido.',
+        'acao_sugerida': 'Desligar o motor imediatamente. Verificar sistema de arrefecimento e nível de fluido.',
+    },
+    {
+        'id': 'pneu_furado',
+        'estados': {'pneus': 'furado'},
+        'problema': 'Pneu furado.',
+        'acao_sugerida': 'Substituir pneu danificado.',
+    },
+    {
+        'id': 'sem_energia',
+        'estados': {'sistema_energia': 'sem_energia'},
+        'problema': 'Sem energia no sistema principal.',
+        'acao_sugerida': 'Verificar bateria e alternador. Chamar equipe de resgate.',
+    },
+]
+
+# Emitido quando nenhuma regra dispara
+DIAGNOSTICO_PADRAO = {
+    'problema': 'Nenhum problema aparente com base nos sintomas e regras fornecidas.',
+    'acao_sugerida': 'Realizar uma inspeção de rotina completa.',
+}
+
+
+def carregar_regras(caminho_arquivo):
+    """Carrega uma tabela de regras de um arquivo JSON (lista de regras no formato de REGRAS_PADRAO)."""
+    with open(caminho_arquivo, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+class MotorRegras:
+    def __init__(self, regras=REGRAS_PADRAO):
+        """
+        Compila a tabela de regras em máscaras de bits e em um índice fato -> regras.
+
+        Args:
+            regras (list): Lista de regras no formato de REGRAS_PADRAO. A ordem da tabela é
+                           a ordem em que os diagnósticos são emitidos.
+        """
+        self.regras = list(regras)
+        self.bits = {}  # Fato -> posição do bit; sintomas são strings, estados são (componente, estado)
+        self.exige = []  # Máscara dos fatos exigidos por cada regra
+        self.proibe = []  # Máscara dos sintomas que impedem cada regra
+        self.indice = {}  # Fato exigido -> ids (posições) das regras que o exigem
+        self.sem_exigencias = []  # Regras que só têm proibições: candidatas em todo diagnóstico
+        self.afetadas = {}  # Fato -> regras cujas condições (exigências ou proibições) o mencionam
+
+        for r, regra in enumerate(self.regras):
+            exigidos = list(regra.get('sintomas', ())) + list(regra.get('estados', {}).items())
+            self.exige.append(self._mascara(exigidos))
+            self.proibe.append(self._mascara(regra.get('sem_sintomas', ())))
+            for fato in exigidos:
+                self.indice.setdefault(fato, []).append(r)
+            if not exigidos:
+                self.sem_exigencias.append(r)
+            for fato in exigidos + list(regra.get('sem_sintomas', ())):
+                self.afetadas.setdefault(fato, []).append(r)
+
+    def _mascara(self, fatos):
+        mascara = 0
+        for fato in fatos:
+            if fato not in self.bits:
+                self.bits[fato] = len(self.bits)
+            mascara |= 1 << self.bits[fato]
+        return mascara
+
+    def compilar_fatos(self, sintomas, estado_componentes):
+        """
+        Uma única passada pelos fatos presentes.
+
+        Returns:
+            tuple: (máscara dos fatos presentes, conjunto das regras candidatas). Fatos que
+                   nenhuma regra menciona são ignorados; candidatas são as regras com algum
+                   fato exigido presente, mais as que não exigem nada.
+        """
+        mascara = 0
+        candidatas = set(self.sem_exigencias)
+        for fato in _fatos(sintomas, estado_componentes):
+            bit = self.bits.get(fato)
+            if bit is not None:
+                mascara |= 1 << bit
+                candidatas.update(self.indice.get(fato, ()))
+        return mascara, candidatas
+
+    def satisfeita(self, r, mascara):
+        return mascara & self.exige[r] == self.exige[r] and not mascara & self.proibe[r]
+
+    def regras_disparadas(self, sintomas, estado_componentes):
+        """Ids (posições na tabela) das regras satisfeitas, na ordem da tabela."""
+        mascara, candidatas = self.compilar_fatos(sintomas, estado_componentes)
+        return [r for r in sorted(candidatas) if self.satisfeita(r, mascara)]
+
+    def diagnosticar(self, sintomas, estado_componentes):
+        """Mesma saída de diagnosticar_carro: lista de {'problema', 'acao_sugerida'}."""
+        diagnosticos = [self.diagnostico(r) for r in self.regras_disparadas(sintomas, estado_componentes)]
+        return diagnosticos or [dict(DIAGNOSTICO_PADRAO)]
+
+    def diagnostico(self, r):
+        regra = self.regras[r]
+        return {'problema': regra['problema'], 'acao_sugerida': regra['acao_sugerida']}
+
+    # --- Diagnóstico da frota inteira (vetorizado) ---
+
+    def codificar_frota(self, sintomas, estado_componentes, num_carros):
+        """
+        Codifica os fatos de N carros em colunas de bits.
+
+        Args:
+            sintomas (dict): Nome do sintoma -> array booleano (N,) dizendo quais carros o têm.
+            estado_componentes (dict): Componente -> array (N,) com o estado de cada carro.
+            num_carros (int): N.
+
+        Returns:
+            np.ndarray: Matriz uint64 (N, palavras); o bit b do fato está na palavra b // 64.
+        """
+        palavras = np.zeros((num_carros, max(1, -(-len(self.bits) // 64))), dtype=np.uint64)
+        for fato, bit in self.bits.items():
+            if isinstance(fato, tuple):
+                componente, estado = fato
+                if componente not in estado_componentes:
+                    continue
+                presente = np.asarray(estado_componentes[componente]) == estado
+            else:
+                if fato not in sintomas:
+                    continue
+                presente = np.asarray(sintomas[fato], dtype=bool)
+            palavras[:, bit // 64] |= presente.astype(np.uint64) << np.uint64(bit % 64)
+        return palavras
+
+    def diagnosticar_frota(self, sintomas, estado_componentes, num_carros):
+        """
+        Avalia todas as regras para N carros de uma vez, cada regra como uma expressão
+        booleana vetorizada sobre as colunas de bits.
+
+        Args:
+            sintomas, estado_componentes, num_carros: Como em codificar_frota.
+
+        Returns:
+            tuple: (carros, regras), arrays com um par (id do carro, id da regra) por diagnóstico,
+                   ordenados por carro e, dentro do carro, na ordem da tabela. Carros sem nenhum
+                   par recebem DIAGNOSTICO_PADRAO.
+        """
+        palavras = self.codificar_frota(sintomas, estado_componentes, num_carros)
+        carros = []
+        regras = []
+        for r in range(len(self.regras)):
+            disparou = np.ones(num_carros, dtype=bool)
+            for w, (exige, proibe) in enumerate(zip(_dividir_palavras(self.exige[r], palavras.shape[1]),
+                                                    _dividir_palavras(self.proibe[r], palavras.shape[1]))):
+                if exige:
+                    disparou &= (palavras[:, w] & exige) == exige
+                if proibe:
+                    disparou &= (palavras[:, w] & proibe) == 0
+            ids = np.flatnonzero(disparou)
+            carros.append(ids)
+            regras.append(np.full(len(ids), r, dtype=np.int32))
+
+        carros = np.concatenate(carros) if carros else np.zeros(0, dtype=np.int64)
+        regras = np.concatenate(regras) if regras else np.zeros(0, dtype=np.int32)
+        ordem = np.argsort(carros, kind="stable")  # Estável: mantém a ordem das regras em cada carro
+        return carros[ordem], regras[ordem]
+
+
+def _dividir_palavras(mascara, num_palavras):
+    # Máscara inteira -> uma máscara uint64 por palavra de 64 bits
+    return [np.uint64((mascara >> (64 * w)) & 0xFFFFFFFFFFFFFFFF) for w in range(num_palavras)]
+
+
+def colunas_frota(carros):
+    """
+    Converte uma lista de (sintomas, estado_componentes), no formato de diagnosticar_carro,
+    para as colunas usadas por MotorRegras.diagnosticar_frota.
+
+    Returns:
+        tuple: (sintomas, estado_componentes, num_carros).
+    """
+    num_carros = len(carros)
+    sintomas = {}
+    estado_componentes = {}
+    for i, (sintomas_carro, estados_carro) in enumerate(carros):
+        for sintoma in sintomas_carro:
+            sintomas.setdefault(sintoma, np.zeros(num_carros, dtype=bool))[i] = True
+        for componente, estado in estados_carro.items():
+            estado_componentes.setdefault(componente, np.full(num_carros, '', dtype=object))[i] = estado
+    return sintomas, estado_componentes, num_carros
+
+
+def _fatos(sintomas, estado_componentes):
+    # Os sintomas e os pares (componente, estado) como fatos
+    yield from sintomas
+    yield from estado_componentes.items()
+
+
+# --- Modo incremental (estilo Rete) ---
+# Cada carro tem uma memória de trabalho com os fatos atuais, a máscara correspondente e as
+# regras ativas. Uma alteração (fatos adicionados ou retirados) só reavalia as regras que
+# mencionam os fatos alterados, então o custo não cresce com o tamanho da tabela de regras.
+
+class MemoriaTrabalho:
+    def __init__(self, motor):
+        self.sintomas = set()
+        self.estados = {}  # Componente -> estado atual
+        self.mascara = 0
+        # Regras sem exigências valem com a memória vazia (se também não proíbem nada presente)
+        self.ativas = {r for r in motor.sem_exigencias if motor.satisfeita(r, 0)}
+
+
+class MotorIncremental:
+    def __init__(self, motor=None):
+        """
+        Args:
+            motor (MotorRegras): Regras compiladas. Padrão: MotorRegras(REGRAS_PADRAO).
+        """
+        self.motor = motor if motor is not None else MotorRegras()
+        self.memorias = {}  # Id do carro -> MemoriaTrabalho
+
+    def memoria(self, carro):
+        if carro not in self.memorias:
+            self.memorias[carro] = MemoriaTrabalho(self.motor)
+        return self.memorias[carro]
+
+    def remover_carro(self, carro):
+        self.memorias.pop(carro, None)
+
+    def atualizar(self, carro, adicionados=(), retirados=()):
+        """
+        Aplica uma alteração na memória de trabalho do carro.
+
+        Args:
+            carro: Identificador do carro.
+            adicionados (iterable): Fatos novos: sintomas (str) ou estados (componente, estado).
+                                    Um estado novo substitui o estado anterior do componente.
+            retirados (iterable): Fatos que deixaram de valer. Os retirados são aplicados antes
+                                  dos adicionados.
+
+        Returns:
+            tuple: (ativações, retratações), listas de ids (posições na tabela) das regras que
+                   passaram a disparar e das que deixaram de disparar, na ordem da tabela.
+        """
+        memoria = self.memoria(carro)
+        tocadas = set()
+
+        for fato in retirados:
+            if isinstance(fato, tuple):
+                componente, estado = fato
+                if memoria.estados.get(componente) != estado:
+                    continue
+                del memoria.estados[componente]
+            elif fato in memoria.sintomas:
+                memoria.sintomas.remove(fato)
+            else:
+                continue
+            self._alterar_bit(memoria, fato, False, tocadas)
+
+        for fato in adicionados:
+            if isinstance(fato, tuple):
+                componente, estado = fato
+                anterior = memoria.estados.get(componente)
+                if anterior == estado:
+                    continue
+                if anterior is not None:
+                    self._alterar_bit(memoria, (componente, anterior), False, tocadas)
+                memoria.estados[componente] = estado
+            elif fato not in memoria.sintomas:
+                memoria.sintomas.add(fato)
+            else:
+                continue
+            self._alterar_bit(memoria, fato, True, tocadas)
+
+        ativacoes = []
+        retratacoes = []
+        for r in sorted(tocadas):
+            ativa = self.motor.satisfeita(r, memoria.mascara)
+            if ativa and r not in memoria.ativas:
+                memoria.ativas.add(r)
+                ativacoes.append(r)
+            elif not ativa and r in memoria.ativas:
+                memoria.ativas.remove(r)
+                retratacoes.append(r)
+        return ativacoes, retratacoes
+
+    def definir_estado(self, carro, componente, estado):
+        """Atalho para atualizar o estado de um componente."""
+        return self.atualizar(carro, adicionados=[(componente, estado)])
+
+    def diagnosticos(self, carro):
+        """Diagnósticos atuais do carro, no mesmo formato de MotorRegras.diagnosticar."""
+        ativas = sorted(self.memoria(carro).ativas)
+        return [self.motor.diagnostico(r) for r in ativas] or [dict(DIAGNOSTICO_PADRAO)]
+
+    def _alterar_bit(self, memoria, fato, presente, tocadas):
+        # Fatos que nenhuma regra menciona ficam só na memória, sem bit
+        bit = self.motor.bits.get(fato)
+        if bit is None:
+            return
+        if presente:
+            memoria.mascara |= 1 << bit
+        else:
+            memoria.mascara &= ~(1 << bit)
+        tocadas.update(self.motor.afetadas.get(fato, ()))
@@ -0,0 +1,129 @@
+import csv
+import os
+import struct
+
+import numpy as np
+
+# Log binário das posições da bola: um cabeçalho pequeno seguido de registros de largura
+# fixa, uma coluna float64 por campo. O arquivo é pré-alocado em blocos e o leitor mapeia
+# os registros direto na memória como um array estruturado do NumPy, sem parsing.
+#
+# Cabeçalho (little-endian):
+#   magic (8 bytes) | versão (uint16) | número de colunas (uint16) | reservado (uint32)
+#   capacidade em registros (uint64) | registros válidos (uint64)
+#   nome de cada coluna (16 bytes, ASCII, completado com zeros)
+# O tamanho do cabeçalho é arredondado para múltiplo de 64 bytes.
+
+MAGIC = b'BALLLOG\x00'
+VERSION = 1
+COLUMNS = ['time', 'raw_x', 'raw_y', 'moving_avg_x', 'moving_avg_y', 'kalman_x', 'kalman_y']
+
+_FIXED = struct.Struct('<8sHHIQQ')
+_CAPACITY_OFFSET = _FIXED.size - 16  # Capacidade e contagem são os dois últimos campos fixos
+_NAME_SIZE = 16
+
+
+def _header_size(num_columns):
+    size = _FIXED.size + _NAME_SIZE * num_columns
+    return -(-size // 64) * 64
+
+
+def record_dtype(columns):
+    return np.dtype([(name, '<f8') for name in columns])
+
+
+class BinaryLogWriter:
+    def __init__(self, path, columns=COLUMNS, capacity=65536):
+        """
+        Cria o arquivo e pré-aloca espaço para 'capacity' registros (dobra quando enche).
+        Pode ser usado como sink do VisionPipeline: writer(linhas) grava um lote.
+        """
+        self.columns = list(columns)
+        self.dtype = record_dtype(self.columns)
+        self.header_size = _header_size(len(self.columns))
+        self.capacity = capacity
+        self.count = 0
+        self.file = open(path, 'w+b')
+        self.file.write(self._header())
+        self.file.truncate(self.header_size + capacity * self.dtype.itemsize)
+
+    def _header(self):
+        names = b''.join(name.encode('ascii')[:_NAME_SIZE].ljust(_NAME_SIZE, b'\x00') for name in self.columns)
+        header = _FIXED.pack(MAGIC, VERSION, len(self.columns), 0, self.capacity, self.count) + names
+        return header.ljust(self.header_size, b'\x00')
+
+    def __call__(self, rows):
+        self.append_many(rows)
+
+    def append(self, row):
+        self.append_many([row])
+
+    def append_many(self, rows):
+        records = np.asarray(rows, dtype='<f8').reshape(-1, len(self.columns))
+        if self.count + len(records) > self.capacity:
+            while self.count + len(records) > self.capacity:
+                self.capacity *= 2
+            self.file.truncate(self.header_size + self.capacity * self.dtype.itemsize)
+        self.file.seek(self.header_size + self.count * self.dtype.itemsize)
+        self.file.write(records.tobytes())
+        self.count += len(records)
+        self._write_count()
+
+    def _write_count(self):
+        # Capacidade e contagem ficam juntas no cabeçalho; o leitor só enxerga registros completos
+        self.file.seek(_CAPACITY_OFFSET)
+        self.file.write(struct.pack('<QQ', self.capacity, self.count))
+        self.file.flush()
+
+    def close(self):
+        self._write_count()
+        self.file.close()
+
+
+def read_header(path):
+    """Retorna (colunas, capacidade, registros válidos, tamanho do cabeçalho)."""
+    with open(path, 'rb') as file:
+        magic, version, num_columns, _, capacity, count = _FIXED.unpack(file.read(_FIXED.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um log binário de posições")
+        if version != VERSION:
+            raise ValueError(f"Versão {version} do log não suportada")
+        names = file.read(_NAME_SIZE * num_columns)
+    columns = [names[i:i + _NAME_SIZE].rstrip(b'\x00').decode('ascii') for i in range(0, len(names), _NAME_SIZE)]
+    return columns, capacity, count, _header_size(num_columns)
+
+
+def read_binary_log(path):
+    """Mapeia os registros válidos como um array estruturado (np.memmap, somente leitura)."""
+    columns, _, count, header_size = read_header(path)
+    if count == 0:
+        return np.zeros(0, dtype=record_dtype(columns))
+    return np.memmap(path, dtype=record_dtype(columns), mode='r', offset=header_size, shape=(count,))
+
+
+def load_dataframe(path):
+    """Mesmo DataFrame de pd.read_csv(ball_positions*.csv), a partir do log binário."""
+    import pandas as pd
+
+    return pd.DataFrame(read_binary_log(path))
+
+
+def convert_csv(csv_path, binary_path):
+    """Converte um ball_positions*.csv existente para o formato binário. Retorna o número de registros."""
+    with open(csv_path, newline='') as file:
+        reader = csv.reader(file)
+        columns = next(reader)
+        rows = [[float(value) for value in row] for row in reader if row]
+    writer = BinaryLogWriter(binary_path, columns, capacity=max(1, len(rows)))
+    if rows:
+        writer.append_many(rows)
+    writer.close()
+    return len(rows)
+
+
+if __name__ == '__main__':
+    # Converte os CSVs gravados que estiverem na pasta
+    for name in sorted(os.listdir('.')):
+        if name.startswith('ball_positions') and name.endswith('.csv'):
+            binary_name = name[:-len('.csv')] + '.bin'
+            print(f"{name} -> {binary_name}: {convert_csv(name, binary_name)} registros")
@@ -1,9 +1,11 @@
 from collections import deque
+import bisect
 import math
 import numpy as np
-from filterpy.kalman import KalmanFilter
 
 
+# Versão original: recalcula a média de todo o histórico a cada frame (a janela é o maxlen do deque).
+# Mantida por compatibilidade; prefira MovingAverageFilter.
 def moving_average_position(history, window_size=7):
     if len(history) == 0:
         return None
@@ -12,9 +14,88 @@ def moving_average_position(history, window_size=7):
     return (avg_x, avg_y)
 
 
+# Média móvel com buffer circular e somas acumuladas: O(1) por atualização
+class MovingAverageFilter:
+    def __init__(self, window_size=5):
+        self.window_size = window_size
+        self.xs = [0.0] * window_size
+        self.ys = [0.0] * window_size
+        self.count = 0  # Posições no buffer (até window_size)
+        self.index = 0  # Próxima posição a sobrescrever
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+
+    def update(self, position):
+        x, y = position
+        if self.count == self.window_size:
+            # Sai a posição mais antiga da janela
+            self.sum_x -= self.xs[self.index]
+            self.sum_y -= self.ys[self.index]
+        else:
+            self.count += 1
+        self.xs[self.index] = x
+        self.ys[self.index] = y
+        self.sum_x += x
+        self.sum_y += y
+        self.index += 1
+        if self.index == self.window_size:
+            self.index = 0
+            # A cada volta do buffer, recalcula as somas para não acumular erro de arredondamento
+            # (O(window_size) a cada window_size atualizações: continua O(1) amortizado)
+            self.sum_x = sum(self.xs[:self.count])
+            self.sum_y = sum(self.ys[:self.count])
+        return (self.sum_x / self.count, self.sum_y / self.count)
+
+
+# Média móvel exponencial: cada nova posição pesa alpha, o histórico pesa (1 - alpha)
+class ExponentialMovingAverageFilter:
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.position = None
+
+    def update(self, position):
+        x, y = position
+        if self.position is None:
+            self.position = (x, y)
+        else:
+            avg_x, avg_y = self.position
+            self.position = (avg_x + self.alpha * (x - avg_x), avg_y + self.alpha * (y - avg_y))
+        return self.position
+
+
+# Mediana móvel: robusta a detecções espúrias isoladas; mantém cada eixo ordenado com bisect
+class MovingMedianFilter:
+    def __init__(self, window_size=5):
+        self.window_size = window_size
+        self.window = deque()
+        self.sorted_x = []
+        self.sorted_y = []
+
+    def update(self, position):
+        x, y = position
+        if len(self.window) == self.window_size:
+            old_x, old_y = self.window.popleft()
+            del self.sorted_x[bisect.bisect_left(self.sorted_x, old_x)]
+            del self.sorted_y[bisect.bisect_left(self.sorted_y, old_y)]
+        self.window.append((x, y))
+        bisect.insort(self.sorted_x, x)
+        bisect.insort(self.sorted_y, y)
+        return (_median(self.sorted_x), _median(self.sorted_y))
+
+
+def _median(sorted_values):
+    middle = len(sorted_values) // 2
+    if len(sorted_values) % 2:
+        return sorted_values[middle]
+    return (sorted_values[middle - 1] + sorted_values[middle]) / 2
+
+
 # Classe para o Filtro de Kalman
 class KalmanFilter2D:
-    def __init__(self):
+    def __init__(self, process_noise=0.5, measurement_noise=10., initial_covariance=1000.):
+        # filterpy é importado só aqui: ConstantVelocityTracker não precisa dele
+        from filterpy.kalman import KalmanFilter
+
         # Inicializa o filtro de Kalman
         self.kf = KalmanFilter(dim_x=4, dim_z=2)
         self.kf.x = np.array([0., 0., 0., 0.])  # Posição inicial [x, y, vx, vy]
@@ -24,15 +105,79 @@ class KalmanFilter2D:
                               [0., 0., 0., 1.]])
         self.kf.H = np.array([[1., 0., 0., 0.],  # Matriz de observação
                               [0., 1., 0., 0.]])
-        self.kf.P *= 1000.  # Covariância inicial
-        self.kf.R = np.array([[10., 0.], [0., 10.]])  # Covariância do ruído de medição
-        self.kf.Q = np.array([[0.5, 0., 0., 0.],    # Covariância do processo
-                              [0., 0.5, 0., 0.],
-                              [0., 0., 0.5, 0.],
-                              [0., 0., 0., 0.5]])
+        self.kf.P *= initial_covariance  # Covariância inicial
+        self.kf.R = np.eye(2) * measurement_noise  # Covariância do ruído de medição
+        self.kf.Q = np.eye(4) * process_noise  # Covariância do processo
 
     def update(self, position):
         # Atualiza o estado do filtro de Kalman com a nova posição
         self.kf.predict()
         self.kf.update(np.array(position))  # Converte a posição para array NumPy
         return self.kf.x[:2]  # Retorna a posição suavizada (x, y)
+
+
+# Filtro de Kalman de velocidade constante em forma fechada.
+# Com F, H, Q e R bloco-diagonais, x e y são dois filtros independentes de 2 estados
+# (posição, velocidade) com a mesma covariância, então basta guardar 3 escalares de P
+# (p_pp, p_pv, p_vv) para os dois eixos, sem matrizes nem inversões.
+# O passo de predição usa o dt real entre frames, medido em frames nominais
+# (frame_period), para que os parâmetros tenham o mesmo significado do KalmanFilter2D:
+# com dt = 1 as saídas são as mesmas.
+class ConstantVelocityTracker:
+    def __init__(self, process_noise=0.5, measurement_noise=10., initial_covariance=1000., frame_period=1 / 60):
+        self.q = process_noise  # Ruído de processo por frame (diagonal de Q no KalmanFilter2D)
+        self.r = measurement_noise
+        self.frame_period = frame_period
+        self.x = 0.
+        self.y = 0.
+        self.vx = 0.
+        self.vy = 0.
+        self.p_pp = initial_covariance
+        self.p_pv = 0.
+        self.p_vv = initial_covariance
+        self.last_timestamp = None
+
+    def update(self, position, timestamp=None):
+        """
+        Predição + atualização com uma nova posição medida.
+
+        Args:
+            position (tuple): Posição (x, y) medida.
+            timestamp (float): Tempo da medida em segundos. Sem ele (ou na primeira
+                               medida), o intervalo é de um frame nominal. Um tempo
+                               anterior ao último não faz predição.
+
+        Returns:
+            tuple: Posição suavizada (x, y).
+        """
+        dt = 1.
+        if timestamp is not None:
+            if self.last_timestamp is not None:
+                # Pacote atrasado (tempo anterior ao último): sem predição, e o último tempo
+                # não volta. Um dt negativo tiraria q * dt da covariância
+                dt = max(0., (timestamp - self.last_timestamp) / self.frame_period)
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+
+        # Predição: x += v dt; P = F P F' + Q, com Q proporcional ao tempo decorrido
+        q = self.q * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        p_pp = self.p_pp + 2. * dt * self.p_pv + dt * dt * self.p_vv + q
+        p_pv = self.p_pv + dt * self.p_vv
+        p_vv = self.p_vv + q
+
+        # Atualização: ganho de Kalman escalar (H = [1, 0] em cada eixo)
+        s = p_pp + self.r
+        k_p = p_pp / s
+        k_v = p_pv / s
+        innovation_x = position[0] - self.x
+        innovation_y = position[1] - self.y
+        self.x += k_p * innovation_x
+        self.y += k_p * innovation_y
+        self.vx += k_v * innovation_x
+        self.vy += k_v * innovation_y
+        self.p_pp = (1. - k_p) * p_pp
+        self.p_pv = (1. - k_p) * p_pv
+        self.p_vv = p_vv - k_v * p_pv
+        return (self.x, self.y)
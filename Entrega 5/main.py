@@ -1,49 +1,97 @@
-import sslclient
+import argparse
 import time
-import csv
-from collections import deque
-from filters import moving_average_position, KalmanFilter2D
+from filters import MovingAverageFilter, ConstantVelocityTracker
+from binlog import BinaryLogWriter, COLUMNS
+from multi_tracker import TrackerBank, detection_positions
+from pipeline import VisionPipeline, CsvBatchWriter, UdpReplayClient, UdpReplayServer, extract_ball_position
 
-# Configurações do cliente SSL
-c = sslclient.client(ip='224.5.23.2', port=10006)
+parser = argparse.ArgumentParser(description='Captura e suavização da posição da bola (visão SSL)')
+parser.add_argument('--replay', help='CSV gravado (ball_positions*.csv) reenviado por UDP local no lugar do multicast')
+parser.add_argument('--speed', type=float, default=1.0, help='Velocidade do replay (0 = o mais rápido possível)')
+parser.add_argument('--output', default=None, help='Arquivo de saída (padrão: ball_positions.csv ou .bin)')
+parser.add_argument('--format', choices=['csv', 'bin'], default='csv', help='Formato do log (bin: registros float64, ver binlog.py)')
+parser.add_argument('--duration', type=float, default=None, help='Tempo de captura em segundos (padrão: sem limite)')
+parser.add_argument('--fit-noise', metavar='LOG', default=None,
+                    help='Log gravado (.csv ou .bin) usado para ajustar R/Q do Kalman por máxima verossimilhança (smoothing.fit_noise)')
+args = parser.parse_args()
+
+# Configurações do cliente: multicast SSL real ou replay local
+if args.replay:
+    replay_server = UdpReplayServer.from_csv(args.replay, port=10006, speed=args.speed or None)
+    c = UdpReplayClient(ip='127.0.0.1', port=10006)
+else:
+    import sslclient
+    replay_server = None
+    c = sslclient.client(ip='224.5.23.2', port=10006)
 c.connect()
 
 # Configurações da média móvel
-ball_position_history = deque(maxlen=5)
-
-# Inicializa o filtro de Kalman
-kalman_filter = KalmanFilter2D()
-
-# Abrir arquivo CSV para registrar os dados
-with open('ball_positions.csv', mode='w') as file:
-    writer = csv.writer(file)
-    writer.writerow(['time', 'raw_x', 'raw_y', 'moving_avg_x', 'moving_avg_y', 'kalman_x', 'kalman_y'])
-
-    while True:
-        # Receber dados do cliente
-        data = c.receive()
-        current_time = time.time()
-        
-        if data.HasField('detection'):
-            detection = data.detection
-
-            # Acessa a posição da bola
-            ball_position = (detection.balls[0].x, detection.balls[0].y) if detection.balls else None
-
-            if ball_position:
-                # Suavização pela média móvel
-                ball_position_history.append(ball_position)
-                moving_avg_position = moving_average_position(ball_position_history)
-                
-                # Suavização pelo filtro de Kalman
-                kalman_position = kalman_filter.update(ball_position)
-
-                # Registrar dados no CSV
-                writer.writerow([
-                    current_time, 
-                    ball_position[0], ball_position[1],  # Posições brutas
-                    moving_avg_position[0], moving_avg_position[1],  # Posição pela média móvel
-                    kalman_position[0], kalman_position[1]  # Posição pelo filtro de Kalman
-                ])
-
-                print(f"Raw: {ball_position}, Moving Avg: {moving_avg_position}, Kalman: {kalman_position}")
\ No newline at end of file
+moving_average_filter = MovingAverageFilter(window_size=5)
+
+# Inicializa o filtro de Kalman (mesmos parâmetros do KalmanFilter2D, mas usando o dt real entre frames).
+# Com --fit-noise, q e r vêm do ajuste sobre um log gravado, com o mesmo dt real.
+kalman_filter = ConstantVelocityTracker()
+if args.fit_noise:
+    from replay import load_frames
+    from smoothing import fit_noise
+    q, r, _ = fit_noise(*load_frames(args.fit_noise), frame_period=kalman_filter.frame_period)
+    print(f"Ruído ajustado em {args.fit_noise}: q = {q:.4f}, r = {r:.4f}")
+    kalman_filter = ConstantVelocityTracker(process_noise=q, measurement_noise=r)
+
+# Rastreamento de todas as bolas e robôs do pacote (um banco de filtros por tipo de objeto).
+# Cada pacote vem de uma câmera; os bancos só contam frames perdidos com a câmera dona do alvo.
+trackers = {'balls': TrackerBank(), 'robots_yellow': TrackerBank(), 'robots_blue': TrackerBank()}
+
+
+# Estágio de filtragem: roda numa thread própria, fora da recepção
+def process_frame(data, current_time):
+    if data.HasField('detection'):
+        for kind, positions in detection_positions(data.detection).items():
+            trackers[kind].step(positions, data.detection.t_capture, data.detection.camera_id)
+
+    # Acessa a posição da bola
+    ball_position = extract_ball_position(data)
+    if not ball_position:
+        return None
+
+    # Suavização pela média móvel
+    moving_avg_position = moving_average_filter.update(ball_position)
+
+    # Suavização pelo filtro de Kalman
+    kalman_position = kalman_filter.update(ball_position, data.detection.t_capture)
+
+    return [
+        current_time,
+        ball_position[0], ball_position[1],  # Posições brutas
+        moving_avg_position[0], moving_avg_position[1],  # Posição pela média móvel
+        kalman_position[0], kalman_position[1]  # Posição pelo filtro de Kalman
+    ]
+
+
+# Registrar dados em lotes, numa thread de escrita (CSV ou log binário)
+if args.format == 'bin':
+    writer = BinaryLogWriter(args.output or 'ball_positions.bin', COLUMNS)
+else:
+    writer = CsvBatchWriter(args.output or 'ball_positions.csv', COLUMNS)
+pipeline = VisionPipeline(c, process_frame, writer).start()
+if replay_server:
+    replay_server.start()
+
+# A thread principal só acompanha o pipeline (o print por frame travava a recepção)
+start = time.monotonic()
+try:
+    while args.duration is None or time.monotonic() - start < args.duration:
+        time.sleep(1.0)
+        tracked = {kind: len(bank) for kind, bank in trackers.items()}
+        print(f"Status: {pipeline.stats()} | Alvos rastreados: {tracked}")
+        if replay_server and replay_server.done.is_set():
+            time.sleep(0.2)  # Últimos datagramas em trânsito
+            break
+except KeyboardInterrupt:
+    pass
+finally:
+    # O pipeline fecha o cliente (acordando a recepção) e a thread de escrita fecha o writer
+    still_running = pipeline.stop()
+    if still_running:
+        print(f"Aviso: estágios ainda rodando após o stop: {still_running}")
+    print(f"Final: {pipeline.stats()}")
@@ -0,0 +1,316 @@
+import csv
+import queue
+import socket
+import struct
+import threading
+import time
+
+# Pipeline de ingestão da visão SSL em três estágios, cada um na sua thread:
+#   recepção (source.receive) -> filtragem (process) -> escrita em lotes (sink)
+# ligados por filas limitadas. Se um estágio atrasa (disco ou stdout travado), a fila
+# enche e os pacotes novos são descartados e contados, em vez de bloquear a recepção
+# e perder pacotes multicast no buffer do socket.
+
+
+class VisionPipeline:
+    def __init__(self, source, process, sink, queue_size=1024, batch_size=256, flush_interval=0.5):
+        """
+        Args:
+            source: Objeto com receive() -> pacote, como sslclient.client ou UdpReplayClient.
+                    receive() pode retornar None (timeout) para que a thread consiga parar.
+                    Se tiver close(), stop() o chama para acordar um receive() bloqueado.
+            process (callable): process(pacote, tempo_recepcao) -> linha (lista) ou None.
+            sink (callable): sink(linhas) grava um lote de linhas (ex: CsvBatchWriter). Se tiver
+                             close(), é fechado pela própria thread de escrita depois do último lote.
+            queue_size (int): Capacidade de cada fila entre os estágios.
+            batch_size (int): Linhas acumuladas antes de chamar o sink.
+            flush_interval (float): Tempo máximo (s) que uma linha espera no lote.
+        """
+        self.source = source
+        self.process = process
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.packet_queue = queue.Queue(maxsize=queue_size)
+        self.row_queue = queue.Queue(maxsize=queue_size)
+        # Cada contador é alterado por uma única thread
+        self.counters = {
+            'received': 0, 'processed': 0, 'written': 0,
+            'dropped_packets': 0, 'dropped_rows': 0, 'batches': 0,
+        }
+        self._stop_receiving = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for target in (self._receive_loop, self._process_loop, self._write_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=2.0):
+        """
+        Para a recepção e espera os outros estágios esvaziarem as filas e gravarem o último lote.
+
+        Returns:
+            list: Estágios ('receive', 'process', 'write') que ainda estavam rodando depois do
+                  timeout de cada join; vazia se o pipeline parou por completo. Um escritor que
+                  termine depois ainda grava o último lote e fecha o sink.
+        """
+        self._stop_receiving.set()
+        close = getattr(self.source, 'close', None)
+        if close is not None:
+            close()  # Acorda um receive() bloqueado (sslclient, socket sem timeout)
+        receiver, processor, writer = self._threads
+        still_running = []
+
+        receiver.join(timeout)
+        if receiver.is_alive():
+            still_running.append('receive')
+        try:
+            self.packet_queue.put(None, timeout=timeout)  # Sentinela: fim dos pacotes
+        except queue.Full:
+            pass  # Processamento travado com a fila cheia; é reportado abaixo
+        processor.join(timeout)
+        if processor.is_alive():
+            still_running.append('process')
+        writer.join(timeout)
+        if writer.is_alive():
+            still_running.append('write')
+        return still_running
+
+    def stats(self):
+        """Contadores e profundidade atual das filas."""
+        stats = dict(self.counters)
+        stats['packet_queue_depth'] = self.packet_queue.qsize()
+        stats['row_queue_depth'] = self.row_queue.qsize()
+        return stats
+
+    # --- Estágios ---
+
+    def _receive_loop(self):
+        while not self._stop_receiving.is_set():
+            try:
+                packet = self.source.receive()
+            except OSError:
+                if self._stop_receiving.is_set():
+                    return  # Fonte fechada por stop() durante o receive()
+                raise
+            if packet is None:
+                continue
+            self.counters['received'] += 1
+            try:
+                self.packet_queue.put_nowait((time.time(), packet))
+            except queue.Full:
+                self.counters['dropped_packets'] += 1
+
+    def _process_loop(self):
+        while True:
+            item = self.packet_queue.get()
+            if item is None:
+                self.row_queue.put(None)  # Repassa a sentinela para o escritor
+                return
+            receive_time, packet = item
+            row = self.process(packet, receive_time)
+            self.counters['processed'] += 1
+            if row is None:
+                continue
+            try:
+                self.row_queue.put_nowait(row)
+            except queue.Full:
+                self.counters['dropped_rows'] += 1
+
+    def _write_loop(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                row = self.row_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                row = False  # Só o prazo do lote venceu
+            if row is None:
+                self._flush(batch)
+                close = getattr(self.sink, 'close', None)
+                if close is not None:
+                    close()  # Só esta thread escreve no sink, então só ela pode fechá-lo
+                return
+            if row is not False:
+                batch.append(row)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch):
+        if batch:
+            self.sink(batch)
+            self.counters['written'] += len(batch)
+            self.counters['batches'] += 1
+
+
+class CsvBatchWriter:
+    """Grava lotes de linhas em um CSV com um único writerows e flush por lote."""
+
+    def __init__(self, path, header):
+        self.file = open(path, mode='w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def __call__(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def extract_ball_position(packet):
+    """Posição (x, y) da primeira bola de um pacote de visão, ou None."""
+    if not packet.HasField('detection'):
+        return None
+    detection = packet.detection
+    return (detection.balls[0].x, detection.balls[0].y) if detection.balls else None
+
+
+# --- Substituto local do multicast SSL (replay por UDP) ---
+# Os pacotes de detecção são codificados num formato binário simples e decodificados em
+# objetos com a mesma interface usada do protobuf (HasField, detection.balls[i].x, ...),
+# para que o pipeline rode sem o sslclient e sem o campo.
+
+_HEADER = struct.Struct('<dHHHH')  # t_capture, camera_id, número de bolas, robôs amarelos, robôs azuis
+_BALL = struct.Struct('<dd')  # x, y
+_ROBOT = struct.Struct('<Hdd')  # robot_id, x, y
+
+
+class _Ball:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class _Robot:
+    __slots__ = ('robot_id', 'x', 'y')
+
+    def __init__(self, robot_id, x, y):
+        self.robot_id = robot_id
+        self.x = x
+        self.y = y
+
+
+class _Detection:
+    def __init__(self, t_capture, balls, robots_yellow, robots_blue, camera_id=0):
+        self.t_capture = t_capture
+        self.camera_id = camera_id
+        self.balls = balls
+        self.robots_yellow = robots_yellow
+        self.robots_blue = robots_blue
+
+
+class DetectionPacket:
+    """Pacote com a mesma interface de SSL_WrapperPacket usada pelo main.py."""
+
+    def __init__(self, detection=None):
+        self.detection = detection
+
+    def HasField(self, name):
+        return getattr(self, name, None) is not None
+
+
+def encode_detection(t_capture, balls, robots_yellow=(), robots_blue=(), camera_id=0):
+    """Codifica uma detecção: balls como [(x, y)], robôs como [(robot_id, x, y)]."""
+    parts = [_HEADER.pack(t_capture, camera_id, len(balls), len(robots_yellow), len(robots_blue))]
+    parts.extend(_BALL.pack(x, y) for x, y in balls)
+    parts.extend(_ROBOT.pack(*robot) for robot in robots_yellow)
+    parts.extend(_ROBOT.pack(*robot) for robot in robots_blue)
+    return b''.join(parts)
+
+
+def decode_detection(data):
+    t_capture, camera_id, num_balls, num_yellow, num_blue = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    balls = [_Ball(*_BALL.unpack_from(data, offset + i * _BALL.size)) for i in range(num_balls)]
+    offset += num_balls * _BALL.size
+    yellow = [_Robot(*_ROBOT.unpack_from(data, offset + i * _ROBOT.size)) for i in range(num_yellow)]
+    offset += num_yellow * _ROBOT.size
+    blue = [_Robot(*_ROBOT.unpack_from(data, offset + i * _ROBOT.size)) for i in range(num_blue)]
+    return DetectionPacket(_Detection(t_capture, balls, yellow, blue, camera_id))
+
+
+class UdpReplayClient:
+    """Mesma interface de sslclient.client (connect/receive), ouvindo UDP unicast local."""
+
+    def __init__(self, ip='127.0.0.1', port=10006, timeout=0.1):
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.ip, self.port))
+        self.sock.settimeout(self.timeout)
+
+    def receive(self):
+        # Retorna None no timeout (ou após close) para que a thread de recepção verifique se deve parar
+        try:
+            data, _ = self.sock.recvfrom(65536)
+        except socket.timeout:
+            return None
+        if not data:
+            return None  # shutdown() por close() em outra thread
+        return decode_detection(data)
+
+    def close(self):
+        # Só close() não acorda um recvfrom bloqueado em outra thread; shutdown() acorda
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # UDP sem conexão: o Linux responde ENOTCONN, mas acorda o recvfrom mesmo assim
+        self.sock.close()
+
+
+class UdpReplayServer:
+    def __init__(self, frames, ip='127.0.0.1', port=10006, speed=1.0):
+        """
+        Envia detecções gravadas por UDP, respeitando os intervalos originais.
+
+        Args:
+            frames (list): Lista de (tempo, balls), com balls como [(x, y)].
+            speed (float): Fator de velocidade; None envia o mais rápido possível.
+        """
+        self.frames = frames
+        self.address = (ip, port)
+        self.speed = speed
+        self.sent = 0
+        self.done = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        """Usa as colunas time, raw_x e raw_y de um ball_positions*.csv."""
+        with open(path, newline='') as file:
+            frames = [(float(row['time']), [(float(row['raw_x']), float(row['raw_y']))])
+                      for row in csv.DictReader(file)]
+        return cls(frames, **kwargs)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            start = time.monotonic()
+            first_time = self.frames[0][0] if self.frames else 0.0
+            for t_capture, balls in self.frames:
+                if self.speed:
+                    delay = (t_capture - first_time) / self.speed - (time.monotonic() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                sock.sendto(encode_detection(t_capture, balls), self.address)
+                self.sent += 1
+        self.done.set()
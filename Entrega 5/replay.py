@@ -0,0 +1,142 @@
+import argparse
+import csv
+import time
+from collections import deque
+
+import numpy as np
+
+from binlog import read_binary_log
+from filters import (
+    moving_average_position, MovingAverageFilter, ExponentialMovingAverageFilter, MovingMedianFilter,
+    ConstantVelocityTracker,
+)
+
+# Replay offline dos logs gravados (ball_positions*.csv ou .bin) através de qualquer filtro
+# com update(posição), medindo a latência de cada frame, a vazão e os erros MAE/RMSE que o
+# notebook calcula (distância euclidiana entre a posição bruta e a filtrada).
+
+
+def load_frames(path):
+    """Retorna (time, raw_x, raw_y) como arrays NumPy, de um CSV ou de um log binário (.bin)."""
+    if path.endswith('.bin'):
+        records = read_binary_log(path)
+        return (np.array(records['time']), np.array(records['raw_x']), np.array(records['raw_y']))
+    with open(path, newline='') as file:
+        rows = [(float(row['time']), float(row['raw_x']), float(row['raw_y'])) for row in csv.DictReader(file)]
+    times, xs, ys = zip(*rows) if rows else ((), (), ())
+    return np.array(times), np.array(xs), np.array(ys)
+
+
+def calculate_mae(raw_x, raw_y, filtered_x, filtered_y):
+    return np.mean(np.sqrt((raw_x - filtered_x) ** 2 + (raw_y - filtered_y) ** 2))
+
+
+def calculate_rmse(raw_x, raw_y, filtered_x, filtered_y):
+    return np.sqrt(np.mean((raw_x - filtered_x) ** 2 + (raw_y - filtered_y) ** 2))
+
+
+class LegacyMovingAverage:
+    """O uso original de moving_average_position (deque + média de todo o histórico) com update()."""
+
+    def __init__(self, window_size=5):
+        self.history = deque(maxlen=window_size)
+
+    def update(self, position):
+        self.history.append(position)
+        return moving_average_position(self.history)
+
+
+def replay(frames, filter_, speed=None, use_timestamps=False):
+    """
+    Passa os frames por um filtro.
+
+    Args:
+        frames (tuple): (time, raw_x, raw_y), como retornado por load_frames.
+        filter_: Objeto com update(posição) (ou update(posição, tempo) se use_timestamps).
+        speed (float): 1.0 reproduz no ritmo original (ou mais rápido/lento); None, o mais rápido possível.
+        use_timestamps (bool): Passa o tempo do frame para o filtro (ex: ConstantVelocityTracker).
+
+    Returns:
+        tuple: (posições filtradas (N, 2), latência de cada frame em segundos (N,)).
+    """
+    times, xs, ys = frames
+    outputs = np.empty((len(times), 2))
+    latencies = np.empty(len(times))
+    start = time.perf_counter()
+    for i, (t, x, y) in enumerate(zip(times.tolist(), xs.tolist(), ys.tolist())):
+        if speed:
+            delay = (t - times[0]) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        before = time.perf_counter()
+        position = filter_.update((x, y), t) if use_timestamps else filter_.update((x, y))
+        latencies[i] = time.perf_counter() - before
+        outputs[i] = position
+    return outputs, latencies
+
+
+# Métricas de cada filtro em benchmark
+BENCHMARK_KEYS = ('p50_us', 'p90_us', 'p99_us', 'max_us', 'frames_per_s', 'mae', 'rmse')
+
+
+def benchmark(frames, filters, speed=None):
+    """
+    Roda cada filtro sobre os mesmos frames.
+
+    Args:
+        frames (tuple): (time, raw_x, raw_y).
+        filters (dict): Nome -> (fábrica do filtro, use_timestamps). Cada filtro é criado do zero.
+        speed (float): Como em replay.
+
+    Returns:
+        dict: Nome -> métricas (BENCHMARK_KEYS): latências p50/p90/p99/máxima (us), vazão
+              (frames/s), MAE e RMSE. Com um log vazio, todas são NaN.
+    """
+    _, xs, ys = frames
+    results = {}
+    for name, (factory, use_timestamps) in filters.items():
+        outputs, latencies = replay(frames, factory(), speed, use_timestamps)
+        if len(latencies) == 0:
+            results[name] = dict.fromkeys(BENCHMARK_KEYS, float('nan'))
+            continue
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e6
+        results[name] = {
+            'p50_us': p50, 'p90_us': p90, 'p99_us': p99, 'max_us': latencies.max() * 1e6,
+            'frames_per_s': len(latencies) / latencies.sum() if latencies.sum() > 0 else float('inf'),
+            'mae': calculate_mae(xs, ys, outputs[:, 0], outputs[:, 1]),
+            'rmse': calculate_rmse(xs, ys, outputs[:, 0], outputs[:, 1]),
+        }
+    return results
+
+
+def default_filters():
+    filters = {
+        'media_movel_original': (LegacyMovingAverage, False),
+        'media_movel_o1': (MovingAverageFilter, False),
+        'media_exponencial': (ExponentialMovingAverageFilter, False),
+        'mediana_movel': (MovingMedianFilter, False),
+        'kalman_cv_dt1': (ConstantVelocityTracker, False),
+        'kalman_cv_dt_real': (ConstantVelocityTracker, True),
+    }
+    try:
+        from filters import KalmanFilter2D
+        KalmanFilter2D()
+        filters['kalman_filterpy'] = (KalmanFilter2D, False)
+    except ImportError:
+        pass  # Sem filterpy, só os filtros próprios
+    return filters
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay offline dos logs de posição da bola pelos filtros')
+    parser.add_argument('logs', nargs='+', help='Arquivos ball_positions*.csv ou .bin')
+    parser.add_argument('--speed', type=float, default=None, help='1.0 = ritmo original (padrão: o mais rápido possível)')
+    args = parser.parse_args()
+
+    for path in args.logs:
+        frames = load_frames(path)
+        print(f"\n--- {path} ({len(frames[0])} frames) ---")
+        print(f"{'filtro':<22}{'p50 us':>9}{'p90 us':>9}{'p99 us':>9}{'max us':>9}{'frames/s':>12}{'MAE':>9}{'RMSE':>9}")
+        for name, m in benchmark(frames, default_filters(), args.speed).items():
+            print(f"{name:<22}{m['p50_us']:>9.2f}{m['p90_us']:>9.2f}{m['p99_us']:>9.2f}{m['max_us']:>9.2f}"
+                  f"{m['frames_per_s']:>12.0f}{m['mae']:>9.4f}{m['rmse']:>9.4f}")
@@ -0,0 +1,218 @@
+import argparse
+import math
+
+import numpy as np
+
+try:
+    from scipy.optimize import minimize
+except ImportError:  # Sem scipy, o ajuste de R/Q usa uma busca em grade logarítmica
+    minimize = None
+
+# Suavização offline de trajetórias gravadas: filtro de Kalman de velocidade constante
+# (passo direto) + suavizador de Rauch-Tung-Striebel (passo reverso), sobre os arrays
+# inteiros raw_x/raw_y.
+#
+# Mesmo modelo do ConstantVelocityTracker: x e y são independentes e têm a mesma
+# covariância, que não depende das medidas. Então as covariâncias, ganhos e variâncias
+# das inovações são calculados uma única vez (3 escalares por frame) e aplicados aos dois
+# eixos de uma vez, com arrays (T, 2). Os ganhos do RTS são vetorizados sobre o tempo.
+# O ajuste de R e Q por máxima verossimilhança usa a verossimilhança das inovações.
+
+
+def frame_intervals(times, frame_period=None):
+    """
+    Intervalo antes de cada frame, em frames nominais (o primeiro é 1). Sem frame_period, todos são 1.
+
+    Como no ConstantVelocityTracker, o intervalo é medido a partir do tempo mais recente já
+    visto: um frame com tempo anterior (pacote atrasado) tem intervalo 0, sem predição.
+    """
+    dts = np.ones(len(times))
+    if frame_period is not None and len(times) > 1:
+        latest = np.maximum.accumulate(times)
+        dts[1:] = np.maximum(0., times[1:] - latest[:-1]) / frame_period
+    return dts
+
+
+def _covariance_recursion(dts, q, r, p0):
+    # Covariâncias previstas e filtradas (p_pp, p_pv, p_vv), ganhos (k_p, k_v) e variâncias das inovações
+    n = len(dts)
+    predicted = np.empty((n, 3))
+    filtered = np.empty((n, 3))
+    gains = np.empty((n, 2))
+    innovation_variances = np.empty(n)
+    p_pp, p_pv, p_vv = p0, 0., p0
+    for t, dt in enumerate(dts.tolist()):
+        qt = q * dt
+        p_pp, p_pv, p_vv = p_pp + 2. * dt * p_pv + dt * dt * p_vv + qt, p_pv + dt * p_vv, p_vv + qt
+        predicted[t] = (p_pp, p_pv, p_vv)
+        s = p_pp + r
+        k_p, k_v = p_pp / s, p_pv / s
+        p_pp, p_pv, p_vv = (1. - k_p) * p_pp, (1. - k_p) * p_pv, p_vv - k_v * p_pv
+        filtered[t] = (p_pp, p_pv, p_vv)
+        gains[t] = (k_p, k_v)
+        innovation_variances[t] = s
+    return predicted, filtered, gains, innovation_variances
+
+
+def forward_filter(measurements, dts, q=0.5, r=10., p0=1000.):
+    """
+    Filtro de Kalman sobre todas as medidas.
+
+    Args:
+        measurements (np.ndarray): Posições medidas (T, 2).
+        dts (np.ndarray): Intervalo antes de cada frame, em frames (ver frame_intervals).
+        q, r, p0: Ruído de processo por frame, ruído de medição e covariância inicial
+                  (os mesmos parâmetros do KalmanFilter2D).
+
+    Returns:
+        dict: 'positions'/'velocities' filtradas (T, 2), 'predicted_positions'/'predicted_velocities'
+              (T, 2), covariâncias 'predicted'/'filtered' (T, 3), 'innovations' (T, 2) e
+              'innovation_variances' (T,).
+    """
+    predicted, filtered, gains, innovation_variances = _covariance_recursion(dts, q, r, p0)
+    n = len(measurements)
+    positions = np.empty((n, 2))
+    velocities = np.empty((n, 2))
+    predicted_positions = np.empty((n, 2))
+    predicted_velocities = np.empty((n, 2))
+
+    x = np.zeros(2)
+    v = np.zeros(2)
+    for t in range(n):
+        x = x + v * dts[t]
+        predicted_positions[t] = x
+        predicted_velocities[t] = v
+        innovation = measurements[t] - x
+        x = x + gains[t, 0] * innovation
+        v = v + gains[t, 1] * innovation
+        positions[t] = x
+        velocities[t] = v
+
+    return {
+        'positions': positions, 'velocities': velocities,
+        'predicted_positions': predicted_positions, 'predicted_velocities': predicted_velocities,
+        'predicted': predicted, 'filtered': filtered,
+        'innovations': measurements - predicted_positions, 'innovation_variances': innovation_variances,
+    }
+
+
+def rts_smoother(forward, dts):
+    """
+    Passo reverso de Rauch-Tung-Striebel sobre o resultado de forward_filter.
+
+    Returns:
+        dict: 'positions' e 'velocities' suavizadas (T, 2) e covariâncias 'covariances' (T, 3).
+    """
+    n = len(dts)
+    filtered = forward['filtered']
+    predicted = forward['predicted']
+
+    # Ganho G_t = P_f(t) F' P_p(t+1)^-1 para todos os t de uma vez (inversa 2x2 em forma fechada)
+    f_pp, f_pv, f_vv = filtered[:-1].T
+    p_pp, p_pv, p_vv = predicted[1:].T
+    dt = dts[1:]
+    a_pp, a_pv = f_pp + dt * f_pv, f_pv  # Linha 1 de P_f F'
+    a_vp, a_vv = f_pv + dt * f_vv, f_vv  # Linha 2 de P_f F'
+    det = p_pp * p_vv - p_pv * p_pv
+    i_pp, i_pv, i_vv = p_vv / det, -p_pv / det, p_pp / det
+    g = np.stack((a_pp * i_pp + a_pv * i_pv, a_pp * i_pv + a_pv * i_vv,
+                  a_vp * i_pp + a_vv * i_pv, a_vp * i_pv + a_vv * i_vv), axis=1)  # [g_pp, g_pv, g_vp, g_vv]
+
+    positions = forward['positions'].copy()
+    velocities = forward['velocities'].copy()
+    covariances = filtered.copy()
+    for t in range(n - 2, -1, -1):
+        g_pp, g_pv, g_vp, g_vv = g[t]
+        dx = positions[t + 1] - forward['predicted_positions'][t + 1]
+        dv = velocities[t + 1] - forward['predicted_velocities'][t + 1]
+        positions[t] = positions[t] + g_pp * dx + g_pv * dv
+        velocities[t] = velocities[t] + g_vp * dx + g_vv * dv
+
+        # P_s(t) = P_f(t) + G (P_s(t+1) - P_p(t+1)) G'
+        d_pp, d_pv, d_vv = covariances[t + 1] - predicted[t + 1]
+        b_pp = g_pp * d_pp + g_pv * d_pv
+        b_pv = g_pp * d_pv + g_pv * d_vv
+        b_vp = g_vp * d_pp + g_vv * d_pv
+        b_vv = g_vp * d_pv + g_vv * d_vv
+        covariances[t] = filtered[t] + (b_pp * g_pp + b_pv * g_pv, b_pp * g_vp + b_pv * g_vv, b_vp * g_vp + b_vv * g_vv)
+
+    return {'positions': positions, 'velocities': velocities, 'covariances': covariances}
+
+
+def log_likelihood(forward, burn_in=2):
+    """Log-verossimilhança das inovações dos dois eixos, ignorando os primeiros frames (prior difuso)."""
+    innovations = forward['innovations'][burn_in:]
+    variances = forward['innovation_variances'][burn_in:, None]
+    return -0.5 * float(np.sum(np.log(2. * math.pi * variances) + innovations ** 2 / variances))
+
+
+def smooth_track(times, raw_x, raw_y, q=0.5, r=10., p0=1000., frame_period=None):
+    """
+    Filtra e suaviza uma trajetória inteira.
+
+    Args:
+        times, raw_x, raw_y: Arrays de uma gravação (ex: colunas de ball_positions*.csv).
+        q, r, p0: Parâmetros do modelo (os mesmos do KalmanFilter2D).
+        frame_period (float): Com ele, usa o dt real entre frames; sem ele, dt = 1 frame
+                              (o mesmo do KalmanFilter2D).
+
+    Returns:
+        dict: 'filtered' e 'smoothed' (T, 2) e 'log_likelihood'.
+    """
+    measurements = np.column_stack((raw_x, raw_y)).astype(float)
+    dts = frame_intervals(np.asarray(times, dtype=float), frame_period)
+    forward = forward_filter(measurements, dts, q, r, p0)
+    smoothed = rts_smoother(forward, dts)
+    return {'filtered': forward['positions'], 'smoothed': smoothed['positions'],
+            'log_likelihood': log_likelihood(forward)}
+
+
+def fit_noise(times, raw_x, raw_y, q=0.5, r=10., p0=1000., frame_period=None):
+    """
+    Ajusta q (ruído de processo) e r (ruído de medição) por máxima verossimilhança.
+
+    Returns:
+        tuple: (q, r, log-verossimilhança) no ótimo encontrado.
+    """
+    measurements = np.column_stack((raw_x, raw_y)).astype(float)
+    dts = frame_intervals(np.asarray(times, dtype=float), frame_period)
+
+    def negative_log_likelihood(log_params):
+        log_q, log_r = log_params
+        return -log_likelihood(forward_filter(measurements, dts, math.exp(log_q), math.exp(log_r), p0))
+
+    start = np.log([q, r])
+    if minimize is not None:
+        result = minimize(negative_log_likelihood, start, method='Nelder-Mead',
+                          options={'xatol': 1e-3, 'fatol': 1e-6})
+        best = result.x
+    else:
+        # Grade logarítmica em torno do ponto inicial, refinada três vezes
+        best = start
+        span = 4.
+        for _ in range(3):
+            grid = np.linspace(-span, span, 9)
+            candidates = [best + (dq, dr) for dq in grid for dr in grid]
+            best = min(candidates, key=negative_log_likelihood)
+            span /= 4.
+    q, r = float(np.exp(best[0])), float(np.exp(best[1]))
+    return q, r, -negative_log_likelihood(best)
+
+
+if __name__ == '__main__':
+    from replay import calculate_mae, calculate_rmse, load_frames
+
+    parser = argparse.ArgumentParser(description='Suavização RTS e ajuste de R/Q dos logs de posição da bola')
+    parser.add_argument('logs', nargs='+', help='Arquivos ball_positions*.csv ou .bin')
+    parser.add_argument('--frame-period', type=float, default=None, help='Usa o dt real (ex: 0.0166 para 60 Hz)')
+    args = parser.parse_args()
+
+    for path in args.logs:
+        times, xs, ys = load_frames(path)
+        q, r, ll = fit_noise(times, xs, ys, frame_period=args.frame_period)
+        track = smooth_track(times, xs, ys, q, r, frame_period=args.frame_period)
+        print(f"\n--- {path} ({len(times)} frames) ---")
+        print(f"q = {q:.4f}, r = {r:.4f} (log-verossimilhança {ll:.2f})")
+        for name in ('filtered', 'smoothed'):
+            fx, fy = track[name].T
+            print(f"  {name:<9} MAE: {calculate_mae(xs, ys, fx, fy):.4f}, RMSE: {calculate_rmse(xs, ys, fx, fy):.4f}")
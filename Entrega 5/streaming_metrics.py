@@ -0,0 +1,240 @@
+import argparse
+import math
+
+import numpy as np
+
+from binlog import read_binary_log
+
+# Avaliação dos filtros lendo os logs em blocos, com memória constante:
+#   - ErrorAccumulator: MAE, RMSE, desvio padrão e máximo do erro, combinando as
+#     estatísticas de cada bloco com as fórmulas de Welford/Chan;
+#   - QuantileSketch: percentis do erro com erro relativo limitado (buckets logarítmicos);
+#   - MinMaxDecimator: série reduzida para gráficos, guardando o mínimo e o máximo de cada
+#     bucket ("pixel"), para que picos não desapareçam ao desenhar horas de jogo.
+# O erro de um frame é a distância euclidiana entre a posição bruta e a filtrada,
+# como em calculate_mae/calculate_rmse do notebook.
+
+# Filtro -> colunas com a posição filtrada
+FILTER_COLUMNS = {
+    'moving_avg': ('moving_avg_x', 'moving_avg_y'),
+    'kalman': ('kalman_x', 'kalman_y'),
+}
+
+
+class ErrorAccumulator:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.  # MAE
+        self.m2 = 0.  # Soma dos quadrados dos desvios em relação à média (Welford)
+        self.mean_square = 0.  # Média do erro ao quadrado (RMSE = raiz)
+        self.max = 0.
+
+    def update(self, errors):
+        """Inclui um bloco de erros (array 1D) combinando as estatísticas do bloco com as acumuladas."""
+        errors = np.asarray(errors, dtype=float)
+        n = len(errors)
+        if n == 0:
+            return
+        block_mean = float(errors.mean())
+        block_m2 = float(((errors - block_mean) ** 2).sum())
+        block_mean_square = float((errors ** 2).mean())
+
+        total = self.count + n
+        delta = block_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += block_m2 + delta * delta * self.count * n / total
+        self.mean_square += (block_mean_square - self.mean_square) * n / total
+        self.count = total
+        self.max = max(self.max, float(errors.max()))
+
+    @property
+    def mae(self):
+        return self.mean
+
+    @property
+    def rmse(self):
+        return math.sqrt(self.mean_square)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        """
+        Sketch de quantis com buckets logarítmicos (no estilo DDSketch): o quantil estimado
+        tem erro relativo de no máximo relative_accuracy. A memória depende da faixa de
+        valores (log), não do número de amostras.
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value  # Valores menores contam como zero
+        self.zeros = 0
+        self.buckets = {}  # Índice do bucket -> contagem
+        self.count = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        positive = values[values > self.min_value]
+        self.zeros += len(values) - len(positive)
+        self.count += len(values)
+        if len(positive):
+            indices, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64),
+                                        return_counts=True)
+            for index, count in zip(indices.tolist(), counts.tolist()):
+                self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Ponto do bucket (gamma^(i-1), gamma^i] com erro relativo limitado
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class MinMaxDecimator:
+    def __init__(self, num_buckets=1000):
+        """
+        Reduz uma série longa para no máximo ~2 * num_buckets pontos. Cada bucket cobre um
+        número fixo de amostras; quando os buckets passam de 2 * num_buckets, eles são
+        unidos aos pares e o tamanho dobra, então a memória fica constante.
+        """
+        self.num_buckets = num_buckets
+        self.bucket_size = 1
+        self.count = 0
+        self.buckets = np.zeros((0, 4))  # Por bucket: tempo do mínimo, mínimo, tempo do máximo, máximo
+
+    def update(self, times, values):
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        position = 0
+
+        # Completa o último bucket, se ele estiver pela metade
+        offset = self.count % self.bucket_size
+        if offset and n:
+            position = min(self.bucket_size - offset, n)
+            partial = _buckets(times[None, :position], values[None, :position])
+            self.buckets[-1] = _merge_buckets(self.buckets[-1:], partial)[0]
+
+        # Buckets completos de uma vez, e o resto num bucket parcial
+        full = (n - position) // self.bucket_size * self.bucket_size
+        new = [self.buckets]
+        if full:
+            shape = (-1, self.bucket_size)
+            new.append(_buckets(times[position:position + full].reshape(shape),
+                                values[position:position + full].reshape(shape)))
+        if position + full < n:
+            new.append(_buckets(times[None, position + full:], values[None, position + full:]))
+        self.buckets = np.vstack(new)
+        self.count += n
+
+        # Unir aos pares mantém a correspondência amostra -> bucket: os buckets completos
+        # viram pares completos e o último (parcial) continua sendo o último
+        while len(self.buckets) > 2 * self.num_buckets:
+            pairs = len(self.buckets) // 2 * 2
+            merged = _merge_buckets(self.buckets[0:pairs:2], self.buckets[1:pairs:2])
+            self.buckets = np.vstack((merged, self.buckets[pairs:]))
+            self.bucket_size *= 2
+
+    def series(self):
+        """Pontos (tempos, valores) para desenhar: o mínimo e o máximo de cada bucket, em ordem de tempo."""
+        t_min, v_min, t_max, v_max = self.buckets.T
+        min_first = t_min <= t_max
+        times = np.column_stack((np.where(min_first, t_min, t_max), np.where(min_first, t_max, t_min))).ravel()
+        values = np.column_stack((np.where(min_first, v_min, v_max), np.where(min_first, v_max, v_min))).ravel()
+        return times, values
+
+
+def _buckets(times, values):
+    # Uma linha de amostras por bucket -> (tempo do mínimo, mínimo, tempo do máximo, máximo)
+    rows = np.arange(len(values))
+    i_min = values.argmin(axis=1)
+    i_max = values.argmax(axis=1)
+    return np.column_stack((times[rows, i_min], values[rows, i_min], times[rows, i_max], values[rows, i_max]))
+
+
+def _merge_buckets(a, b):
+    min_from_a = a[:, 1] <= b[:, 1]
+    max_from_a = a[:, 3] >= b[:, 3]
+    return np.column_stack((
+        np.where(min_from_a, a[:, 0], b[:, 0]), np.where(min_from_a, a[:, 1], b[:, 1]),
+        np.where(max_from_a, a[:, 2], b[:, 2]), np.where(max_from_a, a[:, 3], b[:, 3]),
+    ))
+
+
+def read_chunks(path, chunk_size=100000):
+    """Lê um log (CSV ou .bin) em blocos, como dicionários coluna -> array."""
+    if path.endswith('.bin'):
+        records = read_binary_log(path)
+        for start in range(0, len(records), chunk_size):
+            block = records[start:start + chunk_size]
+            yield {name: np.asarray(block[name]) for name in block.dtype.names}
+    else:
+        import pandas as pd
+
+        # round_trip: o mesmo float64 que float(texto), como no log binário convertido
+        for block in pd.read_csv(path, chunksize=chunk_size, float_precision='round_trip'):
+            yield {name: block[name].to_numpy() for name in block.columns}
+
+
+def evaluate_log(path, filters=FILTER_COLUMNS, chunk_size=100000, num_buckets=1000, relative_accuracy=0.01):
+    """
+    Avalia os filtros de um log lendo um bloco por vez.
+
+    Returns:
+        dict: Filtro -> {'errors': ErrorAccumulator, 'quantiles': QuantileSketch,
+                         'decimated': MinMaxDecimator do erro ao longo do tempo}.
+    """
+    results = {name: {'errors': ErrorAccumulator(), 'quantiles': QuantileSketch(relative_accuracy),
+                      'decimated': MinMaxDecimator(num_buckets)} for name in filters}
+    for block in read_chunks(path, chunk_size):
+        for name, (column_x, column_y) in filters.items():
+            errors = np.sqrt((block['raw_x'] - block[column_x]) ** 2 + (block['raw_y'] - block[column_y]) ** 2)
+            results[name]['errors'].update(errors)
+            results[name]['quantiles'].update(errors)
+            results[name]['decimated'].update(block['time'], errors)
+    return results
+
+
+def plot_errors(results, title):
+    """Desenha o erro decimado de cada filtro ao longo do tempo."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for name, result in results.items():
+        times, values = result['decimated'].series()
+        plt.plot(times - times[0] if len(times) else times, values, label=name)
+    plt.title(title)
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Erro em relação à posição bruta')
+    plt.legend()
+    plt.show()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Métricas dos filtros em streaming (memória constante)')
+    parser.add_argument('logs', nargs='+', help='Arquivos ball_positions*.csv ou .bin')
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--plot', action='store_true', help='Desenha o erro decimado (matplotlib)')
+    args = parser.parse_args()
+
+    for path in args.logs:
+        results = evaluate_log(path, chunk_size=args.chunk_size)
+        print(f"\n--- {path} ---")
+        for name, result in results.items():
+            errors = result['errors']
+            sketch = result['quantiles']
+            print(f"{name}: MAE: {errors.mae:.4f}, RMSE: {errors.rmse:.4f}, "
+                  f"p50: {sketch.quantile(0.5):.4f}, p90: {sketch.quantile(0.9):.4f}, "
+                  f"p99: {sketch.quantile(0.99):.4f}, max: {errors.max:.4f} ({errors.count} frames)")
+        if args.plot:
+            plot_errors(results, path)
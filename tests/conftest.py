@@ -0,0 +1,32 @@
+# Os módulos de cada entrega ficam soltos nas pastas "Entrega N" (com espaço no nome) e
+# os scripts principais têm nomes como "03-SA.py", que não podem ser importados com
+# import. Aqui as pastas entram no sys.path e a fixture 'script' carrega um script pelo
+# caminho, sem executar o bloco __main__.
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+for pasta in ("Entrega 2", "Entrega 3", "Entrega 4", "Entrega 5"):
+    caminho = str(RAIZ / pasta)
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
+
+
+def carregar_script(pasta, arquivo):
+    nome = "script_" + Path(arquivo).stem.replace("-", "_").replace(".", "_")
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.spec_from_file_location(nome, RAIZ / pasta / arquivo)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo  # Necessário para pickle (ProcessPoolExecutor) das classes do script
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.fixture(scope="session")
+def script():
+    return carregar_script
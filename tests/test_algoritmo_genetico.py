@@ -0,0 +1,221 @@
+import random
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def ga(script):
+    return script("Entrega 2", "04.GA.py")
+
+
+def cache_do_livro(ga, **opcoes):
+    return ga.CacheAptidao(ga.calcular_aptidao, ga.calcular_aptidao_cromossomos, chave=ga.chave_cromossomo, **opcoes)
+
+
+def test_cache_devolve_a_mesma_aptidao(ga):
+    random.seed(0)
+    cache = cache_do_livro(ga, tamanho_maximo=50)
+    for _ in range(500):
+        cromossomo = ga.Cromossomo()
+        esperado = ga.calcular_aptidao(ga.Cromossomo(list(cromossomo.genes)))
+        assert cache.avaliar(cromossomo) == esperado
+    assert len(cache.valores) == 50
+
+
+def test_aptidao_dos_cromossomos_em_lote(ga):
+    random.seed(2)
+    populacao = [ga.Cromossomo() for _ in range(200)]
+    assert ga.calcular_aptidao_cromossomos(populacao) == [ga.calcular_aptidao(c) for c in populacao]
+
+
+def test_remover_duplicados(ga):
+    random.seed(1)
+    populacao = [ga.Cromossomo([1, 1, 1, 1, 1]) for _ in range(20)]
+    unica = ga.remover_duplicados(populacao)
+    assert len(unica) == 20
+    assert len({ga.chave_cromossomo(c) for c in unica}) == 20
+
+
+def test_ga_com_cache_igual_ao_ga_sem_cache(ga):
+    # O cache não consome números aleatórios: com a mesma semente, a busca é a mesma
+    random.seed(3)
+    sem_cache = ga.executar_algoritmo_genetico()
+    random.seed(3)
+    cache = cache_do_livro(ga)
+    com_cache = ga.executar_algoritmo_genetico(cache=cache)
+    assert com_cache == sem_cache == ga.SEQUENCIA_ALVO_SECRETA
+    assert cache.acertos > 0 and cache.faltas == len(cache.valores)
+    assert [e["geracao"] for e in cache.historico] == list(range(1, len(cache.historico) + 1))
+
+
+# --- Motor vetorizado ---
+
+def test_aptidao_da_populacao_igual_a_calcular_aptidao(ga):
+    rng = np.random.default_rng(0)
+    populacao = np.vstack((ga.gerar_populacao_inicial_vetorizada(2000, rng), ga.ALVO_ARRAY))
+    esperado = [ga.calcular_aptidao(ga.Cromossomo(linha.tolist())) for linha in populacao]
+    assert ga.calcular_aptidao_populacao(populacao).tolist() == esperado
+    assert esperado[-1] == ga.NUM_MODULOS * 100
+
+
+def test_torneio_escolhe_o_melhor_de_cada_sorteio(ga):
+    populacao = ga.gerar_populacao_inicial_vetorizada(300, np.random.default_rng(1))
+    aptidoes = ga.calcular_aptidao_populacao(populacao)
+    pais = ga.selecionar_pais_vetorizado(populacao, aptidoes, 5, np.random.default_rng(2))
+    candidatos = np.random.default_rng(2).integers(0, 300, size=(300, 5))  # O mesmo sorteio
+    assert ga.calcular_aptidao_populacao(pais).tolist() == aptidoes[candidatos].max(axis=1).tolist()
+
+
+def pais_diferentes_em_todos_os_genes(tamanho, rng):
+    # O segundo pai de cada par difere do primeiro em todos os genes, para identificar a origem de cada gene
+    pais = rng.integers(0, 10, size=(tamanho, 5), dtype=np.int8)
+    pais[1::2] = (pais[0::2][:len(pais[1::2])] + rng.integers(1, 10, size=pais[1::2].shape)) % 10
+    return pais
+
+
+@pytest.mark.parametrize("tamanho", [2, 50, 7, 1])
+def test_cruzamento_de_um_ponto_entre_pares(ga, tamanho):
+    rng = np.random.default_rng(tamanho)
+    pais = pais_diferentes_em_todos_os_genes(tamanho, rng)
+    filhos = ga.cruzar_populacao(pais, rng)
+    assert filhos.shape == pais.shape and filhos.dtype == pais.dtype
+    for i in range(0, tamanho, 2):
+        # Com tamanho ímpar, o último pai é cruzado com o primeiro
+        pai1, pai2 = pais[i], pais[i + 1] if i + 1 < tamanho else pais[0]
+        do_pai1 = filhos[i] == pai1
+        assert (do_pai1 | (filhos[i] == pai2)).all()
+        if tamanho == 1:
+            continue  # Cruzado consigo mesmo
+        corte = int(np.argmin(do_pai1))
+        assert 1 <= corte < ga.NUM_MODULOS and do_pai1[:corte].all() and not do_pai1[corte:].any()
+        if i + 1 < tamanho:
+            # O segundo filho é o complemento do primeiro
+            assert (filhos[i + 1] == np.where(do_pai1, pai2, pai1)).all()
+
+
+def test_mutacao_com_taxa_zero_e_um(ga):
+    rng = np.random.default_rng(3)
+    populacao = ga.gerar_populacao_inicial_vetorizada(1000, rng)
+    original = populacao.copy()
+    assert ga.mutar_populacao(populacao, 0., rng) is populacao
+    assert (populacao == original).all()
+
+    mutada = ga.mutar_populacao(populacao, 1., rng)
+    assert mutada is populacao and mutada.dtype == np.int8
+    assert ga.VALOR_MIN_MODULO <= mutada.min() and mutada.max() <= ga.VALOR_MAX_MODULO
+    # Todo gene é sorteado de novo: só ~10% coincidem com o valor anterior
+    assert 0.85 < (mutada != original).mean() < 0.95
+    assert set(np.unique(mutada).tolist()) == set(range(ga.VALOR_MIN_MODULO, ga.VALOR_MAX_MODULO + 1))
+
+
+def test_motor_vetorizado_com_semente_e_deterministico(ga, capsys):
+    # População pequena: a busca leva dezenas de gerações e o caminho depende da semente
+    def executar(semente):
+        solucao = ga.executar_algoritmo_genetico_vetorizado(tamanho_populacao=6, num_geracoes=100, seed=semente)
+        return solucao, capsys.readouterr().out
+
+    assert executar(7) == executar(7)
+    assert executar(9) == executar(9) != executar(7)
+
+
+
+# --- Modelo de ilhas ---
+
+def ilhas_com_campeoes(ga, num_ilhas):
+    # Cada ilha: 9 indivíduos fracos iguais e um campeão próprio (o alvo com um gene trocado)
+    ilhas = []
+    for i in range(num_ilhas):
+        ilha = ga.Ilha(i, 10, seed=i)
+        ilha.populacao[:] = 9
+        ilha.populacao[0] = ga.ALVO_ARRAY
+        ilha.populacao[0, i] = 0
+        ilha.aptidoes = ga.calcular_aptidao_populacao(ilha.populacao)
+        ilhas.append(ilha)
+    return ilhas, [ilha.populacao[0].tolist() for ilha in ilhas]
+
+
+def linhas(ilha):
+    return ilha.populacao.tolist()
+
+
+def test_migracao_em_anel_chega_a_ilha_seguinte(ga):
+    ilhas, campeoes = ilhas_com_campeoes(ga, 4)
+    ga._migrar(ilhas, 1, "anel")
+    for destino, ilha in enumerate(ilhas):
+        vizinho = (destino - 1) % 4
+        presentes = [c for c in campeoes if c in linhas(ilha)]
+        assert sorted(presentes) == sorted([campeoes[destino], campeoes[vizinho]])
+        assert linhas(ilha).count([9] * 5) == 8  # O migrante substituiu um dos piores
+        assert ilha.aptidoes.tolist() == ga.calcular_aptidao_populacao(ilha.populacao).tolist()
+
+
+def test_migracao_completa_chega_a_todas_as_ilhas(ga):
+    ilhas, campeoes = ilhas_com_campeoes(ga, 4)
+    ga._migrar(ilhas, 1, "completa")
+    for ilha in ilhas:
+        assert all(c in linhas(ilha) for c in campeoes)
+        assert linhas(ilha).count([9] * 5) == 6
+        assert ilha.aptidoes.tolist() == ga.calcular_aptidao_populacao(ilha.populacao).tolist()
+
+
+@pytest.mark.parametrize("topologia", ["anel", "completa"])
+def test_modelo_de_ilhas_para_quando_uma_ilha_atinge_o_alvo(ga, topologia):
+    parametros = dict(num_ilhas=3, tamanho_populacao=6, num_geracoes=400, intervalo_migracao=5,
+                      num_migrantes=1, topologia=topologia, max_workers=1, seed=5)
+    solucao, historicos = ga.executar_modelo_ilhas(**parametros)
+    assert solucao == ga.SEQUENCIA_ALVO_SECRETA
+    assert len(historicos) == 3
+
+    # Com um trabalhador, as ilhas evoluem em ordem dentro de cada trecho: a primeira a
+    # atingir o alvo sinaliza o Event, as anteriores completaram o trecho e as seguintes
+    # param sem evoluir nele
+    geracoes = [len(h) - 1 for h in historicos]
+    descobridora = next(i for i, h in enumerate(historicos) if h[-1] == ga.NUM_MODULOS * 100)
+    assert descobridora == 1  # Com esta semente, há ilhas antes e depois da descobridora
+    inicio_trecho = (geracoes[descobridora] - 1) // 5 * 5
+    assert 0 < inicio_trecho and geracoes[descobridora] < 400  # Houve migração e parou antes do fim
+    assert all(g == inicio_trecho + 5 for g in geracoes[:descobridora])
+    assert all(g == inicio_trecho for g in geracoes[descobridora + 1:])
+    assert all(max(h) < ga.NUM_MODULOS * 100 for h in historicos[:descobridora])
+
+    # Mesma semente, mesmo resultado
+    assert ga.executar_modelo_ilhas(**parametros) == (solucao, historicos)
+
+
+def test_topologia_desconhecida(ga):
+    with pytest.raises(ValueError):
+        ga.executar_modelo_ilhas(topologia="estrela")
+
+
+@pytest.fixture(scope="module")
+def csp(script):
+    return script("Entrega 3", "01-CSP.py")  # Carregar o script não roda o GA nem a comparação
+
+
+def test_csp_avaliar_populacao_igual_a_avaliar(csp):
+    random.seed(4)
+    populacao = csp.inicializar_populacao(40)
+    populacao += [list(c) for c in populacao[:5]]
+    um_a_um = csp.CacheAptidao(csp.calcular_aptidao, chave=csp.chave_cromossomo)
+    em_lote = csp.CacheAptidao(csp.calcular_aptidao, csp.aptidoes_em_lote, chave=csp.chave_cromossomo)
+    assert em_lote.avaliar_populacao(populacao) == [um_a_um.avaliar(c) for c in populacao]
+    assert em_lote.registrar_geracao(0) == um_a_um.registrar_geracao(0)
+
+
+@pytest.mark.parametrize("operadores", ["reparo", "pmx", "ox"])
+def test_csp_ga_atinge_o_otimo(csp, operadores):
+    random.seed(5)
+    cache = csp.CacheAptidao(csp.calcular_aptidao, csp.aptidoes_em_lote, chave=csp.chave_cromossomo)
+    solucao, aptidao = csp.algoritmo_genetico(30, 300, 0.15, cache=cache, operadores=operadores,
+                                              aptidao_alvo=910, verbose=False)
+    assert aptidao == 910 == csp.calcular_aptidao(solucao)
+    assert len(set(solucao[:csp.NUM_FORTALEZAS])) == csp.NUM_FORTALEZAS
+
+
+def test_csp_remover_duplicados(csp):
+    random.seed(6)
+    populacao = [list(c) for c in csp.inicializar_populacao(1)] * 30
+    unica = csp.remover_duplicados(populacao)
+    assert len(unica) == 30 and unica[0] == populacao[0]
+    assert len({csp.chave_cromossomo(c) for c in unica}) == 30
@@ -0,0 +1,60 @@
+import random
+from itertools import product
+
+import numpy as np
+
+from beam_search import ValidWordScorer, beam_search_batch, beam_search_translation
+
+
+class TableScorer:
+    # Score fixo por palavra, para gerar redes de candidatos aleatórias
+    def __init__(self, scores):
+        self.scores = scores
+
+    def __call__(self, words):
+        return np.array([self.scores[str(word)] for word in words], dtype=np.int64)
+
+
+def lattice_aleatoria(rng):
+    vocabulary = [f"w{i}" for i in range(12)]
+    candidates = [rng.sample(vocabulary, rng.randint(1, 5)) for _ in range(rng.randint(1, 6))]
+    return candidates, TableScorer({word: rng.randint(-3, 5) for word in vocabulary})
+
+
+def test_beam_igual_a_forca_bruta():
+    # O score é aditivo, então o beam nunca descarta o prefixo da melhor frase
+    rng = random.Random(3)
+    for _ in range(300):
+        candidates, scorer = lattice_aleatoria(rng)
+        best = max(sum(scorer.scores[w] for w in sentence) for sentence in product(*candidates))
+        for beam_width in (1, 2, 3, 7):
+            sentence, score = beam_search_translation(candidates, beam_width, scorer)
+            assert score == best
+            assert len(sentence) == len(candidates)
+            assert all(word in position for word, position in zip(sentence, candidates))
+            assert sum(scorer.scores[w] for w in sentence) == score
+
+
+def test_demo_retorna_a_melhor_frase_com_score_positivo():
+    valid_words = {"enter", "the", "path", "of", "knowledge", "now"}
+    candidates = [
+        ["enter", "entering", "enters"],
+        ["the", "this", "a"],
+        ["path", "way", "road"],
+        ["of", "from", "to"],
+        ["knowledge", "wisdom", "tech"],
+        ["now", "soon", "today"],
+    ]
+    sentence, score = beam_search_translation(candidates, 3, ValidWordScorer(valid_words))
+    assert sentence == ["enter", "the", "path", "of", "knowledge", "now"]
+    assert score == 6  # A versão original retornava -5 e a pior frase do beam
+
+
+def test_lote_igual_ao_sequencial():
+    rng = random.Random(4)
+    valid_words = {f"w{i}" for i in range(0, 12, 2)}
+    scorer = ValidWordScorer(valid_words)
+    lattices = [lattice_aleatoria(rng)[0] for _ in range(20)]
+    expected = [beam_search_translation(candidates, 3, scorer) for candidates in lattices]
+    assert list(beam_search_batch(lattices, 3, scorer, max_workers=1)) == expected
+    assert list(beam_search_batch(iter(lattices), 3, scorer, max_workers=2, chunksize=3)) == expected
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from binlog import COLUMNS, BinaryLogWriter, convert_csv, load_dataframe, read_binary_log, read_header
+
+DADOS = Path(__file__).resolve().parent.parent / "Entrega 5"
+
+
+def test_ida_e_volta_com_crescimento(tmp_path):
+    caminho = tmp_path / "log.bin"
+    rng = np.random.default_rng(0)
+    linhas = rng.normal(size=(1000, len(COLUMNS))).tolist()
+    writer = BinaryLogWriter(caminho, COLUMNS, capacity=16)  # Força várias realocações
+    writer.append(linhas[0])
+    for inicio in range(1, len(linhas), 97):
+        writer(linhas[inicio:inicio + 97])
+    writer.close()
+
+    colunas, capacidade, registros, _ = read_header(caminho)
+    assert colunas == COLUMNS and registros == len(linhas) and capacidade >= registros
+    log = read_binary_log(caminho)
+    np.testing.assert_array_equal(np.column_stack([log[c] for c in COLUMNS]), np.array(linhas))
+
+
+def test_log_vazio(tmp_path):
+    caminho = tmp_path / "vazio.bin"
+    BinaryLogWriter(caminho).close()
+    assert len(read_binary_log(caminho)) == 0
+
+
+@pytest.mark.parametrize("nome", ["ball_positions1.csv", "ball_positions2.csv", "ball_positions3.csv"])
+def test_converter_csv_igual_ao_read_csv(tmp_path, nome):
+    csv_caminho = DADOS / nome
+    registros = convert_csv(csv_caminho, tmp_path / "log.bin")
+    esperado = pd.read_csv(csv_caminho)
+    assert registros == len(esperado)
+    pd.testing.assert_frame_equal(load_dataframe(tmp_path / "log.bin"), esperado.astype("float64"))
+
+
+def test_arquivo_que_nao_e_log(tmp_path):
+    caminho = tmp_path / "outro.bin"
+    caminho.write_bytes(b"\x00" * 128)
+    with pytest.raises(ValueError):
+        read_header(caminho)
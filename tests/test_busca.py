@@ -0,0 +1,124 @@
+import random
+from collections import deque
+
+import pytest
+
+from busca import PROFUNDIDADE_MAXIMA_PADRAO, busca_iddfs
+from grafo_csr import GrafoCSR
+
+
+def distancia_bfs(grafo, inicio, destino):
+    distancias = {inicio: 0}
+    fila = deque([inicio])
+    while fila:
+        no = fila.popleft()
+        if no == destino:
+            return distancias[no]
+        for vizinho in grafo.get(no, ()):
+            if vizinho not in distancias:
+                distancias[vizinho] = distancias[no] + 1
+                fila.append(vizinho)
+    return None
+
+
+def grafo_aleatorio(rng):
+    n = rng.randint(1, 25)
+    densidade = rng.uniform(0.02, 0.3)
+    return {no: [v for v in range(n) if v != no and rng.random() < densidade] for no in range(n)}
+
+
+def caminho_valido(grafo, caminho, inicio, destino):
+    return caminho[0] == inicio and caminho[-1] == destino and all(
+        b in grafo.get(a, ()) for a, b in zip(caminho, caminho[1:])
+    )
+
+
+@pytest.mark.parametrize("bidirecional", [False, True])
+@pytest.mark.parametrize("transposicao, incremental", [(False, False), (True, False), (True, True)])
+def test_iddfs_igual_a_bfs_em_grafos_aleatorios(bidirecional, transposicao, incremental):
+    rng = random.Random(1)
+    for _ in range(300):
+        grafo = grafo_aleatorio(rng)
+        inicio, destino = rng.randrange(len(grafo)), rng.randrange(len(grafo))
+        esperado = distancia_bfs(grafo, inicio, destino)
+        compacto = GrafoCSR.de_dicionario(grafo)
+
+        for g in (grafo, compacto):
+            caminho, profundidade, _ = busca_iddfs(g, inicio, destino, transposicao=transposicao,
+                                                   bidirecional=bidirecional, incremental=incremental)
+            assert profundidade == esperado
+            if esperado is None:
+                assert caminho is None
+            else:
+                assert len(caminho) == esperado + 1
+                assert caminho_valido(grafo, caminho, inicio, destino)
+
+
+@pytest.mark.parametrize("bidirecional", [False, True])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_iddfs_respeita_profundidade_maxima(bidirecional, incremental):
+    linha = {i: [i + 1] for i in range(10)}
+    for g in (linha, GrafoCSR.de_dicionario(linha)):
+        opcoes = dict(bidirecional=bidirecional, incremental=incremental)
+        assert busca_iddfs(g, 0, 10, profundidade_maxima=9, **opcoes)[:2] == (None, None)
+        assert busca_iddfs(g, 0, 10, profundidade_maxima=10, **opcoes)[1] == 10
+
+
+def test_sem_limite_so_a_busca_incremental_vai_alem_do_padrao():
+    n = PROFUNDIDADE_MAXIMA_PADRAO + 50
+    linha = {i: [i + 1] for i in range(n)}
+    assert busca_iddfs(linha, 0, n, incremental=False)[:2] == (None, None)
+    assert busca_iddfs(linha, 0, n, transposicao=False, bidirecional=True)[:2] == (None, None)
+    assert busca_iddfs(linha, 0, n)[1] == n
+    assert busca_iddfs(linha, 0, n, incremental=False, profundidade_maxima=n)[1] == n
+
+
+def grade(lado):
+    return {
+        (l, c): [(l + dl, c + dc) for dl, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                 if 0 <= l + dl < lado and 0 <= c + dc < lado]
+        for l in range(lado) for c in range(lado)
+    }
+
+
+@pytest.mark.parametrize("bidirecional", [False, True])
+def test_busca_incremental_expande_cada_no_uma_vez(bidirecional):
+    # Grade de 100 mil nós com o destino no canto oposto (profundidade 632)
+    lado = 317
+    grafo = GrafoCSR.de_dicionario(grade(lado))
+    inicio, destino = grafo.id((0, 0)), grafo.id((lado - 1, lado - 1))
+    caminho, profundidade, expansoes = busca_iddfs(grafo, inicio, destino, bidirecional=bidirecional)
+    assert profundidade == 2 * (lado - 1) and len(caminho) == profundidade + 1
+    assert len(expansoes) == profundidade + 1 and sum(expansoes) <= len(grafo)
+
+
+def test_busca_incremental_conta_as_expansoes_como_a_classica():
+    # Cada iteração expande a fronteira cortada pela anterior: a diferença das contagens clássicas
+    grafo = grade(6)
+    _, _, classica = busca_iddfs(grafo, (0, 0), (5, 5), incremental=False)
+    _, _, incremental = busca_iddfs(grafo, (0, 0), (5, 5))
+    assert len(classica) == len(incremental)
+    assert incremental[1:-1] == [b - a for a, b in zip(classica, classica[1:-1])]
+
+
+def test_csr_preserva_adjacencias():
+    rng = random.Random(2)
+    for _ in range(100):
+        grafo = grafo_aleatorio(rng)
+        compacto = GrafoCSR.de_dicionario(grafo)
+        reverso = compacto.reverso()
+        for no, vizinhos in grafo.items():
+            assert list(compacto.vizinhos(compacto.id(no))) == [compacto.id(v) for v in vizinhos]
+        arestas_reversas = sorted((v, no) for no in range(len(compacto)) for v in reverso.vizinhos(no))
+        assert arestas_reversas == sorted((no, v) for no, vizinhos in grafo.items() for v in vizinhos)
+
+
+def test_csr_de_arquivo(tmp_path):
+    arquivo = tmp_path / "ruinas.tsv"
+    arquivo.write_text("# ruínas\nEntrada\tSala A\nSala A\tSala B\n\nSala Isolada\n", encoding="utf-8")
+    for mapear in (False, True):
+        grafo = GrafoCSR.de_arquivo(str(arquivo), mapear_memoria=mapear)
+        assert grafo.nomes == ["Entrada", "Sala A", "Sala B", "Sala Isolada"]
+        caminho, profundidade, _ = busca_iddfs(grafo, grafo.id("Entrada"), grafo.id("Sala B"))
+        assert grafo.nomes_de(caminho) == ["Entrada", "Sala A", "Sala B"] and profundidade == 2
+        assert list(grafo.vizinhos(grafo.id("Sala Isolada"))) == []
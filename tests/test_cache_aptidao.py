@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from cache_aptidao import CacheAptidao, chave_genoma, remover_duplicados
+
+
+class AptidaoCara:
+    # Função de aptidão "real" que conta quantas vezes cada genoma foi avaliado
+    def __init__(self):
+        self.chamadas = {}
+
+    def __call__(self, genes):
+        self.chamadas[tuple(genes)] = self.chamadas.get(tuple(genes), 0) + 1
+        return sum(g * (i + 1) for i, g in enumerate(genes))
+
+    def lote(self, populacao):
+        return [self(genes) for genes in populacao]
+
+
+def genomas_aleatorios(quantidade, semente):
+    rng = random.Random(semente)
+    return [[rng.randrange(4) for _ in range(4)] for _ in range(quantidade)]
+
+
+def test_chave_genoma_distingue_genomas():
+    genomas = {(a, b, c) for a in range(10) for b in range(10) for c in range(10)}
+    assert len({chave_genoma(g) for g in genomas}) == len(genomas)
+
+
+def test_conta_acertos_faltas_e_duplicados_por_geracao():
+    cache = CacheAptidao(AptidaoCara())
+    for genes in ([1, 2, 3, 4, 5], [1, 2, 3, 4, 5], [0, 0, 0, 0, 0]):
+        cache.avaliar(genes)
+    assert cache.registrar_geracao(0) == {"geracao": 0, "acertos": 1, "faltas": 2, "duplicados": 1, "tamanho": 2}
+
+    for genes in ([1, 2, 3, 4, 5], [9, 9, 9, 9, 9]):
+        cache.avaliar(genes)
+    assert cache.registrar_geracao(1) == {"geracao": 1, "acertos": 1, "faltas": 1, "duplicados": 0, "tamanho": 3}
+    assert [e["geracao"] for e in cache.historico] == [0, 1]
+
+
+@pytest.mark.parametrize("em_lote", [False, True])
+def test_aptidao_cara_chamada_uma_vez_por_genoma(em_lote):
+    aptidao = AptidaoCara()
+    cache = CacheAptidao(aptidao, aptidao.lote if em_lote else None)
+    for geracao in range(20):
+        populacao = genomas_aleatorios(50, semente=geracao)
+        assert cache.avaliar_populacao(populacao) == [AptidaoCara()(g) for g in populacao]
+        cache.registrar_geracao(geracao)
+    assert set(aptidao.chamadas.values()) == {1}  # Nenhum genoma avaliado duas vezes
+    assert cache.faltas == len(aptidao.chamadas) <= 4 ** 4
+    assert cache.acertos + cache.faltas == 20 * 50
+
+
+def test_avaliar_populacao_igual_a_avaliar_um_a_um():
+    aptidao = AptidaoCara()
+    um_a_um, em_lote = CacheAptidao(aptidao), CacheAptidao(aptidao, aptidao.lote)
+    populacao = genomas_aleatorios(60, semente=0)
+    for geracao in range(3):
+        assert em_lote.avaliar_populacao(populacao) == [um_a_um.avaliar(g) for g in populacao]
+        assert em_lote.registrar_geracao(geracao) == um_a_um.registrar_geracao(geracao)
+        populacao = populacao[20:] + genomas_aleatorios(20, semente=geracao + 1)
+
+
+def test_avaliar_populacao_respeita_o_tamanho_maximo():
+    aptidao = AptidaoCara()
+    cache = CacheAptidao(aptidao, aptidao.lote, tamanho_maximo=40)
+    populacao = [[i // 10, i % 10] for i in range(60)]
+    populacao += [list(g) for g in populacao[:10]]
+    assert cache.avaliar_populacao(populacao) == [AptidaoCara()(g) for g in populacao]
+    assert len(cache.valores) == 40
+    # As cópias na mesma chamada são avaliadas uma vez só, mesmo que saiam do cache
+    assert cache.registrar_geracao(0)["faltas"] == 60
+    assert set(aptidao.chamadas.values()) == {1}
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = CacheAptidao(AptidaoCara(), tamanho_maximo=2)
+    cache.avaliar([1])
+    cache.avaliar([2])
+    cache.avaliar([1])  # [1] passa a ser o mais recente
+    cache.avaliar([3])  # Descarta [2]
+    assert list(cache.valores) == [chave_genoma([1]), chave_genoma([3])]
+
+
+def test_chave_do_individuo():
+    # Indivíduos que não são listas de genes: a chave vem de uma função do problema
+    cache = CacheAptidao(lambda texto: len(texto), chave=lambda texto: chave_genoma(texto.encode()))
+    assert cache.avaliar_populacao(["ab", "abc", "ab"]) == [2, 3, 2]
+    assert cache.registrar_geracao(0)["faltas"] == 2
+
+
+def test_remover_duplicados():
+    rng = random.Random(1)
+    populacao = [[1, 1, 1, 1] for _ in range(20)]
+    unica = remover_duplicados(populacao, lambda: [rng.randrange(10) for _ in range(4)])
+    assert len(unica) == 20 and unica[0] == [1, 1, 1, 1]
+    assert len({chave_genoma(g) for g in unica}) == 20
+
+
+def test_remover_duplicados_desiste_com_o_espaco_esgotado():
+    populacao = [[0], [1], [0], [1]]
+    unica = remover_duplicados(populacao, lambda: [random.randrange(2)], tentativas=5)
+    assert len(unica) == 4  # Só existem 2 genomas: as cópias ficam após as tentativas
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import ConstantVelocityTracker, KalmanFilter2D
+
+DADOS = Path(__file__).resolve().parent.parent / "Entrega 5"
+CSVS = ["ball_positions1.csv", "ball_positions2.csv", "ball_positions3.csv"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def filterpy():
+    return pytest.importorskip("filterpy")
+
+
+def posicoes(nome):
+    dados = pd.read_csv(DADOS / nome)
+    return dados[["raw_x", "raw_y"]].to_numpy(), dados["time"].to_numpy()
+
+
+@pytest.mark.parametrize("nome", CSVS)
+def test_igual_ao_kalman_filter_2d_com_dt_fixo(nome):
+    medidas, _ = posicoes(nome)
+    referencia, tracker = KalmanFilter2D(), ConstantVelocityTracker()
+    for posicao in medidas:
+        esperado = np.array(referencia.update(posicao))
+        obtido = np.array(tracker.update(tuple(posicao)))
+        np.testing.assert_allclose(obtido, esperado, rtol=0, atol=1e-9 * max(1.0, np.abs(esperado).max()))
+
+
+@pytest.mark.parametrize("nome", CSVS)
+def test_igual_ao_filterpy_com_dt_real(nome):
+    from filterpy.kalman import KalmanFilter
+
+    medidas, tempos = posicoes(nome)
+    tracker = ConstantVelocityTracker()
+    kf = KalmanFilter(dim_x=4, dim_z=2)
+    kf.x = np.zeros(4)
+    kf.H = np.array([[1., 0., 0., 0.], [0., 1., 0., 0.]])
+    kf.P *= 1000.
+    kf.R = np.eye(2) * 10.
+
+    anterior = None
+    for posicao, tempo in zip(medidas, tempos):
+        dt = 1. if anterior is None else (tempo - anterior) / tracker.frame_period
+        anterior = tempo
+        kf.F = np.array([[1., 0., dt, 0.], [0., 1., 0., dt], [0., 0., 1., 0.], [0., 0., 0., 1.]])
+        kf.Q = np.eye(4) * 0.5 * dt
+        kf.predict()
+        kf.update(posicao)
+        obtido = np.array(tracker.update(tuple(posicao), tempo))
+        np.testing.assert_allclose(obtido, kf.x[:2], rtol=0, atol=1e-9 * max(1.0, np.abs(kf.x[:2]).max()))
+
+
+def test_pacote_atrasado_nao_deixa_a_covariancia_negativa():
+    tracker = ConstantVelocityTracker()
+    for frame in range(200):
+        tracker.update((frame * 10., 0.), frame / 60)
+    estado = (tracker.x, tracker.y, tracker.vx, tracker.vy)
+    tracker.update((1000., 0.), 100 / 60)  # Chega depois do frame 199, com tempo do frame 100
+    assert tracker.last_timestamp == 199 / 60
+    assert tracker.p_pp > 0 and tracker.p_vv > 0 and tracker.p_pp * tracker.p_vv > tracker.p_pv ** 2
+    # Sem predição: só a atualização com a medida, a partir do estado anterior
+    assert tracker.x == pytest.approx(estado[0] + (1000. - estado[0]) * tracker.p_pp / tracker.r, rel=1e-9)
+    for frame in range(200, 260):
+        tracker.update((frame * 10., 0.), frame / 60)
+        assert tracker.p_pp > 0 and tracker.p_vv > 0 and tracker.p_pp * tracker.p_vv > tracker.p_pv ** 2
+
+
+@pytest.mark.parametrize("q, r", [(0.05, 2.), (3., 40.)])
+def test_ruidos_configuraveis_iguais_ao_constant_velocity_tracker(q, r):
+    medidas, _ = posicoes(CSVS[0])
+    referencia = KalmanFilter2D(process_noise=q, measurement_noise=r, initial_covariance=50.)
+    tracker = ConstantVelocityTracker(process_noise=q, measurement_noise=r, initial_covariance=50.)
+    np.testing.assert_array_equal(referencia.kf.R, np.eye(2) * r)
+    np.testing.assert_array_equal(referencia.kf.Q, np.eye(4) * q)
+    for posicao in medidas:
+        esperado = np.array(referencia.update(posicao))
+        obtido = np.array(tracker.update(tuple(posicao)))
+        np.testing.assert_allclose(obtido, esperado, rtol=0, atol=1e-9 * max(1.0, np.abs(esperado).max()))
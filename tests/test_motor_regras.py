@@ -0,0 +1,172 @@
+import random
+
+import numpy as np
+import pytest
+
+from motor_regras import DIAGNOSTICO_PADRAO, MotorIncremental, colunas_frota
+
+
+# Cópia da função de diagnóstico original de 01-Agente.py (cadeia de if), usada como referência
+def diagnostico_cadeia_antiga(sintomas, estado_componentes):
+    """
+    Args:
+        sintomas (list): Uma lista de strings com os sintomas observados pelo piloto
+                         ou sensores do carro (ex: ['perda_potencia', 'cheiro_queimado']).
+        estado_componentes (dict): Um dicionário onde as chaves são os nomes dos
+                                   componentes do carro (ex: 'motor', 'pneus')
+                                   e os valores são seus estados atuais (ex: 'ok', 'superaquecido').
+
+    Returns:
+        list: Uma lista de dicionários. Cada dicionário representa um diagnóstico
+              e contém as chaves 'problema' (descrição do problema) e 'acao_sugerida'
+              (ação recomendada para o reparo).
+              Se nenhum problema for identificado pelas regras, retorna uma sugestão de inspeção.
+    """
+    diagnosticos = [] # Inicializa uma lista para armazenar todos os diagnósticos encontrados.
+
+    # --- Regras de Diagnóstico Baseadas em Sintomas Combinados e Individuais ---
+
+    # Regra 1: Perda de potência e fumaça do escapamento (indica problemas graves no motor/energia)
+    if 'perda_potencia' in sintomas and 'fumaça_escapamento' in sintomas:
+        diagnosticos.append({
+            'problema': 'Motor com falha grave ou sistema de energia instável.',
+            'acao_sugerida': 'Verificar velas, injeção e cabos do motor. Inspecionar regulador de voltagem.'
+        })
+
+    # Regra 2: Vibração anormal e direção puxando (sugere problemas em pneus/aerodinâmica)
+    if 'vibracao_anormal' in sintomas and 'direcao_puxando' in sintomas:
+        diagnosticos.append({
+            'problema': 'Pneus ou aerodinâmica comprometidos.',
+            'acao_sugerida': 'Checar balanceamento e alinhamento dos pneus. Inspecionar estado da asa traseira.'
+        })
+
+    # Regra 3: Cheiro queimado (sinal de superaquecimento ou curto-circuito)
+    if 'cheiro_queimado' in sintomas:
+        diagnosticos.append({
+            'problema': 'Superaquecimento de motor, freios ou curto-circuito elétrico.',
+            'acao_sugerida': 'Verificar nível de fluidos, temperatura do motor e fusíveis. Resfriar freios.'
+        })
+
+    # Regra 4: Instabilidade em curvas (relacionado a pneus ou aerodinâmica)
+    if 'instabilidade_curva' in sintomas:
+        diagnosticos.append({
+            'problema': 'Pneus com pressão irregular ou danos aerodinâmicos.',
+            'acao_sugerida': 'Verificar pressão dos pneus. Inspecionar defletores e spoilers.'
+        })
+
+    # Regra 5: Display do painel falhando (problemas no sistema elétrico/energia)
+    if 'display_painel_falha' in sintomas:
+        diagnosticos.append({
+            'problema': 'Falha no sistema de energia ou conectividade do painel.',
+            'acao_sugerida': 'Verificar fusíveis e conexões da bateria. Reiniciar sistema eletrônico.'
+        })
+
+    # Regra 6: Barulho metálico nos freios (indica desgaste de componentes do freio)
+    if 'barulho_metalico_freios' in sintomas:
+        diagnosticos.append({
+            'problema': 'Desgaste das pastilhas de freio ou discos.',
+            'acao_sugerida': 'Substituir pastilhas e verificar discos. Verificar vazamento de fluido.'
+        })
+
+    # Regra 7: Perda de potência (mas sem fumaça do escapamento, diagnóstico mais específico)
+    if 'perda_potencia' in sintomas and 'fumaça_escapamento' not in sintomas:
+        diagnosticos.append({
+            'problema': 'Possível falha de ignição ou obstrução na entrada de ar.',
+            'acao_sugerida': 'Verificar filtro de ar e sistema de ignição.'
+        })
+
+    # Regra 8: Fumaça do escapamento (mas sem perda de potência, outro diagnóstico específico)
+    if 'fumaça_escapamento' in sintomas and 'perda_potencia' not in sintomas:
+        diagnosticos.append({
+            'problema': 'Vazamento de óleo ou problema na combustão.',
+            'acao_sugerida': 'Verificar nível e vazamentos de óleo. Inspecionar bicos injetores.'
+        })
+
+
+    # Verifica se o motor está superaquecido
+    if estado_componentes.get('motor') == 'superaquecido':
+        diagnosticos.append({
+            'problema': 'Motor superaquecido.',
+            'acao_sugerida': 'Desligar o motor imediatamente. Verificar sistema de arrefecimento e nível de fluido.'
+        })
+
+    # Verifica se há pneu furado
+    if estado_componentes.get('pneus') == 'furado':
+        diagnosticos.append({
+            'problema': 'Pneu furado.',
+            'acao_sugerida': 'Substituir pneu danificado.'
+        })
+
+    # Verifica se o sistema de energia está sem energia
+    if estado_componentes.get('sistema_energia') == 'sem_energia':
+        diagnosticos.append({
+            'problema': 'Sem energia no sistema principal.',
+            'acao_sugerida': 'Verificar bateria e alternador. Chamar equipe de resgate.'
+        })
+
+    # Se, após todas as regras, nenhum diagnóstico específico foi adicionado, sugere uma inspeção geral.
+    if not diagnosticos:
+        diagnosticos.append({
+            'problema': 'Nenhum problema aparente com base nos sintomas e regras fornecidas.',
+            'acao_sugerida': 'Realizar uma inspeção de rotina completa.'
+        })
+
+    return diagnosticos
+
+
+SINTOMAS = ['perda_potencia', 'fumaça_escapamento', 'vibracao_anormal', 'direcao_puxando', 'cheiro_queimado',
+            'instabilidade_curva', 'display_painel_falha', 'barulho_metalico_freios']
+ESTADOS = {'motor': ['ok', 'superaquecido'], 'pneus': ['ok', 'furado'], 'sistema_energia': ['ok', 'sem_energia'],
+           'aerodinamica': ['ok'], 'sistema_freios': ['ok']}
+
+
+@pytest.fixture(scope="module")
+def agente(script):
+    return script("Entrega 4", "01-Agente.py")  # Carregar o script não roda a simulação nem o benchmark
+
+
+def cenarios_aleatorios(quantidade, semente=0):
+    rng = random.Random(semente)
+    return [([s for s in SINTOMAS if rng.random() < 0.3],
+             {componente: rng.choice(estados) for componente, estados in ESTADOS.items()})
+            for _ in range(quantidade)]
+
+
+def diagnostico_em_lote(motor, cenarios):
+    sintomas, estados, num_carros = colunas_frota(cenarios)
+    carros, regras = motor.diagnosticar_frota(sintomas, estados, num_carros)
+    return [[motor.diagnostico(r) for r in regras[carros == carro].tolist()] or [DIAGNOSTICO_PADRAO]
+            for carro in range(num_carros)]
+
+
+def test_oito_cenarios(agente):
+    assert len(agente.cenarios) == 8
+    esperado = [diagnostico_cadeia_antiga(*cenario) for cenario in agente.cenarios]
+    assert [agente.diagnosticar_carro(*cenario) for cenario in agente.cenarios] == esperado
+    assert diagnostico_em_lote(agente.MOTOR_REGRAS, agente.cenarios) == esperado
+
+
+def test_cenarios_aleatorios(agente):
+    cenarios = cenarios_aleatorios(300)
+    esperado = [diagnostico_cadeia_antiga(*cenario) for cenario in cenarios]
+    assert [agente.diagnosticar_carro(*cenario) for cenario in cenarios] == esperado
+    assert diagnostico_em_lote(agente.MOTOR_REGRAS, cenarios) == esperado
+
+
+def test_incremental_igual_ao_diagnostico_completo(agente):
+    rng = random.Random(1)
+    motor = MotorIncremental(agente.MOTOR_REGRAS)
+    sintomas, estados = set(), {componente: 'ok' for componente in ESTADOS}
+    motor.atualizar("SR-01", [(componente, estado) for componente, estado in estados.items()])
+    for _ in range(200):
+        if rng.random() < 0.5:
+            sintoma = rng.choice(SINTOMAS)
+            presente = sintoma in sintomas
+            motor.atualizar("SR-01", [] if presente else [sintoma], [sintoma] if presente else [])
+            sintomas ^= {sintoma}
+        else:
+            componente = rng.choice(list(ESTADOS))
+            estados[componente] = rng.choice(ESTADOS[componente])
+            motor.definir_estado("SR-01", componente, estados[componente])
+        esperado = diagnostico_cadeia_antiga(sorted(sintomas), estados)
+        assert sorted(d['problema'] for d in motor.diagnosticos("SR-01")) == sorted(d['problema'] for d in esperado)
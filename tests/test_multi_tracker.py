@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from multi_tracker import TrackerBank, _greedy_assignment, associate
+from pipeline import decode_detection, encode_detection
+
+
+def simular(num_cameras, usar_camera, num_frames=600, num_alvos=16, semente=0):
+    # Campo dividido em faixas verticais, uma por câmera; cada câmera manda o seu pacote em sequência
+    rng = np.random.default_rng(semente)
+    posicoes = rng.uniform(-4000, 4000, size=(num_alvos, 2))
+    velocidades = rng.uniform(-20, 20, size=(num_alvos, 2))
+    limites = np.linspace(-4500, 4500, num_cameras + 1)
+    banco = TrackerBank()
+    tempo = 0.
+    for _ in range(num_frames):
+        posicoes += velocidades
+        velocidades[np.abs(posicoes) > 4400] *= -1
+        faixa = np.clip(np.searchsorted(limites, posicoes[:, 0]) - 1, 0, num_cameras - 1)
+        for camera in range(num_cameras):
+            tempo += 1 / (60 * num_cameras)
+            deteccoes = posicoes[faixa == camera] + rng.normal(0, 3, size=((faixa == camera).sum(), 2))
+            banco.step(deteccoes, tempo, camera if usar_camera else None)
+    return banco, num_alvos
+
+
+def test_uma_camera_mantem_as_identidades():
+    banco, num_alvos = simular(1, usar_camera=True)
+    assert len(banco) == num_alvos and banco.created == num_alvos
+
+
+def test_varias_cameras_so_a_camera_dona_conta_frames_perdidos():
+    banco, num_alvos = simular(12, usar_camera=True)
+    assert len(banco) == num_alvos and banco.created == num_alvos
+    # Sem a câmera, cada pacote das outras 11 câmeras conta como frame perdido e os alvos são recriados
+    banco_sem_camera, _ = simular(12, usar_camera=False)
+    assert banco_sem_camera.created > num_alvos
+
+
+def test_alvo_passa_de_uma_camera_para_outra():
+    banco = TrackerBank(max_missed=2)
+    ids, _ = banco.step([(0., 0.)], 0., camera_id=0)
+    for k in range(1, 10):
+        banco.step([(10. * k, 0.)], k / 60, camera_id=1)  # Mesmo objeto, agora visto pela câmera 1
+        banco.step([], k / 60 + 0.001, camera_id=0)
+    assert banco.ids.tolist() == ids.tolist()
+    assert banco.cameras.tolist() == [1]
+
+
+def test_associacao_gulosa_igual_a_hungara_com_alvos_separados():
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(1)
+    previstos = rng.uniform(-4000, 4000, size=(20, 2))
+    detectados = previstos[rng.permutation(20)[:15]] + rng.normal(0, 5, size=(15, 2))
+    linhas, colunas = associate(previstos, detectados, gate=500.)
+    distancias = np.sqrt(((previstos[:, None] - detectados[None]) ** 2).sum(axis=2))
+    linhas_gulosas, colunas_gulosas = _greedy_assignment(distancias, 500.)
+    assert sorted(zip(linhas.tolist(), colunas.tolist())) == sorted(zip(linhas_gulosas.tolist(), colunas_gulosas.tolist()))
+
+
+def test_pacote_de_replay_leva_a_camera():
+    pacote = decode_detection(encode_detection(1.5, [(1., 2.)], [(3, 4., 5.)], [], camera_id=7))
+    assert pacote.detection.camera_id == 7 and pacote.detection.t_capture == 1.5
+    assert (pacote.detection.balls[0].x, pacote.detection.robots_yellow[0].robot_id) == (1., 3)
+
+
+def assert_covariancias_positivas(banco):
+    p_pp, p_pv, p_vv = banco.covariances.T
+    assert (p_pp > 0).all() and (p_vv > 0).all() and (p_pp * p_vv - p_pv ** 2 > 0).all()
+
+
+def test_tempo_fora_de_ordem_nao_faz_predicao_para_tras():
+    banco = TrackerBank()
+    banco.step([(0., 0.)], 1.00, camera_id=0)
+    banco.step([(30., 0.)], 1.05, camera_id=1)
+    estado, covariancia = banco.states.copy(), banco.covariances.copy()
+    banco.step([], 1.01, camera_id=0)  # Pacote atrasado sem detecção: nada muda
+    np.testing.assert_array_equal(banco.states, estado)
+    np.testing.assert_array_equal(banco.covariances, covariancia)
+    assert banco.last_timestamp == 1.05
+    assert_covariancias_positivas(banco)
+
+
+def test_cameras_intercaladas_com_tempos_fora_de_ordem_mantem_covariancias_positivas():
+    rng = np.random.default_rng(2)
+    banco = TrackerBank()
+    posicoes = rng.uniform(-4000, 4000, size=(8, 2))
+    velocidades = rng.uniform(-20, 20, size=(8, 2))
+    for frame in range(600):
+        posicoes += velocidades
+        for camera in range(4):
+            # Relógios das câmeras com atraso de até 3 frames: os t_capture chegam fora de ordem
+            tempo = frame / 60 + rng.uniform(-3, 3) / 60
+            deteccoes = posicoes[camera::4] + rng.normal(0, 3, size=posicoes[camera::4].shape)
+            banco.step(deteccoes, tempo, camera)
+            assert_covariancias_positivas(banco)
+    assert len(banco) == 8
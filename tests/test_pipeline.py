@@ -0,0 +1,76 @@
+import csv
+import threading
+import time
+
+from pipeline import CsvBatchWriter, UdpReplayClient, UdpReplayServer, VisionPipeline, extract_ball_position
+
+
+class FonteBloqueante:
+    """receive() bloqueia sem timeout até close(), como um socket sem timeout."""
+
+    def __init__(self, pacotes):
+        self.pacotes = list(pacotes)
+        self.fechada = threading.Event()
+
+    def receive(self):
+        if self.pacotes:
+            return self.pacotes.pop(0)
+        self.fechada.wait()
+        raise OSError("socket fechado")
+
+    def close(self):
+        self.fechada.set()
+
+
+class SinkLento:
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.linhas = []
+        self.fechado_depois_de = None
+
+    def __call__(self, linhas):
+        time.sleep(self.atraso)
+        self.linhas.extend(linhas)
+
+    def close(self):
+        self.fechado_depois_de = len(self.linhas)
+
+
+def test_stop_acorda_receive_bloqueado_e_fecha_o_sink_depois_do_ultimo_lote():
+    sink = SinkLento()
+    pipeline = VisionPipeline(FonteBloqueante(range(10)), lambda pacote, t: [pacote], sink, batch_size=4).start()
+    time.sleep(0.2)
+    inicio = time.monotonic()
+    assert pipeline.stop(timeout=2.0) == []
+    assert time.monotonic() - inicio < 1.0
+    assert [linha[0] for linha in sink.linhas] == list(range(10))
+    assert sink.fechado_depois_de == 10
+
+
+def test_stop_reporta_escritor_atrasado_sem_fechar_o_sink_antes():
+    sink = SinkLento(atraso=0.5)
+    pipeline = VisionPipeline(FonteBloqueante(range(3)), lambda pacote, t: [pacote], sink,
+                              batch_size=1, flush_interval=0.01).start()
+    time.sleep(0.05)
+    assert pipeline.stop(timeout=0.1) == ['write']
+    assert sink.fechado_depois_de is None
+    pipeline._threads[2].join(5.0)
+    assert sink.fechado_depois_de == 3
+
+
+def test_replay_udp_ate_o_csv(tmp_path):
+    frames = [(i * 0.01, [(float(i), -float(i))]) for i in range(50)]
+    cliente = UdpReplayClient(port=10916)
+    cliente.connect()
+    saida = tmp_path / "saida.csv"
+    writer = CsvBatchWriter(saida, ['x', 'y'])
+    pipeline = VisionPipeline(cliente, lambda pacote, t: list(extract_ball_position(pacote)), writer).start()
+    servidor = UdpReplayServer(frames, port=10916, speed=None).start()
+    assert servidor.done.wait(5.0)
+    time.sleep(0.2)
+    assert pipeline.stop() == []
+    assert writer.file.closed
+    with open(saida, newline='') as arquivo:
+        linhas = list(csv.reader(arquivo))
+    assert linhas[0] == ['x', 'y']
+    assert [(float(x), float(y)) for x, y in linhas[1:]] == [balls[0] for _, balls in frames]
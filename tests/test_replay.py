@@ -0,0 +1,91 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from binlog import COLUMNS, BinaryLogWriter, convert_csv
+from filters import ConstantVelocityTracker, MovingAverageFilter
+from replay import (
+    BENCHMARK_KEYS, LegacyMovingAverage, benchmark, calculate_mae, calculate_rmse, default_filters, load_frames,
+    replay,
+)
+
+DADOS = Path(__file__).resolve().parent.parent / "Entrega 5"
+CSVS = ["ball_positions1.csv", "ball_positions2.csv", "ball_positions3.csv"]
+
+
+# Fórmulas do notebook (Visão_Analise_de_dados.ipynb), sobre o DataFrame
+def mae_notebook(df, method_x, method_y):
+    return np.mean(np.sqrt((df['raw_x'] - df[method_x])**2 + (df['raw_y'] - df[method_y])**2))
+
+
+def rmse_notebook(df, method_x, method_y):
+    return np.sqrt(np.mean((df['raw_x'] - df[method_x])**2 + (df['raw_y'] - df[method_y])**2))
+
+
+@pytest.mark.parametrize("metodo, mae_impresso, rmse_impresso", [
+    ("moving_avg", 16.9356, 32.6964),
+    ("kalman", 6.0883, 12.6835),
+])
+def test_mae_e_rmse_iguais_ao_notebook(metodo, mae_impresso, rmse_impresso):
+    df = pd.read_csv(DADOS / "ball_positions1.csv")
+    colunas = (df["raw_x"].to_numpy(), df["raw_y"].to_numpy(),
+               df[f"{metodo}_x"].to_numpy(), df[f"{metodo}_y"].to_numpy())
+    assert calculate_mae(*colunas) == pytest.approx(mae_notebook(df, f"{metodo}_x", f"{metodo}_y"), rel=1e-12)
+    assert calculate_rmse(*colunas) == pytest.approx(rmse_notebook(df, f"{metodo}_x", f"{metodo}_y"), rel=1e-12)
+    # Os valores impressos na saída do notebook
+    assert round(calculate_mae(*colunas), 4) == mae_impresso
+    assert round(calculate_rmse(*colunas), 4) == rmse_impresso
+
+
+@pytest.mark.parametrize("nome", CSVS)
+def test_replay_reproduz_a_media_movel_gravada(nome):
+    df = pd.read_csv(DADOS / nome)
+    saidas, latencias = replay(load_frames(str(DADOS / nome)), LegacyMovingAverage())
+    assert len(latencias) == len(df) and (latencias >= 0).all()
+    np.testing.assert_allclose(saidas, df[["moving_avg_x", "moving_avg_y"]].to_numpy(), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("nome", CSVS)
+@pytest.mark.parametrize("fabrica, usar_tempos", [
+    (MovingAverageFilter, False), (ConstantVelocityTracker, False), (ConstantVelocityTracker, True),
+])
+def test_replay_igual_com_csv_e_log_binario(tmp_path, nome, fabrica, usar_tempos):
+    binario = tmp_path / "log.bin"
+    convert_csv(DADOS / nome, binario)
+    quadros_csv = load_frames(str(DADOS / nome))
+    quadros_binario = load_frames(str(binario))
+    for coluna_csv, coluna_binario in zip(quadros_csv, quadros_binario):
+        np.testing.assert_array_equal(coluna_csv, coluna_binario)
+    saidas_csv, _ = replay(quadros_csv, fabrica(), use_timestamps=usar_tempos)
+    saidas_binario, _ = replay(quadros_binario, fabrica(), use_timestamps=usar_tempos)
+    np.testing.assert_array_equal(saidas_csv, saidas_binario)
+
+
+def test_benchmark_retorna_as_metricas_documentadas():
+    quadros = load_frames(str(DADOS / "ball_positions3.csv"))
+    filtros = default_filters()
+    resultados = benchmark(quadros, filtros)
+    assert set(resultados) == set(filtros)
+    for metricas in resultados.values():
+        assert tuple(metricas) == BENCHMARK_KEYS
+        assert 0 <= metricas["p50_us"] <= metricas["p90_us"] <= metricas["p99_us"] <= metricas["max_us"]
+        assert metricas["frames_per_s"] > 0 and metricas["rmse"] >= metricas["mae"] > 0
+    # O MAE do benchmark é o mesmo de um replay avulso
+    saidas, _ = replay(quadros, LegacyMovingAverage())
+    _, xs, ys = quadros
+    assert resultados["media_movel_original"]["mae"] == calculate_mae(xs, ys, saidas[:, 0], saidas[:, 1])
+
+
+def test_benchmark_com_log_vazio(tmp_path):
+    csv_vazio = tmp_path / "vazio.csv"
+    csv_vazio.write_text(",".join(COLUMNS) + "\n")
+    binario_vazio = tmp_path / "vazio.bin"
+    BinaryLogWriter(binario_vazio).close()
+    for caminho in (csv_vazio, binario_vazio):
+        resultados = benchmark(load_frames(str(caminho)), default_filters())
+        for metricas in resultados.values():
+            assert tuple(metricas) == BENCHMARK_KEYS
+            assert all(math.isnan(valor) for valor in metricas.values())
@@ -0,0 +1,119 @@
+import itertools
+
+import numpy as np
+
+import restricoes
+from restricoes import DOMINIO_ABORDAGENS, DOMINIO_NUCLEOS
+
+
+# Cópia da função de aptidão original de 01-CSP.py (cadeia de if/elif), usada como referência
+def aptidao_cadeia_antiga(cromossomo):
+    # Desempacota o cromossomo para facilitar a leitura
+    nucleo_f1, nucleo_f2, nucleo_f3, abordagem_f1, abordagem_f2, abordagem_f3 = cromossomo
+
+    aptidao = 1000  # Pontuação base máxima
+
+    # --- Restrições de Núcleo e Abordagem por Fortaleza ---
+
+    # Fortaleza 1 (Templo dos Sussurros)
+    if abordagem_f1 == 'Furtividade':
+        if nucleo_f1 != 'Sussurro Fantasma':
+            aptidao -= 100  # Penalidade alta por não ter o núcleo ideal para furtividade
+    elif abordagem_f1 == 'Combate':
+        if nucleo_f1 != 'Fogo do Dragão':
+            aptidao -= 100  # Penalidade alta por não ter o núcleo ideal para combate
+    else: # Outras abordagens para F1 têm penalidade base
+        aptidao -= 50
+    
+    # Penalidade geral por desalinhamento para F1 se não for um dos casos ideais
+    if (abordagem_f1 == 'Furtividade' and nucleo_f1 != 'Sussurro Fantasma') or \
+       (abordagem_f1 == 'Combate' and nucleo_f1 != 'Fogo do Dragão'):
+        pass # Já penalizado acima
+    elif (abordagem_f1 == 'Hacking' and nucleo_f1 == 'Vontade de Ferro') or \
+         (abordagem_f1 == 'Diplomacia' and nucleo_f1 == 'Coração de Jade'):
+        aptidao -= 20 # Pequena penalidade por usar abordagem não ideal para F1 mas com núcleo sinérgico
+    else:
+        aptidao -= 30 # Penalidade por desalinhamento geral
+
+    # Fortaleza 2 (Ciber-Pagode)
+    if abordagem_f2 == 'Hacking':
+        if nucleo_f2 != 'Vontade de Ferro':
+            aptidao -= 100
+    elif abordagem_f2 == 'Furtividade':
+        if nucleo_f2 != 'Véu Sombrio':
+            aptidao -= 100
+    else: # Outras abordagens para F2 têm penalidade base
+        aptidao -= 50
+
+    # Penalidade geral por desalinhamento para F2
+    if (abordagem_f2 == 'Hacking' and nucleo_f2 != 'Vontade de Ferro') or \
+       (abordagem_f2 == 'Furtividade' and nucleo_f2 != 'Véu Sombrio'):
+        pass
+    elif (abordagem_f2 == 'Combate' and nucleo_f2 == 'Fogo do Dragão'):
+        aptidao -= 20
+    else:
+        aptidao -= 30
+
+    # Fortaleza 3 (Distrito do Mercado Flutuante)
+    if abordagem_f3 == 'Diplomacia':
+        if nucleo_f3 != 'Coração de Jade':
+            aptidao -= 100
+    elif abordagem_f3 == 'Combate':
+        if nucleo_f3 != 'Fogo do Dragão':
+            aptidao -= 100
+    else: # Outras abordagens para F3 têm penalidade base
+        aptidao -= 50
+
+    # Penalidade geral por desalinhamento para F3
+    if (abordagem_f3 == 'Diplomacia' and nucleo_f3 != 'Coração de Jade') or \
+       (abordagem_f3 == 'Combate' and nucleo_f3 != 'Fogo do Dragão'):
+        pass
+    elif (abordagem_f3 == 'Furtividade' and nucleo_f3 == 'Sussurro Fantasma'):
+        aptidao -= 20
+    else:
+        aptidao -= 30
+
+    # --- Restrição de Inventário Limitado de Núcleos ---
+    # Todos os núcleos devem ser diferentes
+    nucleos_usados = [nucleo_f1, nucleo_f2, nucleo_f3]
+    if len(set(nucleos_usados)) < 3: # Se houver repetição, o tamanho do set será menor que 3
+        aptidao -= 200 # Penalidade muito alta por violar esta restrição crítica
+
+    # --- Restrição de Sinergia/Conflito de Abordagens ---
+    # Combate em fortalezas adjacentes
+    if abordagem_f1 == 'Combate' and abordagem_f2 == 'Combate':
+        aptidao -= 150 # Penalidade alta por aumentar o alerta
+    if abordagem_f2 == 'Combate' and abordagem_f3 == 'Combate':
+        aptidao -= 150 # Penalidade alta por aumentar o alerta
+
+    # Diplomacia só é eficaz na Fortaleza 3
+    if abordagem_f1 == 'Diplomacia' or abordagem_f2 == 'Diplomacia':
+        aptidao -= 75 # Penalidade por usar diplomacia onde não é eficaz
+
+    # Garante que a aptidão não seja negativa
+    return max(0, aptidao)
+
+# --- 3. Funções do Algoritmo Genético ---
+
+
+TODOS_CROMOSSOMOS = [list(nucleos) + list(abordagens)
+                     for nucleos in itertools.product(DOMINIO_NUCLEOS, repeat=3)
+                     for abordagens in itertools.product(DOMINIO_ABORDAGENS, repeat=3)]
+
+
+def test_tabela_compilada_igual_a_cadeia_antiga():
+    assert len(TODOS_CROMOSSOMOS) == 5 ** 3 * 4 ** 3
+    for cromossomo in TODOS_CROMOSSOMOS:
+        assert restricoes.calcular_aptidao(cromossomo) == aptidao_cadeia_antiga(cromossomo), cromossomo
+
+
+def test_aptidao_populacao_igual_a_individual():
+    matriz = restricoes.codificar_populacao(TODOS_CROMOSSOMOS)
+    assert matriz.shape == (len(TODOS_CROMOSSOMOS), 2 * restricoes.NUM_FORTALEZAS)
+    esperado = np.array([aptidao_cadeia_antiga(c) for c in TODOS_CROMOSSOMOS])
+    np.testing.assert_array_equal(restricoes.calcular_aptidao_populacao(matriz), esperado)
+
+
+def test_codificar_decodificar():
+    for cromossomo in TODOS_CROMOSSOMOS[::97]:
+        assert restricoes.decodificar(restricoes.codificar(cromossomo)) == cromossomo
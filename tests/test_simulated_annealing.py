@@ -0,0 +1,140 @@
+import math
+import random
+
+import pytest
+
+RANGES = [(1.0, 200.0), (0.1, 1.0), (10.0, 500.0), (1.0, 200.0), (0.1, 1.0)]
+
+
+@pytest.fixture(scope="module")
+def sa(script):
+    return script("Entrega 2", "03-SA.py")
+
+
+def quadratic(params):
+    # Custo determinístico: mesma forma de dinosaur_activity, sem o ruído
+    return sum((p - i) ** 2 for p, i in zip(params, [75.0, 0.7, 248.0, 1.0, 0.5]))
+
+
+def run(sa, **kwargs):
+    return sa.simulated_annealing(quadratic, RANGES, 1000.0, 0.995, 2000, verbose=False, **kwargs)
+
+
+def test_seed_global_reproduz_execucao(sa):
+    random.seed(7)
+    first = run(sa)
+    random.seed(7)
+    assert run(sa) == first
+    random.seed(8)
+    assert run(sa) != first
+
+
+def test_seed_proprio_nao_depende_do_random_global(sa):
+    random.seed(1)
+    first = run(sa, seed=5)
+    random.seed(2)
+    assert run(sa, seed=5) == first
+
+
+def test_cadeias_paralelas_reproduziveis(sa):
+    results = [
+        sa.parallel_simulated_annealing(quadratic, RANGES, 1000.0, 0.995, 1500, num_chains=3, mode=mode,
+                                        sync_interval=500, max_workers=1, seed=11)
+        for mode in ("independent", "restart", "tempering")
+        for _ in range(2)
+    ]
+    for a, b in zip(results[::2], results[1::2]):
+        assert a[:2] == b[:2]
+    for best, cost, traces in results:
+        assert cost == pytest.approx(quadratic(best))
+        assert cost <= min(trace[-1][2] for trace in traces)
+
+
+def test_sa_vetorizado_reproduzivel_com_seed(sa):
+    runs = [sa.vectorized_simulated_annealing(sa.dinosaur_activity_batch, RANGES, 1000.0, 0.995, 500, seed=3)
+            for _ in range(2)]
+    assert runs[0][0].tolist() == runs[1][0].tolist() and runs[0][1] == runs[1][1]
+    other = sa.vectorized_simulated_annealing(sa.dinosaur_activity_batch, RANGES, 1000.0, 0.995, 500, seed=4)
+    assert other[1] != runs[0][1]
+
+
+def test_custo_em_lote_igual_ao_escalar_sem_ruido(sa):
+    import numpy as np
+
+    params = np.random.default_rng(0).uniform([r[0] for r in RANGES], [r[1] for r in RANGES], size=(50, 5))
+    batch = sa.dinosaur_activity_batch(params, rng=np.random.default_rng(1))
+    noise = np.random.default_rng(1).uniform(0, 0.5, size=50)
+    assert np.allclose(batch - noise, [quadratic(p) for p in params.tolist()])
+
+
+def test_variancia_combinada_ignora_celulas_descartadas(sa):
+    rng = random.Random(0)
+    cache = sa.CachedCost(lambda params: params[0] + rng.gauss(0, 1 + params[0]), resolution=1.0,
+                          max_entries=5, max_samples=6)
+    for _ in range(300):
+        x = float(rng.randrange(20))
+        cache.evaluate_against([x], threshold=x)
+        variances = [m2 / (n - 1) for n, _, m2 in cache.cells.values() if n > 1]
+        assert cache._pooled_variance_count == len(variances)
+        assert cache._pooled_variance_sum == pytest.approx(sum(variances))
+    assert len(cache.cells) == 5
+
+
+def test_retorno_padrao_continua_com_dois_valores(sa):
+    best, cost = run(sa, seed=1)
+    assert cost == quadratic(best)
+    best_report, cost_report, report = run(sa, seed=1, return_report=True)
+    assert (best_report, cost_report) == (best, cost)
+    assert report == {"stop_reason": "max_iterations", "iterations": 2000, "evaluations": 2001}
+
+
+def test_avaliacoes_contam_so_chamadas_reais_com_cache(sa):
+    calls = []
+
+    def counted(params):
+        calls.append(1)
+        return quadratic(params)
+
+    cache = sa.CachedCost(counted, resolution=[0.5, 0.005, 0.5, 0.5, 0.005])
+    _, _, report = sa.simulated_annealing(cache, RANGES, 1000.0, 0.995, 5000, verbose=False, seed=2,
+                                          return_report=True)
+    assert report["evaluations"] == len(calls) == cache.stats()["evaluations"]
+    assert report["evaluations"] < report["iterations"]
+
+    # Um segundo uso do mesmo cache conta só as chamadas da nova execução
+    before = len(calls)
+    _, _, report = sa.simulated_annealing(cache, RANGES, 1000.0, 0.995, 1000, verbose=False, seed=3,
+                                          return_report=True)
+    assert report["evaluations"] == len(calls) - before
+
+
+def test_esquema_logaritmico_comeca_em_t0(sa):
+    temperatures = []
+
+    class Recorder(sa.LogarithmicSchedule):
+        def __call__(self, chain, accepted, improved):
+            temperatures.append(chain.temperature)
+            return super().__call__(chain, accepted, improved)
+
+    run(sa, seed=4, schedule=Recorder())
+    assert temperatures[0] == 1000.0
+    assert temperatures[1] == pytest.approx(1000.0 * math.log(2) / math.log(3))
+    assert max(temperatures) == 1000.0
+
+
+@pytest.mark.parametrize("make_schedule", [
+    lambda sa: sa.LamSchedule(2000),
+    lambda sa: sa.ReheatingSchedule(0.995, patience=50),
+])
+def test_esquema_reaproveitado_nao_carrega_estado(sa, make_schedule):
+    schedule = make_schedule(sa)
+    first = run(sa, seed=6, schedule=schedule)
+    assert run(sa, seed=6, schedule=schedule) == first
+    assert run(sa, seed=6, schedule=make_schedule(sa)) == first
+
+
+def test_parada_antecipada(sa):
+    _, cost, report = run(sa, seed=7, target_cost=1e9, return_report=True)
+    assert report["stop_reason"] == "target_cost" and report["iterations"] == 0
+    _, _, report = run(sa, seed=7, stagnation_window=10, return_report=True)
+    assert report["stop_reason"] == "stagnation" and report["iterations"] < 2000
@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import smoothing
+from filters import ConstantVelocityTracker
+from smoothing import fit_noise, forward_filter, frame_intervals, rts_smoother
+
+DADOS = Path(__file__).resolve().parent.parent / "Entrega 5"
+
+
+def kalman_rts_matricial(medidas, dts, q, r, p0):
+    # Referência direta: estado [x, y, vx, vy], matrizes 4x4 e inversas do numpy
+    H = np.array([[1., 0., 0., 0.], [0., 1., 0., 0.]])
+    R = np.eye(2) * r
+    x, P = np.zeros(4), np.eye(4) * p0
+    previstos, cov_previstas, filtrados, cov_filtradas, transicoes = [], [], [], [], []
+    for medida, dt in zip(medidas, dts):
+        F = np.array([[1., 0., dt, 0.], [0., 1., 0., dt], [0., 0., 1., 0.], [0., 0., 0., 1.]])
+        x, P = F @ x, F @ P @ F.T + np.eye(4) * q * dt
+        previstos.append(x)
+        cov_previstas.append(P)
+        K = P @ H.T @ np.linalg.inv(H @ P @ H.T + R)
+        x, P = x + K @ (medida - H @ x), (np.eye(4) - K @ H) @ P
+        filtrados.append(x)
+        cov_filtradas.append(P)
+        transicoes.append(F)
+
+    suavizados, cov_suavizadas = list(filtrados), list(cov_filtradas)
+    for t in range(len(medidas) - 2, -1, -1):
+        G = cov_filtradas[t] @ transicoes[t + 1].T @ np.linalg.inv(cov_previstas[t + 1])
+        suavizados[t] = filtrados[t] + G @ (suavizados[t + 1] - previstos[t + 1])
+        cov_suavizadas[t] = cov_filtradas[t] + G @ (cov_suavizadas[t + 1] - cov_previstas[t + 1]) @ G.T
+    return np.array(filtrados), np.array(cov_filtradas), np.array(suavizados), np.array(cov_suavizadas)
+
+
+def escalares(covariancias):
+    # (p_pp, p_pv, p_vv) do eixo x, o mesmo do eixo y
+    return covariancias[:, [0, 0, 2], [0, 2, 2]]
+
+
+def simular(q, r, num_frames, semente, dts=None):
+    # Modelo de velocidade constante com Q = q dt I e R = r I, a partir do repouso na origem
+    rng = np.random.default_rng(semente)
+    dts = np.ones(num_frames) if dts is None else dts
+    posicao, velocidade = np.zeros(2), np.zeros(2)
+    medidas = np.empty((num_frames, 2))
+    for t, dt in enumerate(dts):
+        posicao = posicao + velocidade * dt + rng.normal(0, np.sqrt(q * dt), 2)
+        velocidade = velocidade + rng.normal(0, np.sqrt(q * dt), 2)
+        medidas[t] = posicao + rng.normal(0, np.sqrt(r), 2)
+    return medidas
+
+
+@pytest.mark.parametrize("nome", ["ball_positions1.csv", "ball_positions2.csv", "ball_positions3.csv"])
+def test_filtro_e_rts_iguais_a_versao_matricial(nome):
+    dados = pd.read_csv(DADOS / nome)
+    medidas = dados[["raw_x", "raw_y"]].to_numpy()
+    dts = frame_intervals(dados["time"].to_numpy(), 1 / 60)
+    direto = forward_filter(medidas, dts, q=0.5, r=10., p0=1000.)
+    suavizado = rts_smoother(direto, dts)
+
+    filtrados, cov_filtradas, suavizados, cov_suavizadas = kalman_rts_matricial(medidas, dts, 0.5, 10., 1000.)
+    escala = np.abs(medidas).max()
+    np.testing.assert_allclose(direto["positions"], filtrados[:, :2], rtol=0, atol=1e-12 * escala)
+    np.testing.assert_allclose(direto["velocities"], filtrados[:, 2:], rtol=0, atol=1e-12 * escala)
+    np.testing.assert_allclose(direto["filtered"], escalares(cov_filtradas), rtol=0, atol=1e-12 * 1000.)
+    np.testing.assert_allclose(suavizado["positions"], suavizados[:, :2], rtol=0, atol=1e-12 * escala)
+    np.testing.assert_allclose(suavizado["velocities"], suavizados[:, 2:], rtol=0, atol=1e-12 * escala)
+    np.testing.assert_allclose(suavizado["covariances"], escalares(cov_suavizadas), rtol=0, atol=1e-12 * 1000.)
+
+
+def test_intervalos_com_tempos_fora_de_ordem():
+    tempos = np.array([1.00, 1.05, 1.01, 1.07, 1.07]) * 60
+    np.testing.assert_allclose(frame_intervals(tempos, 1.), [1., 3., 0., 1.2, 0.], atol=1e-9)
+    np.testing.assert_array_equal(frame_intervals(tempos), np.ones(5))
+
+
+def test_filtro_igual_ao_constant_velocity_tracker_com_pacotes_atrasados():
+    rng = np.random.default_rng(3)
+    tempos = np.arange(300) / 60 + rng.uniform(-2, 2, 300) / 60
+    medidas = simular(0.5, 10., 300, semente=3)
+    direto = forward_filter(medidas, frame_intervals(tempos, 1 / 60))
+    assert (direto["predicted"][:, 0] > 0).all() and (direto["predicted"][:, 2] > 0).all()
+
+    tracker = ConstantVelocityTracker()
+    esperado = np.array([tracker.update(tuple(medida), tempo) for medida, tempo in zip(medidas, tempos)])
+    np.testing.assert_allclose(direto["positions"], esperado, rtol=0, atol=1e-9)
+
+
+def test_ajuste_recupera_q_e_r_conhecidos():
+    pytest.importorskip("scipy")
+    q, r = 0.3, 25.
+    medidas = simular(q, r, 4000, semente=4)
+    q_ajustado, r_ajustado, _ = fit_noise(np.arange(4000) / 60, medidas[:, 0], medidas[:, 1])
+    assert q_ajustado == pytest.approx(q, rel=0.15)
+    assert r_ajustado == pytest.approx(r, rel=0.15)
+
+
+@pytest.fixture(scope="module")
+def ajuste_em_grade():
+    # Ajuste sem scipy (busca em grade logarítmica), feito uma vez para os dois testes
+    q, r = 2., 8.
+    tempos = np.cumsum(np.random.default_rng(5).uniform(0.5, 2., 1500)) / 60
+    medidas = simular(q, r, 1500, semente=5, dts=frame_intervals(tempos, 1 / 60))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(smoothing, "minimize", None)
+        ajuste = fit_noise(tempos, medidas[:, 0], medidas[:, 1], frame_period=1 / 60)
+    return (q, r, tempos, medidas), ajuste
+
+
+def test_ajuste_em_grade_sem_scipy(ajuste_em_grade):
+    (q, r, _, _), (q_grade, r_grade, _) = ajuste_em_grade
+    assert q_grade == pytest.approx(q, rel=0.2)
+    assert r_grade == pytest.approx(r, rel=0.2)
+
+
+def test_ajuste_em_grade_perto_do_nelder_mead(ajuste_em_grade):
+    pytest.importorskip("scipy")
+    (_, _, tempos, medidas), (q_grade, r_grade, ll_grade) = ajuste_em_grade
+    q_nm, r_nm, ll_nm = fit_noise(tempos, medidas[:, 0], medidas[:, 1], frame_period=1 / 60)
+    # O último refinamento da grade tem passo 1/16 em log
+    assert abs(np.log(q_grade / q_nm)) < 1 / 16 and abs(np.log(r_grade / r_nm)) < 1 / 16
+    assert ll_grade == pytest.approx(ll_nm, abs=0.1)
@@ -0,0 +1,53 @@
+import itertools
+import random
+
+import pytest
+
+from restricoes import DOMINIO_ABORDAGENS, DOMINIO_NUCLEOS, FORTALEZAS, calcular_aptidao, fortalezas_aleatorias
+from solver_csp import problema_infiltracao, resolver, resolver_infiltracao
+
+
+def penalidade_forca_bruta(fortalezas, nucleos):
+    problema, _ = problema_infiltracao(fortalezas, nucleos)
+    penalidades = problema.suaves[0]
+    return min(
+        penalidades.penalidade(*escolha_nucleos, *escolha_abordagens)
+        for escolha_nucleos in itertools.permutations(nucleos, len(fortalezas))
+        for escolha_abordagens in itertools.product(DOMINIO_ABORDAGENS, repeat=len(fortalezas))
+    )
+
+
+def test_instancia_base():
+    cromossomo, aptidao, _ = resolver_infiltracao()
+    assert aptidao == 910
+    assert calcular_aptidao(cromossomo) == aptidao
+    assert penalidade_forca_bruta(FORTALEZAS, DOMINIO_NUCLEOS) == 1000 - aptidao
+
+
+@pytest.mark.parametrize("semente", range(60))
+def test_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    num_fortalezas = rng.randint(1, 4)
+    nucleos = [f"N{j}" for j in range(num_fortalezas + rng.randint(0, 2))]
+    fortalezas = fortalezas_aleatorias(num_fortalezas, nucleos, rng)
+
+    problema, custo_valor = problema_infiltracao(fortalezas, nucleos)
+    atribuicao, custo, _ = resolver(problema, custo_valor)
+    assert custo == penalidade_forca_bruta(fortalezas, nucleos)
+    assert problema.suaves[0].penalidade(*(atribuicao[v] for v in problema.suaves[0].escopo)) == custo
+    assert len({atribuicao[("nucleo", f)] for f in range(num_fortalezas)}) == num_fortalezas
+
+
+def test_sem_nucleos_suficientes():
+    cromossomo, aptidao, _ = resolver_infiltracao(FORTALEZAS, DOMINIO_NUCLEOS[:2])
+    assert cromossomo is None and aptidao == 0
+
+
+def test_escala_30_fortalezas():
+    rng = random.Random(30)
+    nucleos = [f"N{j}" for j in range(32)]
+    fortalezas = fortalezas_aleatorias(30, nucleos, rng)
+    problema, custo_valor = problema_infiltracao(fortalezas, nucleos)
+    atribuicao, custo, estatisticas = resolver(problema, custo_valor)
+    assert custo == 1195  # Ótimo conferido com a versão anterior do solver (37284 nós)
+    assert estatisticas["nos"] < 200
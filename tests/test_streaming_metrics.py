@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from binlog import convert_csv
+from streaming_metrics import FILTER_COLUMNS, ErrorAccumulator, MinMaxDecimator, QuantileSketch, evaluate_log
+
+DADOS = Path(__file__).resolve().parent.parent / "Entrega 5"
+CSVS = ["ball_positions1.csv", "ball_positions2.csv", "ball_positions3.csv"]
+
+
+def erros_do_log(nome, coluna_x, coluna_y):
+    # Erro por frame calculado de uma vez, como no notebook
+    dados = pd.read_csv(DADOS / nome, float_precision="round_trip")
+    return np.sqrt((dados["raw_x"] - dados[coluna_x]) ** 2 + (dados["raw_y"] - dados[coluna_y]) ** 2).to_numpy()
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 7, 64, 100000])
+@pytest.mark.parametrize("nome", CSVS)
+def test_acumulador_em_blocos_igual_a_uma_passada(nome, tamanho_bloco):
+    resultados = evaluate_log(str(DADOS / nome), chunk_size=tamanho_bloco)
+    for filtro, (coluna_x, coluna_y) in FILTER_COLUMNS.items():
+        erros = erros_do_log(nome, coluna_x, coluna_y)
+        acumulador = resultados[filtro]["errors"]
+        assert acumulador.count == len(erros)
+        assert acumulador.mae == pytest.approx(erros.mean(), rel=1e-12)
+        assert acumulador.rmse == pytest.approx(np.sqrt((erros ** 2).mean()), rel=1e-12)
+        assert acumulador.std == pytest.approx(erros.std(), rel=1e-10)
+        assert acumulador.max == erros.max()
+
+
+def test_acumulador_com_blocos_irregulares_e_vazios():
+    rng = np.random.default_rng(0)
+    erros = rng.lognormal(3., 1., 5000)
+    acumulador = ErrorAccumulator()
+    inicio = 0
+    for tamanho in rng.integers(0, 300, 60).tolist() + [len(erros)]:
+        acumulador.update(erros[inicio:inicio + tamanho])
+        inicio += tamanho
+    assert acumulador.count == len(erros)
+    assert acumulador.mae == pytest.approx(erros.mean(), rel=1e-12)
+    assert acumulador.rmse == pytest.approx(np.sqrt((erros ** 2).mean()), rel=1e-12)
+    assert acumulador.std == pytest.approx(erros.std(), rel=1e-10)
+    assert ErrorAccumulator().std == 0.
+
+
+@pytest.mark.parametrize("precisao", [0.001, 0.01, 0.05])
+def test_quantis_dentro_da_precisao_relativa(precisao):
+    rng = np.random.default_rng(1)
+    valores = np.concatenate((rng.lognormal(2., 1.5, 20000), np.zeros(500)))
+    sketch = QuantileSketch(relative_accuracy=precisao)
+    for bloco in np.array_split(rng.permutation(valores), 13):
+        sketch.update(bloco)
+    ordenados = np.sort(valores)
+    for q in [0., 0.01, 0.02, 0.1, 0.25, 0.5, 0.9, 0.99, 0.999, 1.]:
+        exato = ordenados[int(q * (len(valores) - 1))]
+        estimado = sketch.quantile(q)
+        assert abs(estimado - exato) <= precisao * exato, q
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def buckets_esperados(tempos, valores, tamanho):
+    # Mínimo e máximo (com seus tempos) de cada faixa de `tamanho` amostras, a última parcial
+    esperado = []
+    for inicio in range(0, len(valores), tamanho):
+        faixa = slice(inicio, inicio + tamanho)
+        i_min = inicio + int(valores[faixa].argmin())
+        i_max = inicio + int(valores[faixa].argmax())
+        esperado.append((tempos[i_min], valores[i_min], tempos[i_max], valores[i_max]))
+    return np.array(esperado).reshape(-1, 4)
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_decimador_guarda_minimo_e_maximo_de_cada_faixa(semente):
+    rng = np.random.default_rng(semente)
+    total = 3000
+    tempos = np.cumsum(rng.uniform(0.01, 0.02, total))
+    valores = rng.normal(size=total)
+    decimador = MinMaxDecimator(num_buckets=8)
+    inicio = 0
+    tamanhos_de_bucket = set()
+    while inicio < total:
+        tamanho = int(rng.choice([0, 1, 3, 17, 50, 333]))
+        decimador.update(tempos[inicio:inicio + tamanho], valores[inicio:inicio + tamanho])
+        inicio += tamanho
+        tamanhos_de_bucket.add(decimador.bucket_size)
+        np.testing.assert_array_equal(decimador.buckets,
+                                      buckets_esperados(tempos[:inicio], valores[:inicio], decimador.bucket_size))
+        assert len(decimador.buckets) <= 2 * decimador.num_buckets
+    assert decimador.count == total
+    assert len(tamanhos_de_bucket) >= 4  # Houve várias uniões aos pares
+
+    serie_tempos, serie_valores = decimador.series()
+    assert (np.diff(serie_tempos) >= 0).all()
+    assert serie_valores.min() == valores.min() and serie_valores.max() == valores.max()
+
+
+@pytest.mark.parametrize("nome", CSVS)
+def test_mesmo_resultado_com_csv_e_log_binario(tmp_path, nome):
+    binario = tmp_path / "log.bin"
+    convert_csv(DADOS / nome, binario)
+    do_csv = evaluate_log(str(DADOS / nome), chunk_size=50, num_buckets=16)
+    do_binario = evaluate_log(str(binario), chunk_size=50, num_buckets=16)
+    for filtro in FILTER_COLUMNS:
+        a, b = do_csv[filtro], do_binario[filtro]
+        assert vars(a["errors"]) == vars(b["errors"])
+        assert a["quantiles"].buckets == b["quantiles"].buckets and a["quantiles"].zeros == b["quantiles"].zeros
+        np.testing.assert_array_equal(a["decimated"].buckets, b["decimated"].buckets)